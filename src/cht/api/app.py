@@ -1,5 +1,7 @@
 import logging
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -19,7 +21,10 @@ logger = logging.getLogger("cht.api")
 
 
 def create_app(
-    metadata_service: MetadataService, cluster_store: ClusterStore | None = None
+    metadata_service: MetadataService,
+    cluster_store: ClusterStore | None = None,
+    *,
+    export_workers: int = 4,
 ) -> FastAPI:
     """
     Build a FastAPI app for ClickHouse metadata operations.
@@ -29,6 +34,8 @@ def create_app(
             A concrete implementation will wrap Cluster/Table and perform the actual queries.
         cluster_store: Registry of available ClickHouse clusters. A fresh store will be created if
             none is supplied.
+        export_workers: Size of the dedicated pool that builds Excel exports, so long exports
+            don't occupy the threadpool serving the metadata endpoints.
 
     Raises:
         ValueError: When metadata_service is not provided.
@@ -36,7 +43,16 @@ def create_app(
     if metadata_service is None:
         raise ValueError("metadata_service is required")
 
-    app = FastAPI(title="CHT Metadata API")
+    export_executor = ThreadPoolExecutor(
+        max_workers=export_workers, thread_name_prefix="cht-export"
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        export_executor.shutdown(wait=False)
+
+    app = FastAPI(title="CHT Metadata API", lifespan=lifespan)
 
     # Add CORS middleware for frontend
     app.add_middleware(
@@ -45,6 +61,7 @@ def create_app(
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag"],
     )
 
     # Global exception handler
@@ -79,6 +96,7 @@ def create_app(
 
     app.state.metadata_service = metadata_service
     app.state.cluster_store = cluster_store or ClusterStore()
+    app.state.export_executor = export_executor
     app.include_router(clusters_router)
     app.include_router(metadata_router)
     app.include_router(frontend_router)
@@ -0,0 +1,22 @@
+"""Helpers for ETag-based conditional responses."""
+
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request
+
+
+def compute_etag(body: bytes) -> str:
+    """Return a strong, quoted ETag derived from the response body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return True when the request's If-None-Match header covers ``etag``."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import sys
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
@@ -9,7 +10,7 @@ from cht.cluster import Cluster
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ClusterSettings:
     host: str
     port: int
@@ -39,6 +40,8 @@ class ClusterStore:
     ) -> Cluster:
         logger.info(f"Adding cluster '{name}' with settings: {settings}")
         try:
+            # Interned keys let later lookups by the same name hit dict identity checks.
+            name = sys.intern(name)
             self._configs[name] = settings
             self._instances[name] = Cluster(
                 name=name,
@@ -68,37 +71,46 @@ class ClusterStore:
         make_active: bool = False,
     ) -> None:
         """Register an existing Cluster instance (useful for testing/mocking)."""
+        name = sys.intern(name)
         self._configs[name] = settings
         self._instances[name] = cluster
         if self._active is None or make_active:
             self._active = name
 
+    def _info(self, name: str, config: ClusterSettings) -> dict:
+        return {
+            "name": name,
+            "host": config.host,
+            "port": config.port,
+            "user": config.user,
+            "secure": config.secure,
+            "verify": config.verify,
+            "read_only": config.read_only,
+            "active": name == self._active,
+        }
+
     def list_clusters(self) -> List[dict]:
         logger.info(f"Listing {len(self._configs)} configured clusters")
         try:
-            clusters = []
-            for name, config in self._configs.items():
-                clusters.append(
-                    {
-                        "name": name,
-                        "host": config.host,
-                        "port": config.port,
-                        "user": config.user,
-                        "secure": config.secure,
-                        "verify": config.verify,
-                        "read_only": config.read_only,
-                        "active": name == self._active,
-                    }
-                )
+            clusters = [self._info(name, config) for name, config in self._configs.items()]
             logger.info(f"Successfully listed clusters: {[c['name'] for c in clusters]}")
             return clusters
         except Exception as e:
             logger.error(f"Failed to list clusters: {e}")
             raise
 
+    def get_cluster_info(self, name: str) -> dict:
+        """Return the public description of a single cluster without listing all of them."""
+        name = sys.intern(name)
+        config = self._configs.get(name)
+        if config is None:
+            raise KeyError(f"Cluster '{name}' is not registered")
+        return self._info(name, config)
+
     def set_active(self, name: str) -> None:
         logger.info(f"Setting active cluster to '{name}'")
         try:
+            name = sys.intern(name)
             if name not in self._configs:
                 logger.error(f"Cannot set active cluster - '{name}' is not registered")
                 raise KeyError(f"Cluster '{name}' is not registered")
@@ -109,8 +121,8 @@ class ClusterStore:
             raise
 
     def get_cluster(self, name: Optional[str] = None) -> Cluster:
-        target = name or self._active
-        logger.info(f"Getting cluster '{target}' (requested: '{name}', active: '{self._active}')")
+        target = sys.intern(name) if name else self._active
+        logger.debug(f"Getting cluster '{target}' (requested: '{name}', active: '{self._active}')")
         try:
             if not target:
                 logger.error("No cluster configured and no specific cluster requested")
@@ -120,7 +132,7 @@ class ClusterStore:
                     f"Cluster '{target}' is not registered. Available: {list(self._instances.keys())}"
                 )
                 raise KeyError(f"Cluster '{target}' is not registered")
-            logger.info(f"Successfully retrieved cluster '{target}'")
+            logger.debug(f"Successfully retrieved cluster '{target}'")
             return self._instances[target]
         except Exception as e:
             logger.error(f"Failed to get cluster '{target}': {e}")
@@ -143,6 +155,8 @@ class ClusterStore:
                 cluster = self._instances[name]
                 if hasattr(cluster, "_client") and cluster._client:
                     cluster._client.close()
+                if hasattr(cluster, "close_pool"):
+                    cluster.close_pool()
                 del self._instances[name]
 
             del self._configs[name]
@@ -163,22 +177,34 @@ class ClusterStore:
         settings: ClusterSettings,
         *,
         make_active: bool = False,
-    ) -> None:
+    ) -> bool:
         """
         Update an existing cluster's settings.
+
+        Returns False when the settings are identical to the current ones; the existing
+        client is kept and only ``make_active`` is applied.
         """
         logger.info(f"Updating cluster '{name}' with settings: {settings}")
         try:
+            name = sys.intern(name)
             if name not in self._configs:
                 logger.error(f"Cannot update cluster - '{name}' is not registered")
                 raise KeyError(f"Cluster '{name}' is not registered")
 
+            if settings == self._configs[name]:
+                if make_active:
+                    self._active = name
+                logger.info(f"Cluster '{name}' settings unchanged; keeping existing client")
+                return False
+
             # Close existing client connection if it exists
             if name in self._instances:
                 cluster = self._instances[name]
                 if hasattr(cluster, "_client") and cluster._client:
                     cluster._client.close()
                     cluster._client = None
+                if hasattr(cluster, "close_pool"):
+                    cluster.close_pool()
 
             # Update config and create new instance
             self._configs[name] = settings
@@ -198,6 +224,7 @@ class ClusterStore:
                 logger.info(f"Set updated cluster '{name}' as active")
 
             logger.info(f"Successfully updated cluster '{name}'")
+            return True
         except Exception as e:
             logger.error(f"Failed to update cluster '{name}': {e}")
             raise
@@ -1,3 +1,5 @@
+from concurrent.futures import Executor
+
 from fastapi import Request
 
 from .cluster_store import ClusterStore
@@ -18,3 +20,11 @@ def get_cluster_store(request: Request) -> ClusterStore:
     if store is None:
         raise RuntimeError("Cluster store is not configured")
     return store
+
+
+def get_export_executor(request: Request) -> Executor:
+    """Retrieve the executor dedicated to Excel exports from FastAPI app state."""
+    executor = getattr(request.app.state, "export_executor", None)
+    if executor is None:
+        raise RuntimeError("Export executor is not configured")
+    return executor
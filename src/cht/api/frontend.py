@@ -1,13 +1,26 @@
-from fastapi import APIRouter
+import gzip
+
+from fastapi import APIRouter, Request, Response, status
 from fastapi.responses import HTMLResponse
 
+from .caching import compute_etag, etag_matches
+
 router = APIRouter()
 
 
 @router.get("/ui", include_in_schema=False)
-def serve_ui() -> HTMLResponse:
+def serve_ui(request: Request) -> Response:
     """Serve a simple single-page UI for metadata browsing."""
-    return HTMLResponse(CONTENT)
+    headers = {
+        "ETag": _ETAG,
+        "Cache-Control": "public, max-age=300",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request, _ETAG):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return HTMLResponse(_CONTENT_GZIP, headers={**headers, "Content-Encoding": "gzip"})
+    return HTMLResponse(_CONTENT_BYTES, headers=headers)
 
 
 # Keeping HTML inline to avoid extra static asset plumbing.
@@ -241,36 +254,111 @@ CONTENT = r"""<!DOCTYPE html>
       selectedDb: null,
       selectedTable: null,
       editingCluster: null,
+      activateAC: null,
+      exportTipTimer: null,
     };
 
+    // Debug tracing is compiled out unless DEBUG is flipped; console.error stays for real failures.
+    const DEBUG = false;
+    const noop = () => {};
+    const log = DEBUG ? console.log.bind(console) : noop;
+    const warn = DEBUG ? console.warn.bind(console) : noop;
+
     const qs = (sel) => document.querySelector(sel);
+
+    // Static elements referenced from event handlers, resolved once at startup.
+    const els = {
+      status: document.getElementById('status'),
+      loader: document.getElementById('loader'),
+      clusterForm: document.getElementById('cluster-form'),
+      clusterSelect: document.getElementById('cluster-select'),
+      dbSelect: document.getElementById('db-select'),
+      name: document.getElementById('cluster-name'),
+      host: document.getElementById('cluster-host'),
+      clusterPort: document.getElementById('cluster-port'),
+      user: document.getElementById('cluster-user'),
+      password: document.getElementById('cluster-password'),
+      readonly: document.getElementById('cluster-readonly'),
+      clusterActive: document.getElementById('cluster-active'),
+      exportModal: document.getElementById('export-modal'),
+      dbCheckboxes: document.getElementById('database-checkboxes'),
+    };
     let loadingCount = 0;
 
     // Basic obfuscation utilities (NOT encryption, just obfuscation)
+    // Values are UTF-8 encoded in a single pass so non-Latin-1 passwords survive btoa.
+    // Entries without the prefix were written by older versions (reversed + base64).
+    const OBFUSCATION_PREFIX = 'u8:';
+    const textEncoder = new TextEncoder();
+    const textDecoder = new TextDecoder();
     const obfuscate = {
       encode: (str) => {
         try {
-          return btoa(str.split('').reverse().join(''));
+          return OBFUSCATION_PREFIX + btoa(String.fromCharCode(...textEncoder.encode(str)));
         } catch(e) {
           return str;
         }
       },
       decode: (str) => {
         try {
-          return atob(str).split('').reverse().join('');
+          if (!str.startsWith(OBFUSCATION_PREFIX)) {
+            return atob(str).split('').reverse().join('');
+          }
+          const binary = atob(str.slice(OBFUSCATION_PREFIX.length));
+          return textDecoder.decode(Uint8Array.from(binary, (ch) => ch.charCodeAt(0)));
         } catch(e) {
           return str;
         }
       }
     };
 
+    // Saved connections live in IndexedDB, one record per cluster name, so saving a
+    // connection is a single put instead of rewriting the whole list.
+    const LEGACY_STORAGE_KEY = 'cht-connections';
+    const connectionDb = new Promise((resolve, reject) => {
+      const request = indexedDB.open('cht', 1);
+      request.onupgradeneeded = () => {
+        const store = request.result.createObjectStore('clusters', { keyPath: 'name' });
+        // Carry over connections saved by versions that kept them in localStorage.
+        try {
+          const legacy = JSON.parse(localStorage.getItem(LEGACY_STORAGE_KEY) || '{}');
+          Object.values(legacy).forEach(conn => store.put(conn));
+          request.transaction.oncomplete = () => localStorage.removeItem(LEGACY_STORAGE_KEY);
+        } catch(e) {
+          console.error('Failed to migrate saved connections:', e);
+        }
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => reject(request.error);
+    });
+
+    // Run fn against the clusters store in a single transaction and resolve with the
+    // result of the request it returns once the transaction has committed.
+    async function withConnectionStore(mode, fn) {
+      const db = await connectionDb;
+      return new Promise((resolve, reject) => {
+        const tx = db.transaction('clusters', mode);
+        const request = fn(tx.objectStore('clusters'));
+        tx.oncomplete = () => resolve(request ? request.result : undefined);
+        tx.onerror = () => reject(tx.error);
+        tx.onabort = () => reject(tx.error);
+      });
+    }
+
+    // Last persisted fields per connection name, used to skip no-op writes.
+    const savedSnapshots = new Map();
+    const connectionSnapshot = (conn) => JSON.stringify([
+      conn.host, conn.port || 8123, conn.user || 'default', conn.password || '', conn.read_only || false,
+    ]);
+
     // Connection storage with basic security measures
     const connectionStorage = {
-      saveConnection: (connection) => {
+      saveConnection: async (connection) => {
         try {
           if (!connection.name || !connection.host) return false;
           
-          const stored = JSON.parse(localStorage.getItem('cht-connections') || '{}');
+          const snapshot = connectionSnapshot(connection);
+          if (savedSnapshots.get(connection.name) === snapshot) return true;
           
           const safeConnection = {
             name: connection.name,
@@ -282,8 +370,8 @@ CONTENT = r"""<!DOCTYPE html>
             saved_at: new Date().toISOString()
           };
           
-          stored[connection.name] = safeConnection;
-          localStorage.setItem('cht-connections', JSON.stringify(stored));
+          await withConnectionStore('readwrite', store => store.put(safeConnection));
+          savedSnapshots.set(connection.name, snapshot);
           updateStorageCount();
           
           setStatus(`Connection '${connection.name}' saved to browser storage`, false, true);
@@ -295,22 +383,27 @@ CONTENT = r"""<!DOCTYPE html>
         }
       },
 
-      loadConnections: () => {
+      loadConnections: async () => {
         try {
-          const stored = JSON.parse(localStorage.getItem('cht-connections') || '{}');
-          return Object.values(stored).map(conn => ({
-            ...conn,
-            password: conn.password ? obfuscate.decode(conn.password) : ''
-          }));
+          const stored = await withConnectionStore('readonly', store => store.getAll());
+          return stored.map(conn => {
+            const restored = {
+              ...conn,
+              password: conn.password ? obfuscate.decode(conn.password) : ''
+            };
+            savedSnapshots.set(restored.name, connectionSnapshot(restored));
+            return restored;
+          });
         } catch(e) {
           console.error('Failed to load connections:', e);
           return [];
         }
       },
 
-      clearAll: () => {
+      clearAll: async () => {
         try {
-          localStorage.removeItem('cht-connections');
+          await withConnectionStore('readwrite', store => store.clear());
+          savedSnapshots.clear();
           updateStorageCount();
           setStatus('All saved connections cleared from browser storage', false, true);
           return true;
@@ -320,18 +413,25 @@ CONTENT = r"""<!DOCTYPE html>
         }
       },
 
-      count: () => {
+      count: async () => {
         try {
-          const stored = JSON.parse(localStorage.getItem('cht-connections') || '{}');
-          return Object.keys(stored).length;
+          return await withConnectionStore('readonly', store => store.count());
         } catch(e) {
           return 0;
         }
       }
     };
 
-    function updateStorageCount() {
-      const count = connectionStorage.count();
+    const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+    const escapeHtml = (value) => String(value).replace(/[&<>"']/g, (ch) => HTML_ESCAPES[ch]);
+
+    const HAS_OBJECT_URL = typeof URL !== 'undefined' && !!URL.createObjectURL;
+    const HAS_SAVE_PICKER = typeof window.showSaveFilePicker === 'function';
+    const IS_MAC = navigator.userAgent.includes('Mac');
+    const XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet';
+
+    async function updateStorageCount() {
+      const count = await connectionStorage.count();
       qs('#storage-count').textContent = count;
     }
 
@@ -342,7 +442,7 @@ CONTENT = r"""<!DOCTYPE html>
         loadingCount = Math.max(0, loadingCount - 1);
       }
       
-      const loader = qs('#loader');
+      const loader = els.loader;
       const buttons = document.querySelectorAll('button');
       
       if (loadingCount > 0) {
@@ -356,17 +456,17 @@ CONTENT = r"""<!DOCTYPE html>
     }
 
     function setStatus(msg, isError=false, isSuccess=false) {
-      const statusEl = qs('#status');
+      const statusEl = els.status;
       if (statusEl) {
         statusEl.textContent = msg || '';
         statusEl.style.color = isError ? 'var(--danger)' : (isSuccess ? 'var(--success)' : 'var(--text-muted)');
         statusEl.style.display = 'block';
         statusEl.style.fontWeight = isError ? 'bold' : 'normal';
         
-        // Always log status for debugging
+        // Log status for debugging
         if (msg) {
           const prefix = isError ? '❌ ERROR:' : isSuccess ? '✅ SUCCESS:' : 'ℹ️ INFO:';
-          console.log(`${prefix} ${msg}`);
+          log(`${prefix} ${msg}`);
           
           // Also show in browser console for immediate visibility
           if (isError) {
@@ -389,6 +489,11 @@ CONTENT = r"""<!DOCTYPE html>
       const timeout = 30000;
       const controller = new AbortController();
       const timeoutId = setTimeout(() => controller.abort(), timeout);
+      // Let callers cancel the request too; their abort is reported as an AbortError.
+      if (options.signal) {
+        if (options.signal.aborted) controller.abort();
+        else options.signal.addEventListener('abort', () => controller.abort(), { once: true });
+      }
       
       try {
         const res = await fetch(url, {
@@ -410,13 +515,15 @@ CONTENT = r"""<!DOCTYPE html>
           } catch {
             // Fallback to status text if body reading fails
           }
-          throw new Error(`${res.status} ${message}`);
+          const err = new Error(`${res.status} ${message}`);
+          err.status = res.status;
+          throw err;
         }
         if (res.status === 204) return null;
         return await res.json();
       } catch (error) {
         clearTimeout(timeoutId);
-        if (error.name === 'AbortError') {
+        if (error.name === 'AbortError' && !options.signal?.aborted) {
           throw new Error('Request timeout (30s)');
         }
         throw error;
@@ -427,7 +534,7 @@ CONTENT = r"""<!DOCTYPE html>
       setLoading(true);
       try {
         state.clusters = await fetchJSON('/clusters');
-        console.log('Fetched clusters:', state.clusters);
+        log('Fetched clusters:', state.clusters);
         state.activeCluster = state.clusters.find(c => c.active)?.name || null;
         renderClusters();
         renderClusterSelect();
@@ -459,15 +566,15 @@ CONTENT = r"""<!DOCTYPE html>
         </div>
       `).join('') || '<div class="muted">No clusters configured</div>';
       qs('#cluster-list').innerHTML = html;
-      console.log('Rendered clusters HTML');
+      log('Rendered clusters HTML');
     }
 
     function renderClusterSelect() {
       const html = state.clusters.map(c => 
         `<option value="${c.name}" ${c.active ? 'selected' : ''}>${c.name} (${c.host}:${c.port})</option>`
       ).join('');
-      qs('#cluster-select').innerHTML = html;
-      qs('#cluster-select').value = state.activeCluster || '';
+      els.clusterSelect.innerHTML = html;
+      els.clusterSelect.value = state.activeCluster || '';
     }
 
     async function loadDatabases() {
@@ -488,11 +595,11 @@ CONTENT = r"""<!DOCTYPE html>
       const html = state.databases.map(db => 
         `<option value="${db}">${db}</option>`
       ).join('');
-      qs('#db-select').innerHTML = html;
+      els.dbSelect.innerHTML = html;
       
       if (state.databases.length > 0) {
         state.selectedDb = state.databases[0];
-        qs('#db-select').value = state.selectedDb;
+        els.dbSelect.value = state.selectedDb;
         loadTables(state.selectedDb);
       }
     }
@@ -532,7 +639,7 @@ CONTENT = r"""<!DOCTYPE html>
         return;
       }
       
-      console.log(`Loading table details for ${database}.${tableName}`);
+      log(`Loading table details for ${database}.${tableName}`);
       setLoading(true);
       try {
         // Get table info from the tables list
@@ -540,7 +647,7 @@ CONTENT = r"""<!DOCTYPE html>
         
         // Get column details
         const columns = await fetchJSON(`/databases/${encodeURIComponent(database)}/tables/${encodeURIComponent(tableName)}/columns?cluster=${encodeURIComponent(state.activeCluster)}`);
-        console.log('Loaded columns:', columns);
+        log('Loaded columns:', columns);
         
         const detail = {
           database: database,
@@ -643,13 +750,17 @@ CONTENT = r"""<!DOCTYPE html>
     }
 
     async function activateCluster(name) {
+      // Cancel an activation that is still in flight; only the latest choice matters.
+      if (state.activateAC) state.activateAC.abort();
+      const ac = state.activateAC = new AbortController();
       setLoading(true);
       try {
-        await fetchJSON(`/clusters/${name}/activate`, { method: 'POST' });
+        await fetchJSON(`/clusters/${name}/activate`, { method: 'POST', signal: ac.signal });
         setStatus(`Cluster '${name}' activated`, false, true);
         await loadClusters();
         await loadDatabases();
       } catch (e) {
+        if (e.name === 'AbortError') return;
         setStatus(`Error activating cluster: ${e.message}`, true);
       } finally {
         setLoading(false);
@@ -774,28 +885,40 @@ CONTENT = r"""<!DOCTYPE html>
       loadTableDetail(state.selectedDb, tableName);
     }
 
+    // Trailing debounce: only the last call within `ms` runs.
+    function debounce(fn, ms) {
+      let timer;
+      return (...args) => {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn(...args), ms);
+      };
+    }
+
+    const SELECT_DEBOUNCE_MS = 150;
+
     // Event Listeners
-    qs('#cluster-select').addEventListener('change', async (e) => {
+    // Arrow keys fire 'change' per step, so coalesce them before hitting the API.
+    els.clusterSelect.addEventListener('change', debounce(async (e) => {
       const clusterName = e.target.value;
       if (clusterName && clusterName !== state.activeCluster) {
         await activateCluster(clusterName);
       }
-    });
+    }, SELECT_DEBOUNCE_MS));
 
-    qs('#db-select').addEventListener('change', (e) => {
+    els.dbSelect.addEventListener('change', debounce((e) => {
       state.selectedDb = e.target.value;
       if (state.selectedDb) {
         loadTables(state.selectedDb);
       }
-    });
+    }, SELECT_DEBOUNCE_MS));
 
-    qs('#cluster-form').addEventListener('submit', async (e) => {
+    els.clusterForm.addEventListener('submit', async (e) => {
       e.preventDefault();
       
       // Validate form inputs
-      const name = qs('#cluster-name').value.trim();
-      const host = qs('#cluster-host').value.trim();
-      const port = Number(qs('#cluster-port').value);
+      const name = els.name.value.trim();
+      const host = els.host.value.trim();
+      const port = Number(els.clusterPort.value);
       
       if (!name) {
         setStatus('Error: Cluster name is required', true);
@@ -814,13 +937,13 @@ CONTENT = r"""<!DOCTYPE html>
         name: name,
         host: host,
         port: port,
-        user: qs('#cluster-user').value.trim() || 'default',
-        password: qs('#cluster-password').value,
-        read_only: qs('#cluster-readonly').checked,
-        make_active: qs('#cluster-active').checked,
+        user: els.user.value.trim() || 'default',
+        password: els.password.value,
+        read_only: els.readonly.checked,
+        make_active: els.clusterActive.checked,
       };
       
-      console.log('Submitting cluster:', payload);
+      log('Submitting cluster:', payload);
       setLoading(true);
       setStatus('Adding cluster...', false, false);
       
@@ -832,7 +955,7 @@ CONTENT = r"""<!DOCTYPE html>
             headers: {'Content-Type': 'application/json'},
             body: JSON.stringify(payload),
           });
-          console.log('Update result:', result);
+          log('Update result:', result);
           setStatus(`Cluster '${state.editingCluster}' updated successfully!`, false, true);
           state.editingCluster = null;
         } else {
@@ -841,62 +964,82 @@ CONTENT = r"""<!DOCTYPE html>
             headers: {'Content-Type': 'application/json'},
             body: JSON.stringify(payload),
           });
-          console.log('Add result:', result);
+          log('Add result:', result);
           setStatus(`Cluster '${payload.name}' added successfully!`, false, true);
           
           // Auto-save to browser storage
           connectionStorage.saveConnection(payload);
           
           // Reset form
-          qs('#cluster-form').reset();
-          qs('#cluster-port').value = 8123;
-          qs('#cluster-active').checked = true;
+          els.clusterForm.reset();
+          els.clusterPort.value = 8123;
+          els.clusterActive.checked = true;
         }
         
         // Reload clusters and databases
-        console.log('Reloading clusters...');
+        log('Reloading clusters...');
         await loadClusters();
-        console.log('Reloading databases...');
+        log('Reloading databases...');
         await loadDatabases();
-        console.log('Cluster operation completed successfully');
+        log('Cluster operation completed successfully');
         
       } catch (e) {
         console.error('Cluster operation failed:', e);
         const action = state.editingCluster ? 'updating' : 'adding';
         let errorMsg = `Error ${action} cluster: `;
         
-        if (e.message.includes('timeout')) {
-          errorMsg += 'Request timed out. Check your network connection.';
-        } else if (e.message.includes('fetch')) {
-          errorMsg += 'Network error. Is the server running?';
-        } else if (e.message.includes('400')) {
-          errorMsg += 'Invalid cluster configuration.';
-        } else if (e.message.includes('409')) {
-          errorMsg += 'Cluster name already exists.';
-        } else if (e.message.includes('500')) {
-          errorMsg += 'Server error. Check server logs.';
-        } else {
-          errorMsg += e.message || 'Unknown error occurred';
+        switch (e.status) {
+          case 400:
+            errorMsg += 'Invalid cluster configuration.';
+            break;
+          case 409:
+            errorMsg += 'Cluster name already exists.';
+            break;
+          case 500:
+            errorMsg += 'Server error. Check server logs.';
+            break;
+          default:
+            // Other statuses, plus timeouts and network failures (no status)
+            if (e.message.includes('timeout')) {
+              errorMsg += 'Request timed out. Check your network connection.';
+            } else if (e.message.includes('fetch')) {
+              errorMsg += 'Network error. Is the server running?';
+            } else {
+              errorMsg += e.message || 'Unknown error occurred';
+            }
         }
         
         setStatus(errorMsg, true);
       } finally {
         setLoading(false);
-        console.log('Loading state cleared');
+        log('Loading state cleared');
       }
     });
 
+    // Run mapper over items with at most `concurrency` calls in flight.
+    async function pMap(items, mapper, concurrency) {
+      const it = items[Symbol.iterator]();
+      const workers = Array.from({ length: Math.min(concurrency, items.length) }, async () => {
+        for (const item of it) {
+          await mapper(item);
+        }
+      });
+      return Promise.all(workers);
+    }
+
+    const RESTORE_CONCURRENCY = 8;
+
     // Initial load with auto-restore from storage
     async function initialize() {
       updateStorageCount();
       
       // Auto-load saved connections first
-      const stored = connectionStorage.loadConnections();
+      const stored = await connectionStorage.loadConnections();
       if (stored.length > 0) {
         setStatus('Loading saved connections...', false, false);
         try {
           let loaded = 0;
-          for (const conn of stored) {
+          const restoreConnection = async (conn, makeActive) => {
             try {
               await fetchJSON('/clusters', {
                 method: 'POST',
@@ -908,14 +1051,23 @@ CONTENT = r"""<!DOCTYPE html>
                   user: conn.user,
                   password: conn.password,
                   read_only: conn.read_only,
-                  make_active: loaded === 0, // Make first one active
+                  make_active: makeActive,
                 })
               });
               loaded++;
             } catch (e) {
               console.error(`Failed to load connection '${conn.name}':`, e);
             }
+          };
+
+          // The first connection that registers becomes active, so it has to land
+          // before the rest are sent.
+          let next = 0;
+          while (next < stored.length && loaded === 0) {
+            await restoreConnection(stored[next++], true);
           }
+          await pMap(stored.slice(next), (conn) => restoreConnection(conn, false), RESTORE_CONCURRENCY);
+
           if (loaded > 0) {
             setStatus(`Auto-loaded ${loaded} saved connection(s)`, false, true);
           }
@@ -940,43 +1092,72 @@ CONTENT = r"""<!DOCTYPE html>
         return;
       }
       
-      // Populate database checkboxes
-      const checkboxContainer = qs('#database-checkboxes');
-      checkboxContainer.innerHTML = state.databases.map(db => `
-        <div class="checkbox-item">
-          <input type="checkbox" id="db-${db}" value="${db}">
-          <label for="db-${db}">${db}</label>
-        </div>
-      `).join('');
+      // Populate database checkboxes in a single innerHTML write
+      let html = '';
+      for (let i = 0, dbs = state.databases, n = dbs.length; i < n; i++) {
+        const db = escapeHtml(dbs[i]);
+        html += '<div class="checkbox-item"><input type="checkbox" id="db-' + db + '" value="' + db +
+          '"><label for="db-' + db + '">' + db + '</label></div>';
+      }
+      els.dbCheckboxes.innerHTML = html;
       
       // Show modal
-      qs('#export-modal').style.display = 'flex';
+      els.exportModal.style.display = 'flex';
     }
 
     function hideExportDialog() {
-      qs('#export-modal').style.display = 'none';
+      els.exportModal.style.display = 'none';
+    }
+
+    // The checkbox container only ever holds the inputs rendered by showExportDialog.
+    function setAllDatabasesChecked(checked) {
+      const checkboxes = els.dbCheckboxes.getElementsByTagName('input');
+      for (let i = 0; i < checkboxes.length; i++) {
+        checkboxes[i].checked = checked;
+      }
     }
 
     function selectAllDatabases() {
-      const checkboxes = document.querySelectorAll('#database-checkboxes input[type="checkbox"]');
-      checkboxes.forEach(cb => cb.checked = true);
+      setAllDatabasesChecked(true);
     }
 
     function clearAllDatabases() {
-      const checkboxes = document.querySelectorAll('#database-checkboxes input[type="checkbox"]');
-      checkboxes.forEach(cb => cb.checked = false);
+      setAllDatabasesChecked(false);
     }
 
     async function exportToExcel() {
-      const selectedDatabases = Array.from(
-        document.querySelectorAll('#database-checkboxes input[type="checkbox"]:checked')
-      ).map(cb => cb.value);
+      const selectedDatabases = [];
+      const checkboxes = els.dbCheckboxes.getElementsByTagName('input');
+      for (let i = 0; i < checkboxes.length; i++) {
+        if (checkboxes[i].checked) selectedDatabases.push(checkboxes[i].value);
+      }
       
       if (selectedDatabases.length === 0) {
         setStatus('Please select at least one database to export', true);
         return;
       }
       
+      // Ask for the destination up front: the picker needs the click's user activation,
+      // and with a file handle the response body can be piped to disk without buffering.
+      let fileHandle = null;
+      if (HAS_SAVE_PICKER) {
+        try {
+          fileHandle = await window.showSaveFilePicker({
+            suggestedName: 'table_descriptions.xlsx',
+            types: [{
+              description: 'Excel workbook',
+              accept: { [XLSX_MIME]: ['.xlsx'] },
+            }],
+          });
+        } catch (e) {
+          if (e.name === 'AbortError') {
+            setStatus('Export cancelled', false);
+            return;
+          }
+          warn('Save file picker unavailable, falling back to download:', e);
+        }
+      }
+      
       try {
         setStatus(`Exporting ${selectedDatabases.length} database(s) to Excel...`, false);
         setLoading(true);
@@ -985,7 +1166,7 @@ CONTENT = r"""<!DOCTYPE html>
           method: 'POST',
           headers: { 
             'Content-Type': 'application/json',
-            'Accept': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            'Accept': XLSX_MIME
           },
           body: JSON.stringify({
             databases: selectedDatabases,
@@ -1004,10 +1185,19 @@ CONTENT = r"""<!DOCTYPE html>
           throw new Error(errorMessage);
         }
         
+        if (fileHandle) {
+          setStatus('Saving Excel file...', false);
+          const writable = await fileHandle.createWritable();
+          await response.body.pipeTo(writable);
+          setStatus(`Successfully exported ${selectedDatabases.length} database(s) to ${fileHandle.name}`, false, true);
+          hideExportDialog();
+          return;
+        }
+        
         // Get response headers for filename
         const contentDisposition = response.headers.get('Content-Disposition');
         const contentLength = response.headers.get('Content-Length');
-        console.log('📊 Response headers:', { contentDisposition, contentLength });
+        log('📊 Response headers:', { contentDisposition, contentLength });
         
         // Extract filename from Content-Disposition header
         let filename = 'table_descriptions.xlsx';
@@ -1018,12 +1208,12 @@ CONTENT = r"""<!DOCTYPE html>
           }
         }
         
-        console.log(`📊 Downloading file: ${filename}`);
+        log(`📊 Downloading file: ${filename}`);
         setStatus('Processing Excel file...', false);
         
         // Get the response as array buffer for better control
         const arrayBuffer = await response.arrayBuffer();
-        console.log(`📊 Excel file: ${arrayBuffer.byteLength} bytes`);
+        log(`📊 Excel file: ${arrayBuffer.byteLength} bytes`);
         
         // Validate file size
         if (arrayBuffer.byteLength === 0) {
@@ -1031,87 +1221,48 @@ CONTENT = r"""<!DOCTYPE html>
         }
         
         if (arrayBuffer.byteLength < 1000) {
-          console.warn('⚠️ Suspiciously small Excel file, might be an error response');
+          warn('⚠️ Suspiciously small Excel file, might be an error response');
         }
         
         setStatus('Starting download...', false);
         
         // Create blob from array buffer with explicit type
-        const blob = new Blob([arrayBuffer], {
-          type: 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        });
+        const blob = new Blob([arrayBuffer], { type: XLSX_MIME });
         
-        // Try multiple download methods for better browser compatibility
         let downloadSuccess = false;
         
-        // Method 1: Modern approach with proper timing
-        try {
-          console.log('📊 Attempting modern download method...');
-          
-          const url = URL.createObjectURL(blob);
-          
-          // Create a temporary link element
-          const link = document.createElement('a');
-          link.href = url;
-          link.download = filename;
-          link.style.display = 'none';
-          
-          // Add to document
-          document.body.appendChild(link);
-          
-          // Wait for next tick to ensure element is in DOM
-          await new Promise(resolve => setTimeout(resolve, 50));
-          
-          // Trigger download
-          link.click();
-          
-          // Wait a bit before cleanup to ensure download starts
-          await new Promise(resolve => setTimeout(resolve, 500));
-          
-          // Cleanup immediately after delay
-          document.body.removeChild(link);
-          
-          // Delay URL revocation significantly for macOS
-          setTimeout(() => {
-            URL.revokeObjectURL(url);
-            console.log('📊 Download URL revoked');
-          }, 30000); // 30 second delay for slow downloads
+        // Download through a Blob URL; every supported browser has one, so there is
+        // no data: URL fallback (it would base64 the whole workbook in memory).
+        if (HAS_OBJECT_URL) {
+          try {
+            log('📊 Attempting modern download method...');
           
-          downloadSuccess = true;
+            const url = URL.createObjectURL(blob);
           
-        } catch (methodError) {
-          console.warn('Modern download method failed:', methodError);
-        }
-        
-        // Method 2: Fallback using data URL (for problematic browsers)
-        if (!downloadSuccess) {
-          try {
-            console.log('📊 Attempting data URL fallback method...');
-            
-            const reader = new FileReader();
-            const dataUrlPromise = new Promise((resolve, reject) => {
-              reader.onload = () => resolve(reader.result);
-              reader.onerror = reject;
-            });
-            
-            reader.readAsDataURL(blob);
-            const dataUrl = await dataUrlPromise;
-            
+            // Create a temporary link element
             const link = document.createElement('a');
-            link.href = dataUrl;
+            link.href = url;
             link.download = filename;
             link.style.display = 'none';
-            
+          
+            // appendChild is synchronous, so the link can be clicked right away
             document.body.appendChild(link);
-            await new Promise(resolve => setTimeout(resolve, 50));
             link.click();
-            await new Promise(resolve => setTimeout(resolve, 500));
+          
+            // The download is already queued; yield once and drop the link
+            await Promise.resolve();
             document.body.removeChild(link);
-            
+          
+            // Delay URL revocation significantly for macOS
+            setTimeout(() => {
+              URL.revokeObjectURL(url);
+              log('📊 Download URL revoked');
+            }, 30000); // 30 second delay for slow downloads
+          
             downloadSuccess = true;
-            
-          } catch (fallbackError) {
-            console.error('Data URL fallback failed:', fallbackError);
+          
+          } catch (methodError) {
+            warn('Modern download method failed:', methodError);
           }
         }
         
@@ -1122,19 +1273,20 @@ CONTENT = r"""<!DOCTYPE html>
         setStatus(`Successfully exported ${selectedDatabases.length} database(s) to Excel`, false, true);
         hideExportDialog();
         
-        // Show helpful info about download process
-        setTimeout(() => {
+        // Show helpful info about download process; a new export replaces any pending tips
+        if (state.exportTipTimer) clearTimeout(state.exportTipTimer);
+        state.exportTipTimer = setTimeout(() => {
           setStatus('📁 Download started! Check your Downloads folder.', false, false);
+          state.exportTipTimer = setTimeout(() => {
+            state.exportTipTimer = null;
+            if (IS_MAC) {
+              setStatus('💡 macOS: If download shows as "Не подтверждён", please wait for it to complete', false, false);
+            } else {
+              setStatus('💡 If download doesn\'t appear, check browser\'s download blocking settings', false, false);
+            }
+          }, 2000);
         }, 1000);
         
-        setTimeout(() => {
-          if (navigator.userAgent.includes('Mac')) {
-            setStatus('💡 macOS: If download shows as "Не подтверждён", please wait for it to complete', false, false);
-          } else {
-            setStatus('💡 If download doesn\'t appear, check browser\'s download blocking settings', false, false);
-          }
-        }, 3000);
-        
       } catch (error) {
         console.error('Export error:', error);
         setStatus(`Export failed: ${error.message}`, true);
@@ -1164,3 +1316,8 @@ CONTENT = r"""<!DOCTYPE html>
   </script>
 </body>
 </html>"""
+
+# The page is static, so encode, compress and fingerprint it once at import.
+_CONTENT_BYTES = CONTENT.encode("utf-8")
+_CONTENT_GZIP = gzip.compress(_CONTENT_BYTES, compresslevel=9, mtime=0)
+_ETAG = compute_etag(_CONTENT_BYTES)
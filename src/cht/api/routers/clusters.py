@@ -29,10 +29,7 @@ def add_cluster(
         read_only=config.read_only,
     )
     store.add_cluster(config.name, settings, make_active=config.make_active)
-    for info in store.list_clusters():
-        if info["name"] == config.name:
-            return info  # type: ignore[return-value]
-    raise RuntimeError("Cluster was not registered correctly")
+    return store.get_cluster_info(config.name)  # type: ignore[return-value]
 
 
 @router.post("/{name}/select", status_code=status.HTTP_204_NO_CONTENT)
@@ -80,7 +77,4 @@ def update_cluster(
         read_only=config.read_only,
     )
     store.update_cluster(name, settings, make_active=config.make_active)
-    for info in store.list_clusters():
-        if info["name"] == name:
-            return info  # type: ignore[return-value]
-    raise RuntimeError("Cluster was not updated correctly")
+    return store.get_cluster_info(name)  # type: ignore[return-value]
@@ -1,32 +1,84 @@
-import io
+import asyncio
+import os
+from concurrent.futures import Executor
 from datetime import datetime
-
-from fastapi import APIRouter, Depends, Query, Response, status
-
-from ..dependencies import get_metadata_service
-from ..schemas import ColumnInfo, CommentUpdate, ExportRequest, TableSummary
+from functools import partial
+from typing import Any, BinaryIO, Iterator
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+
+from ..caching import compute_etag, etag_matches
+from ..dependencies import get_export_executor, get_metadata_service
+from ..schemas import (
+    COLUMNS_ADAPTER,
+    DATABASES_ADAPTER,
+    TABLES_ADAPTER,
+    ColumnInfo,
+    CommentUpdate,
+    ExportRequest,
+    TableSummary,
+)
 from ..services import MetadataService
 
 router = APIRouter(prefix="/databases", tags=["metadata"])
 
+_EXPORT_CHUNK_SIZE = 64 * 1024
+# Catalog listings change rarely; let browsers reuse them briefly and then revalidate.
+_LISTING_CACHE_CONTROL = "private, max-age=30, must-revalidate"
+
+
+def _json_response(adapter: TypeAdapter, rows: Any) -> Response:
+    """Validate and serialize rows with pydantic-core, bypassing jsonable_encoder."""
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(rows)),
+        media_type="application/json",
+    )
+
+
+def _cached_json_response(request: Request, adapter: TypeAdapter, rows: Any) -> Response:
+    """Like ``_json_response`` but tagged with an ETag; unchanged listings get a bare 304."""
+    body = adapter.dump_json(adapter.validate_python(rows))
+    etag = compute_etag(body)
+    headers = {"ETag": etag, "Cache-Control": _LISTING_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _iter_file(fp: BinaryIO, chunk_size: int = _EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the file in fixed-size chunks and close it once exhausted."""
+    try:
+        while chunk := fp.read(chunk_size):
+            yield chunk
+    finally:
+        fp.close()
+
 
 @router.get("", response_model=list[str])
 def list_databases(
+    request: Request,
     cluster: str | None = Query(default=None, description="Cluster name to query"),
     service: MetadataService = Depends(get_metadata_service),
-) -> list[str]:
+) -> Response:
     """List available ClickHouse databases."""
-    return service.list_databases(cluster=cluster)
+    return _cached_json_response(
+        request, DATABASES_ADAPTER, service.list_databases(cluster=cluster)
+    )
 
 
 @router.get("/{database}/tables", response_model=list[TableSummary])
 def list_tables(
+    request: Request,
     database: str,
     cluster: str | None = Query(default=None, description="Cluster name to query"),
     service: MetadataService = Depends(get_metadata_service),
-) -> list[TableSummary]:
+) -> Response:
     """List tables in a database along with table comments."""
-    return service.list_tables(database, cluster=cluster)
+    return _cached_json_response(
+        request, TABLES_ADAPTER, service.list_tables(database, cluster=cluster)
+    )
 
 
 @router.get("/{database}/tables/{table}/columns", response_model=list[ColumnInfo])
@@ -35,9 +87,9 @@ def list_columns(
     table: str,
     cluster: str | None = Query(default=None, description="Cluster name to query"),
     service: MetadataService = Depends(get_metadata_service),
-) -> list[ColumnInfo]:
+) -> Response:
     """List table columns including type and comment."""
-    return service.list_columns(database, table, cluster=cluster)
+    return _json_response(COLUMNS_ADAPTER, service.list_columns(database, table, cluster=cluster))
 
 
 @router.patch(
@@ -74,18 +126,28 @@ def update_column_comment(
 
 
 @router.post("/export/excel")
-def export_table_descriptions_to_excel(
+async def export_table_descriptions_to_excel(
     payload: ExportRequest,
     service: MetadataService = Depends(get_metadata_service),
+    executor: Executor = Depends(get_export_executor),
 ) -> Response:
     """Export table descriptions for selected databases to Excel format.
 
     Creates one worksheet per table with columns: Column Name, Column Type, Comment.
     Each worksheet is named with the full table name (database.table).
+    The workbook is built on the dedicated export executor and streamed back in chunks.
     """
-    excel_data = service.export_table_descriptions_to_excel(
-        payload.databases, cluster=payload.cluster
+    loop = asyncio.get_running_loop()
+    excel_file = await loop.run_in_executor(
+        executor,
+        partial(
+            service.export_table_descriptions_to_excel_file,
+            payload.databases,
+            cluster=payload.cluster,
+        ),
     )
+    size = excel_file.seek(0, os.SEEK_END)
+    excel_file.seek(0)
 
     # Generate filename with timestamp for uniqueness
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -94,12 +156,12 @@ def export_table_descriptions_to_excel(
     # Ensure filename is ASCII-safe for better cross-platform compatibility
     safe_filename = filename.encode("ascii", "ignore").decode("ascii")
 
-    return Response(
-        content=excel_data,
+    return StreamingResponse(
+        _iter_file(excel_file),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={
             "Content-Disposition": f'attachment; filename="{safe_filename}"',
-            "Content-Length": str(len(excel_data)),
+            "Content-Length": str(size),
             "Content-Type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             "Accept-Ranges": "bytes",  # Helps with download resumption
             "Cache-Control": "no-cache, no-store, must-revalidate",
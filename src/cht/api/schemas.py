@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+# Read-only response rows: frozen models skip mutation bookkeeping and cache_strings lets
+# pydantic-core reuse the repeated key/value strings when building large lists.
+_ROW_CONFIG = ConfigDict(extra="forbid", frozen=True, cache_strings="all")
 
 
 class TableSummary(BaseModel):
     name: str
     comment: str | None = None
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = _ROW_CONFIG
 
 
 class ColumnInfo(BaseModel):
@@ -15,7 +19,7 @@ class ColumnInfo(BaseModel):
     type: str
     comment: str | None = None
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = _ROW_CONFIG
 
 
 class CommentUpdate(BaseModel):
@@ -48,6 +52,8 @@ class ClusterInfo(BaseModel):
     read_only: bool = False
     active: bool = False
 
+    model_config = _ROW_CONFIG
+
 
 class ExportRequest(BaseModel):
     databases: list[str]
@@ -55,4 +61,8 @@ class ExportRequest(BaseModel):
 
     model_config = ConfigDict(extra="forbid")
 
-    model_config = ConfigDict(extra="forbid")
+
+# Built once so list endpoints can validate and serialize rows entirely in pydantic-core.
+DATABASES_ADAPTER = TypeAdapter(list[str])
+TABLES_ADAPTER = TypeAdapter(list[TableSummary])
+COLUMNS_ADAPTER = TypeAdapter(list[ColumnInfo])
@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import io
 import logging
-from typing import List
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from itertools import groupby
+from operator import itemgetter
+from time import monotonic
+from typing import Any, BinaryIO, Hashable, List
 
-import openpyxl
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+import xlsxwriter
 
 from cht.table import Table
 
@@ -13,6 +19,125 @@ from .cluster_store import ClusterStore
 
 logger = logging.getLogger("cht.api.services")
 
+# Exports larger than this spill from memory to a temporary file while being streamed.
+_EXPORT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Cell formats for the Excel export, turned into workbook formats once per export.
+_TITLE_FORMAT = {"bold": True, "font_size": 14, "align": "center"}
+_LABEL_FORMAT = {"bold": True}
+_DESCRIPTION_FORMAT = {"align": "left", "text_wrap": True}
+_DESCRIPTION_PLACEHOLDER_FORMAT = {**_DESCRIPTION_FORMAT, "font_color": "#888888"}
+_HEADER_FORMAT = {
+    "bold": True,
+    "font_color": "#FFFFFF",
+    "bg_color": "#366092",
+    "align": "center",
+    "valign": "vcenter",
+    "border": 1,
+}
+_DATA_FORMAT = {"border": 1, "valign": "top", "text_wrap": True}
+_DATA_PLACEHOLDER_FORMAT = {**_DATA_FORMAT, "font_color": "#AAAAAA"}
+# Interned so every empty comment and header row refers to one string object, which the
+# workbook's shared-string table then hashes and compares by identity.
+_EXPORT_HEADERS = tuple(sys.intern(h) for h in ("Column Name", "Column Type", "Comment"))
+_TABLE_PLACEHOLDER = sys.intern("[Add table description here]")
+_COLUMN_PLACEHOLDER = sys.intern("[Add column comment here]")
+# Excel rejects cell text longer than this; longer comments are clipped before export.
+_MAX_CELL_CHARS = 32767
+
+# Table engines exposed by the metadata browser and the Excel export.
+_MERGETREE_ENGINE_FILTER = """
+                    engine LIKE '%MergeTree%'
+                    OR engine = 'MergeTree'
+                    OR engine LIKE 'Replacing%MergeTree'
+                    OR engine LIKE 'Summing%MergeTree'
+                    OR engine LIKE 'Aggregating%MergeTree'
+                    OR engine LIKE 'Collapsing%MergeTree'
+                    OR engine LIKE 'VersionedCollapsing%MergeTree'
+                    OR engine LIKE 'GraphiteMergeTree'
+"""
+
+
+# Listing queries are built once and bound with server-side parameters, so ClickHouse
+# receives identical statement text for every database and table.
+_LIST_TABLES_SQL = f"""
+    SELECT name, comment, engine
+    FROM system.tables
+    WHERE database = {{database:String}}
+      AND ({_MERGETREE_ENGINE_FILTER})
+    ORDER BY name
+"""
+_LIST_COLUMNS_SQL = """
+    SELECT name, type, comment
+    FROM system.columns
+    WHERE database = {database:String} AND table = {table:String}
+    ORDER BY position
+"""
+# The columns side is filtered in a subquery so ClickHouse only reads the selected
+# databases from system.columns instead of joining against the whole catalog.
+_EXPORT_METADATA_SQL = f"""
+    SELECT t.database, t.name, t.comment, c.name, c.type, c.comment
+    FROM system.tables AS t
+    INNER JOIN (
+        SELECT database, table, name, type, comment, position
+        FROM system.columns
+        WHERE has({{databases:Array(String)}}, database)
+    ) AS c ON c.database = t.database AND c.table = t.name
+    WHERE has({{databases:Array(String)}}, t.database)
+      AND ({_MERGETREE_ENGINE_FILTER})
+    ORDER BY t.database, t.name, c.position
+"""
+
+# Catalog listings are cached briefly so repeated UI loads and re-exports skip system.* scans.
+_METADATA_CACHE_TTL = 60.0
+_METADATA_CACHE_SIZE = 256
+
+
+def _clip_cell_text(value: str | None) -> str | None:
+    """Return ``value`` cut to Excel's cell limit, or None when it is empty."""
+    if not value:
+        return None
+    return value if len(value) <= _MAX_CELL_CHARS else value[:_MAX_CELL_CHARS]
+
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries expire ``ttl`` seconds after being stored."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
 
 class MetadataService:
     """
@@ -58,86 +183,97 @@ class MetadataService:
     ) -> bytes:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def export_table_descriptions_to_excel_file(
+        self, databases: list[str], *, cluster: str | None = None
+    ) -> BinaryIO:
+        """
+        Return the Excel export as a readable binary file positioned at the start.
+
+        The caller owns the file and must close it. The default wraps
+        ``export_table_descriptions_to_excel``; implementations can override it to avoid
+        holding the whole workbook in memory.
+        """
+        return io.BytesIO(self.export_table_descriptions_to_excel(databases, cluster=cluster))
+
 
 class ClickHouseMetadataService(MetadataService):
     """Concrete service that uses Cluster/Table for metadata operations."""
 
-    def __init__(self, cluster_store: ClusterStore) -> None:
+    def __init__(
+        self, cluster_store: ClusterStore, *, cache_ttl: float = _METADATA_CACHE_TTL
+    ) -> None:
         self.cluster_store = cluster_store
-
-    @staticmethod
-    def _escape(value: str) -> str:
-        return value.replace("'", "''")
+        # Keys start with the resolved Cluster object, so replacing or re-pointing a cluster
+        # never serves another connection's catalog. ``cache_ttl=0`` disables caching.
+        self._databases_cache = _TTLCache(_METADATA_CACHE_SIZE, cache_ttl)
+        self._tables_cache = _TTLCache(_METADATA_CACHE_SIZE, cache_ttl)
+        self._columns_cache = _TTLCache(_METADATA_CACHE_SIZE, cache_ttl)
+        self._export_cache = _TTLCache(_METADATA_CACHE_SIZE, cache_ttl)
 
     def _get_cluster(self, cluster: str | None):
-        logger.info(f"Getting cluster: {cluster}")
+        logger.debug(f"Getting cluster: {cluster}")
         try:
             result = self.cluster_store.get_cluster(cluster)
-            logger.info(f"Successfully got cluster: {result}")
+            logger.debug(f"Successfully got cluster: {result}")
             return result
         except Exception as e:
             logger.error(f"Error getting cluster {cluster}: {e}")
             raise
 
-    def list_databases(self, *, cluster: str | None = None) -> List[str]:
+    def list_databases(self, *, cluster: str | None = None, use_cache: bool = True) -> List[str]:
         try:
             logger.info(f"Listing databases for cluster: {cluster}")
             cluster_obj = self._get_cluster(cluster)
-            logger.info(f"Got cluster object: {cluster_obj}")
-            rows = cluster_obj.query_with_fresh_client("SHOW DATABASES")
+            logger.debug(f"Got cluster object: {cluster_obj}")
+            key = (cluster_obj,)
+            if use_cache and (cached := self._databases_cache.get(key)) is not None:
+                logger.info(f"Returning {len(cached)} cached databases")
+                return cached
+            rows = cluster_obj.query_pooled("SHOW DATABASES")
             logger.info(f"Query returned {len(rows or [])} databases")
-            return [row[0] for row in rows or []]
+            result = [row[0] for row in rows or []]
+            self._databases_cache.set(key, result)
+            return result
         except Exception as e:
             logger.error(f"Error listing databases for cluster {cluster}: {e}")
             raise
 
-    def list_tables(self, database: str, *, cluster: str | None = None):
+    def list_tables(self, database: str, *, cluster: str | None = None, use_cache: bool = True):
         try:
             logger.info(f"Listing tables for database {database}, cluster: {cluster}")
-            db = self._escape(database)
             cluster_obj = self._get_cluster(cluster)
-            rows = cluster_obj.query_with_fresh_client(
-                f"""
-                SELECT name, comment, engine
-                FROM system.tables
-                WHERE database = '{db}'
-                  AND (
-                    engine LIKE '%MergeTree%' 
-                    OR engine = 'MergeTree'
-                    OR engine LIKE 'Replacing%MergeTree'
-                    OR engine LIKE 'Summing%MergeTree'
-                    OR engine LIKE 'Aggregating%MergeTree'
-                    OR engine LIKE 'Collapsing%MergeTree'
-                    OR engine LIKE 'VersionedCollapsing%MergeTree'
-                    OR engine LIKE 'GraphiteMergeTree'
-                  )
-                ORDER BY name
-                """
-            )
+            key = (cluster_obj, database)
+            if use_cache and (cached := self._tables_cache.get(key)) is not None:
+                logger.info(f"Returning {len(cached)} cached MergeTree tables")
+                return cached
+            rows = cluster_obj.query_pooled(_LIST_TABLES_SQL, parameters={"database": database})
             logger.info(f"Query returned {len(rows or [])} MergeTree tables")
-            return [{"name": row[0], "comment": row[1] or None} for row in rows or []]
+            result = [{"name": row[0], "comment": row[1] or None} for row in rows or []]
+            self._tables_cache.set(key, result)
+            return result
         except Exception as e:
             logger.error(f"Error listing tables for database {database}, cluster {cluster}: {e}")
             raise
 
-    def list_columns(self, database: str, table: str, *, cluster: str | None = None):
+    def list_columns(
+        self, database: str, table: str, *, cluster: str | None = None, use_cache: bool = True
+    ):
         try:
             logger.info(f"Listing columns for {database}.{table}, cluster: {cluster}")
-            db = self._escape(database)
-            tbl = self._escape(table)
             cluster_obj = self._get_cluster(cluster)
-            rows = cluster_obj.query_with_fresh_client(
-                f"""
-                SELECT name, type, comment
-                FROM system.columns
-                WHERE database = '{db}' AND table = '{tbl}'
-                ORDER BY position
-                """
+            key = (cluster_obj, database, table)
+            if use_cache and (cached := self._columns_cache.get(key)) is not None:
+                logger.info(f"Returning {len(cached)} cached columns")
+                return cached
+            rows = cluster_obj.query_pooled(
+                _LIST_COLUMNS_SQL, parameters={"database": database, "table": table}
             )
             logger.info(f"Query returned {len(rows or [])} columns")
-            return [
+            result = [
                 {"name": row[0], "type": row[1], "comment": row[2] or None} for row in rows or []
             ]
+            self._columns_cache.set(key, result)
+            return result
         except Exception as e:
             logger.error(f"Error listing columns for {database}.{table}, cluster {cluster}: {e}")
             raise
@@ -145,8 +281,10 @@ class ClickHouseMetadataService(MetadataService):
     def update_table_comment(
         self, database: str, table: str, comment: str, *, cluster: str | None = None
     ) -> None:
-        table_obj = Table(database, table, cluster=self._get_cluster(cluster))
-        table_obj.set_comment(comment)
+        cluster_obj = self._get_cluster(cluster)
+        Table(database, table, cluster=cluster_obj).set_comment(comment)
+        self._tables_cache.pop((cluster_obj, database))
+        self._export_cache.clear()
 
     def update_column_comment(
         self,
@@ -157,8 +295,49 @@ class ClickHouseMetadataService(MetadataService):
         *,
         cluster: str | None = None,
     ) -> None:
-        table_obj = Table(database, table, cluster=self._get_cluster(cluster))
-        table_obj.set_column_comment(column, comment)
+        cluster_obj = self._get_cluster(cluster)
+        Table(database, table, cluster=cluster_obj).set_column_comment(column, comment)
+        self._columns_cache.pop((cluster_obj, database, table))
+        self._export_cache.clear()
+
+    def _fetch_export_metadata(
+        self, databases: list[str], cluster: str | None
+    ) -> tuple[dict[str, list[dict]], dict[tuple[str, str], list[dict]]]:
+        """
+        Load tables and their columns for all exported databases in a single query.
+
+        Returns tables keyed by database and columns keyed by ``(database, table)``, both in
+        the same order as the per-table endpoints.
+        """
+        if not databases:
+            return {}, {}
+        cluster_obj = self._get_cluster(cluster)
+        key = (cluster_obj, tuple(databases))
+        if (cached := self._export_cache.get(key)) is not None:
+            logger.info("Using cached export metadata")
+            return cached
+        rows = cluster_obj.query_pooled(
+            _EXPORT_METADATA_SQL, parameters={"databases": list(databases)}
+        )
+        tables: dict[str, list[dict]] = {}
+        columns: dict[tuple[str, str], list[dict]] = {}
+        for (database, table, comment), table_rows in groupby(
+            rows or [], key=itemgetter(0, 1, 2)
+        ):
+            tables.setdefault(database, []).append(
+                {"name": table, "comment": _clip_cell_text(comment)}
+            )
+            columns[(database, table)] = [
+                {"name": row[3], "type": row[4], "comment": _clip_cell_text(row[5])}
+                for row in table_rows
+            ]
+
+        logger.info(
+            f"Loaded {sum(len(t) for t in tables.values())} tables and "
+            f"{len(rows or [])} columns for export"
+        )
+        self._export_cache.set(key, (tables, columns))
+        return tables, columns
 
     def export_table_descriptions_to_excel(
         self, databases: list[str], *, cluster: str | None = None
@@ -168,26 +347,50 @@ class ClickHouseMetadataService(MetadataService):
         Creates one worksheet per table with columns: Column Name, Column Type, Comment.
         Each worksheet is named with the full table name (database.table).
         """
+        with self.export_table_descriptions_to_excel_file(databases, cluster=cluster) as fp:
+            return fp.read()
+
+    def export_table_descriptions_to_excel_file(
+        self, databases: list[str], *, cluster: str | None = None
+    ) -> BinaryIO:
+        """Write the Excel export to a spooled temporary file and return it rewound."""
+        excel_file = None
         try:
             logger.info(
                 f"Exporting table descriptions for databases {databases}, cluster: {cluster}"
             )
 
-            # Create a new workbook
-            workbook = openpyxl.Workbook()
-            # Remove the default worksheet
-            workbook.remove(workbook.active)
+            tables_by_db, columns_by_table = self._fetch_export_metadata(databases, cluster)
+
+            excel_file = tempfile.SpooledTemporaryFile(max_size=_EXPORT_SPOOL_MAX_SIZE)
+            # constant_memory flushes each row as soon as the next one starts, so only the
+            # current row is held in memory. Comments are written verbatim, never as
+            # formulas or hyperlinks.
+            workbook = xlsxwriter.Workbook(
+                excel_file,
+                {
+                    "constant_memory": True,
+                    "strings_to_numbers": False,
+                    "strings_to_formulas": False,
+                    "strings_to_urls": False,
+                },
+            )
 
-            # Header style
-            header_font = Font(bold=True, color="FFFFFF")
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_alignment = Alignment(horizontal="center", vertical="center")
+            # Formats are registered once per workbook and shared by every cell.
+            title_fmt = workbook.add_format(_TITLE_FORMAT)
+            label_fmt = workbook.add_format(_LABEL_FORMAT)
+            description_fmt = workbook.add_format(_DESCRIPTION_FORMAT)
+            description_placeholder_fmt = workbook.add_format(_DESCRIPTION_PLACEHOLDER_FORMAT)
+            header_fmt = workbook.add_format(_HEADER_FORMAT)
+            data_fmt = workbook.add_format(_DATA_FORMAT)
+            placeholder_fmt = workbook.add_format(_DATA_PLACEHOLDER_FORMAT)
+            headers = _EXPORT_HEADERS
+            used_names: set[str] = set()
 
             # Process each database
             for database in databases:
                 try:
-                    # Get all tables for this database
-                    tables = self.list_tables(database, cluster=cluster)
+                    tables = tables_by_db.get(database, [])
                     logger.info(f"Found {len(tables)} tables in database {database}")
 
                     for table_info in tables:
@@ -196,8 +399,7 @@ class ClickHouseMetadataService(MetadataService):
                         full_table_name = f"{database}.{table_name}"
 
                         try:
-                            # Get column information for this table
-                            columns = self.list_columns(database, table_name, cluster=cluster)
+                            columns = columns_by_table.get((database, table_name), [])
                             logger.info(f"Found {len(columns)} columns in table {full_table_name}")
 
                             # Create worksheet for this table
@@ -205,93 +407,75 @@ class ClickHouseMetadataService(MetadataService):
                             ws_name = full_table_name
                             if len(ws_name) > 31:
                                 ws_name = ws_name[:28] + "..."
+                            # Excel sheet names are case-insensitive; suffix truncated clashes.
+                            base_name, suffix = ws_name, 1
+                            while ws_name.lower() in used_names:
+                                tag = str(suffix)
+                                ws_name = base_name[: 31 - len(tag)] + tag
+                                suffix += 1
 
-                            worksheet = workbook.create_sheet(title=ws_name)
+                            worksheet = workbook.add_worksheet(ws_name)
+                            used_names.add(ws_name.lower())
+
+                            title = f"Table: {full_table_name}"
+                            description = table_comment or _TABLE_PLACEHOLDER
 
                             # Add table info header
-                            worksheet.merge_cells("A1:C1")
-                            worksheet["A1"] = f"Table: {full_table_name}"
-                            worksheet["A1"].font = Font(bold=True, size=14)
-                            worksheet["A1"].alignment = Alignment(horizontal="center")
+                            worksheet.merge_range(0, 0, 0, 2, title, title_fmt)
 
                             # Add description section with separate columns
-                            worksheet["A2"] = "Description"
-                            worksheet["A2"].font = Font(bold=True)
-                            worksheet.merge_cells("B2:C2")
-                            if table_comment:
-                                worksheet["B2"] = table_comment
-                            else:
-                                worksheet["B2"] = "[Add table description here]"
-                                worksheet["B2"].font = Font(color="888888")
-                            worksheet["B2"].alignment = Alignment(horizontal="left", wrap_text=True)
-
-                            # Add some spacing
-                            worksheet.row_dimensions[3].height = 8  # Empty row for spacing
-                            start_row = 4
+                            worksheet.write_string(1, 0, "Description", label_fmt)
+                            worksheet.merge_range(
+                                1,
+                                1,
+                                1,
+                                2,
+                                description,
+                                description_fmt if table_comment else description_placeholder_fmt,
+                            )
+
+                            # Add some spacing. constant_memory only flushes rows that hold a
+                            # cell, so the spacer row gets a formatted blank to keep its height.
+                            worksheet.set_row(2, 8)  # Empty row for spacing
+                            worksheet.write_blank(2, 0, None, label_fmt)
+                            start_row = 3
 
                             # Add column headers with better styling
-                            headers = ["Column Name", "Column Type", "Comment"]
-                            for col, header in enumerate(headers, 1):
-                                cell = worksheet.cell(row=start_row, column=col, value=header)
-                                cell.font = header_font
-                                cell.fill = header_fill
-                                cell.alignment = header_alignment
-                                cell.border = Border(
-                                    left=Side(style="thin"),
-                                    right=Side(style="thin"),
-                                    top=Side(style="thin"),
-                                    bottom=Side(style="thin"),
-                                )
+                            worksheet.write_row(start_row, 0, headers, header_fmt)
+
+                            # Track the widest value per column while writing; xlsxwriter
+                            # emits column widths on close, so they can be set afterwards.
+                            max_lengths = [len(title), len(description), 0]
+                            for index, header in enumerate(headers):
+                                max_lengths[index] = max(max_lengths[index], len(header))
 
                             # Add column data with minimal formatting
                             for row, column in enumerate(columns, start_row + 1):
-                                # Column name
-                                worksheet.cell(row=row, column=1, value=column["name"])
-
-                                # Column type
-                                worksheet.cell(row=row, column=2, value=column["type"])
+                                name = column["name"]
+                                col_type = column["type"]
+                                worksheet.write_string(row, 0, name, data_fmt)
+                                worksheet.write_string(row, 1, col_type, data_fmt)
 
                                 # Column comment (with placeholder if empty)
                                 comment_value = column.get("comment")
-                                comment_cell = worksheet.cell(row=row, column=3)
                                 if comment_value:
-                                    comment_cell.value = comment_value
+                                    worksheet.write_string(row, 2, comment_value, data_fmt)
                                 else:
-                                    comment_cell.value = "[Add column comment here]"
-                                    comment_cell.font = Font(color="AAAAAA")
-
-                                # Add minimal borders to all data cells
-                                for col in range(1, 4):
-                                    cell = worksheet.cell(row=row, column=col)
-                                    cell.border = Border(
-                                        left=Side(style="thin"),
-                                        right=Side(style="thin"),
-                                        top=Side(style="thin"),
-                                        bottom=Side(style="thin"),
-                                    )
-                                    cell.alignment = Alignment(vertical="top", wrap_text=True)
-
-                            # Auto-adjust column widths
-                            for col_num, column_cells in enumerate(worksheet.columns, 1):
-                                max_length = 0
-                                column_letter = openpyxl.utils.get_column_letter(col_num)
-
-                                for cell in column_cells:
-                                    try:
-                                        # Skip merged cells which don't have individual values
-                                        if hasattr(cell, "value") and cell.value is not None:
-                                            cell_length = len(str(cell.value))
-                                            if cell_length > max_length:
-                                                max_length = cell_length
-                                    except Exception:
-                                        # Skip any problematic cells
-                                        pass
-
-                                # Set column width with reasonable limits
-                                adjusted_width = min(
-                                    max(max_length + 2, 10), 50
-                                )  # Min 10, Max 50 characters
-                                worksheet.column_dimensions[column_letter].width = adjusted_width
+                                    comment_value = _COLUMN_PLACEHOLDER
+                                    worksheet.write_string(row, 2, comment_value, placeholder_fmt)
+
+                                if len(name) > max_lengths[0]:
+                                    max_lengths[0] = len(name)
+                                if len(col_type) > max_lengths[1]:
+                                    max_lengths[1] = len(col_type)
+                                if len(comment_value) > max_lengths[2]:
+                                    max_lengths[2] = len(comment_value)
+
+                            # Min 10, Max 50 characters
+                            for col_num, max_length in enumerate(max_lengths):
+                                worksheet.set_column(
+                                    col_num, col_num, min(max(max_length + 2, 10), 50)
+                                )
 
                         except Exception as e:
                             logger.error(f"Error processing table {full_table_name}: {e}")
@@ -304,21 +488,20 @@ class ClickHouseMetadataService(MetadataService):
                     continue
 
             # If no worksheets were created, create a summary sheet
-            if not workbook.worksheets:
-                worksheet = workbook.create_sheet(title="Export Summary")
-                worksheet["A1"] = "No tables found in the selected databases"
-                worksheet["A1"].font = Font(bold=True)
+            if not workbook.worksheets():
+                worksheet = workbook.add_worksheet("Export Summary")
+                worksheet.write_string(0, 0, "No tables found in the selected databases", label_fmt)
 
-            # Save to bytes
-            excel_buffer = io.BytesIO()
-            workbook.save(excel_buffer)
-            excel_buffer.seek(0)
+            sheet_count = len(workbook.worksheets())
+            workbook.close()
+            excel_file.seek(0)
 
-            logger.info(
-                f"Successfully created Excel export with {len(workbook.worksheets)} worksheets"
-            )
-            return excel_buffer.getvalue()
+            logger.info(f"Successfully created Excel export with {sheet_count} worksheets")
+            return excel_file
 
         except Exception as e:
             logger.error(f"Error creating Excel export: {e}")
+            # Past the spool threshold the file lives on disk; don't leave it behind.
+            if excel_file is not None:
+                excel_file.close()
             raise
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import logging
+import queue
 import re
+import threading
+from contextlib import AbstractContextManager, closing, contextmanager
 from time import strftime, time
-from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional, Sequence
 
 import clickhouse_connect
 import pandas as pd
 from clickhouse_connect.driver.client import Client
+from clickhouse_connect.driver.exceptions import DatabaseError, OperationalError
 from clickhouse_connect.driver.query import QueryResult
 
 if TYPE_CHECKING:
@@ -16,17 +20,47 @@ if TYPE_CHECKING:
 _logger = logging.getLogger("cht.cluster")
 
 # Detect statements that mutate data or metadata so we can guard read-only sessions.
-_MUTATING_RE = re.compile(
-    r"^\s*(ALTER|ATTACH|DETACH|DROP|TRUNCATE|RENAME|"
-    r"INSERT|UPDATE|DELETE|REPLACE|OPTIMIZE|SYSTEM|"
-    r"CREATE|KILL)\b",
-    re.IGNORECASE | re.DOTALL,
+_MUTATING_KEYWORDS = frozenset(
+    {
+        "ALTER",
+        "ATTACH",
+        "DETACH",
+        "DROP",
+        "TRUNCATE",
+        "RENAME",
+        "INSERT",
+        "UPDATE",
+        "DELETE",
+        "REPLACE",
+        "OPTIMIZE",
+        "SYSTEM",
+        "CREATE",
+        "KILL",
+    }
 )
+# First keyword of a statement; bound ``match`` avoids an attribute lookup per query.
+_leading_word = re.compile(r"\s*(\w+)").match
 
 
 def is_mutating(sql: str) -> bool:
     """Return True when the statement mutates ClickHouse state."""
-    return bool(_MUTATING_RE.match(sql or ""))
+    match = _leading_word(sql or "")
+    return match is not None and match.group(1).upper() in _MUTATING_KEYWORDS
+
+
+class _TruncatedSQL:
+    """Log argument that clips SQL text only when a handler actually formats the record."""
+
+    __slots__ = ("sql", "limit")
+
+    def __init__(self, sql: str, limit: int) -> None:
+        self.sql = sql
+        self.limit = limit
+
+    def __str__(self) -> str:
+        if len(self.sql) <= self.limit:
+            return self.sql
+        return self.sql[: self.limit] + " … [truncated]"
 
 
 class Cluster:
@@ -36,6 +70,7 @@ class Cluster:
     * lazy connection initialisation
     * structured logging for every statement
     * a single choke point for enforcing read-only sessions
+    * a bounded pool of clients for concurrent callers such as the web API
     * helper methods for common introspection routines
     """
 
@@ -52,6 +87,7 @@ class Cluster:
         verify: bool = False,
         log_sql_text: bool = True,
         log_sql_truncate: int = 4000,
+        pool_size: int = 8,
         client_factory: Callable[..., Client] = clickhouse_connect.get_client,
     ) -> None:
         self.name = name
@@ -67,43 +103,60 @@ class Cluster:
             log_sql_truncate if log_sql_truncate and log_sql_truncate > 0 else 4000
         )
         self._client_factory = client_factory
-        self._client: Optional[Client] = None
+        self.pool_size = pool_size if pool_size and pool_size > 0 else 8
+        self._init_connection_state()
 
-        if not _logger.handlers:
-            logging.basicConfig(
-                level=logging.INFO,
-                format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-            )
+    def _init_connection_state(self) -> None:
+        self._client: Optional[Client] = None
+        self._client_lock = threading.Lock()
+        # Idle pooled clients; the semaphore caps how many are borrowed at once.
+        self._pool: "queue.LifoQueue[Client]" = queue.LifoQueue()
+        self._pool_slots = threading.BoundedSemaphore(self.pool_size)
+
+    # Locks and open connections can't be pickled or copied; a restored Cluster reconnects
+    # lazily, just like a freshly constructed one.
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        for key in ("_client", "_client_lock", "_pool", "_pool_slots"):
+            del state[key]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_connection_state()
 
     # ----------------------- connection management -----------------------
     @property
     def client(self) -> Client:
         if self._client is None:
-            settings = {"readonly": 1} if self.read_only else {}
-
-            _logger.info(
-                "Establishing connection | cluster=%s host=%s:%s user=%s secure=%s "
-                "verify=%s read_only=%s",
-                self.name,
-                self.host,
-                self.port,
-                self.user,
-                self.secure,
-                self.verify,
-                self.read_only,
-            )
-            if not self.read_only:
-                _logger.warning("Session is NOT read-only | cluster=%s", self.name)
-
-            self._client = self._client_factory(
-                host=self.host,
-                port=self.port,
-                username=self.user,
-                password=self.password,
-                secure=self.secure,
-                verify=self.verify,
-                settings=settings,
-            )
+            # Threads that race on first use must not build (and leak) duplicate clients.
+            with self._client_lock:
+                if self._client is None:
+                    settings = {"readonly": 1} if self.read_only else {}
+
+                    _logger.info(
+                        "Establishing connection | cluster=%s host=%s:%s user=%s secure=%s "
+                        "verify=%s read_only=%s",
+                        self.name,
+                        self.host,
+                        self.port,
+                        self.user,
+                        self.secure,
+                        self.verify,
+                        self.read_only,
+                    )
+                    if not self.read_only:
+                        _logger.warning("Session is NOT read-only | cluster=%s", self.name)
+
+                    self._client = self._client_factory(
+                        host=self.host,
+                        port=self.port,
+                        username=self.user,
+                        password=self.password,
+                        secure=self.secure,
+                        verify=self.verify,
+                        settings=settings,
+                    )
         return self._client
 
     def create_fresh_client(self) -> Client:
@@ -126,23 +179,64 @@ class Cluster:
             settings=settings,
         )
 
+    @contextmanager
+    def borrow_client(self) -> Iterator[Client]:
+        """
+        Borrow a client from the per-cluster pool, blocking while ``pool_size`` are in use.
+
+        Each borrowed client serves one caller at a time, so concurrent web requests neither
+        share a session nor pay for a new connection per query. Server-side query errors leave
+        the client reusable and it goes back to the pool; any other failure (connection or
+        transport errors included) closes it instead.
+        """
+        with self._pool_slots:
+            try:
+                client = self._pool.get_nowait()
+            except queue.Empty:
+                client = self.create_fresh_client()
+            try:
+                yield client
+            except DatabaseError as exc:
+                if isinstance(exc, OperationalError):
+                    client.close()
+                else:
+                    self._pool.put(client)
+                raise
+            except BaseException:
+                client.close()
+                raise
+            self._pool.put(client)
+
+    def close_pool(self) -> None:
+        """Close every idle pooled client."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
     # ---------------------------- execution ------------------------------
-    def _execute_logged(self, sql: str, *, test_run: bool = False) -> Optional[QueryResult]:
+    def _execute_logged(
+        self,
+        sql: str,
+        *,
+        test_run: bool = False,
+        as_df: bool = False,
+        mutating: Optional[bool] = None,
+        parameters: Optional[dict[str, Any]] = None,
+    ) -> Optional[QueryResult | pd.DataFrame]:
+        # Callers that already classified the statement pass ``mutating`` to skip a rescan.
         trimmed = (sql or "").strip()
-        mutating = is_mutating(trimmed)
+        if mutating is None:
+            mutating = is_mutating(trimmed)
 
         if self.log_sql_text:
-            display = (
-                trimmed
-                if len(trimmed) <= self.log_sql_truncate
-                else trimmed[: self.log_sql_truncate] + " … [truncated]"
-            )
             _logger.info(
                 "%s | cluster=%s | len=%d | sql=%s%s",
                 "MUTATION" if mutating else "QUERY",
                 self.name,
                 len(trimmed),
-                display,
+                _TruncatedSQL(trimmed, self.log_sql_truncate),
                 " [TEST-RUN]" if test_run else "",
             )
         else:
@@ -161,17 +255,29 @@ class Cluster:
         if test_run:
             return None
 
+        # Server-side parameter binding, e.g. ``{db:String}``; omitted when there is none
+        bind = {"parameters": parameters} if parameters else {}
         start = time()
         try:
             if mutating:
-                self.client.command(trimmed)
+                self.client.command(trimmed, **bind)
                 _logger.info(
                     "MUTATION OK | cluster=%s | elapsed=%.3fs",
                     self.name,
                     time() - start,
                 )
                 return None
-            result = self.client.query(trimmed)
+            if as_df:
+                # Columnar fetch straight into numpy-backed frames, no per-row tuples.
+                frame = self.client.query_df(trimmed, **bind)
+                _logger.info(
+                    "QUERY OK | cluster=%s | rows=%d | elapsed=%.3fs",
+                    self.name,
+                    len(frame),
+                    time() - start,
+                )
+                return frame
+            result = self.client.query(trimmed, **bind)
             _logger.info(
                 "QUERY OK | cluster=%s | rows=%d | elapsed=%.3fs",
                 self.name,
@@ -189,15 +295,58 @@ class Cluster:
             )
             raise
 
-    def query(self, sql: str, *, test_run: bool = False) -> Optional[Sequence[Sequence[Any]]]:
+    def query(
+        self,
+        sql: str,
+        *,
+        parameters: Optional[dict[str, Any]] = None,
+        test_run: bool = False,
+    ) -> Optional[Sequence[Sequence[Any]]]:
         """Execute SQL and return rows (or None for mutation statements)."""
-        result = self._execute_logged(sql, test_run=test_run)
+        result = self._execute_logged(sql, test_run=test_run, parameters=parameters)
         return None if result is None else result.result_rows
 
+    def query_stream(
+        self,
+        sql: str,
+        *,
+        parameters: Optional[dict[str, Any]] = None,
+        test_run: bool = False,
+    ) -> Iterator[Sequence[Any]]:
+        """
+        Execute a read query and yield its rows one native block at a time.
+        Unlike :meth:`query`, the full result set is never held as a single list of rows.
+        """
+        trimmed = (sql or "").strip()
+        if is_mutating(trimmed):
+            raise ValueError("query_stream only supports read queries")
+
+        if self.log_sql_text:
+            _logger.info(
+                "QUERY STREAM | cluster=%s | len=%d | sql=%s%s",
+                self.name,
+                len(trimmed),
+                _TruncatedSQL(trimmed, self.log_sql_truncate),
+                " [TEST-RUN]" if test_run else "",
+            )
+        if test_run:
+            return iter(())
+        return self._stream_rows(trimmed, {"parameters": parameters} if parameters else {})
+
+    def _stream_rows(self, sql: str, bind: dict[str, Any]) -> Iterator[Sequence[Any]]:
+        with self.client.query_row_block_stream(sql, **bind) as stream:
+            for block in stream:
+                yield from block
+
     def query_raw(self, sql: str, *, test_run: bool = False) -> Optional[QueryResult]:
         """Execute SQL and return the ``QueryResult`` object from ``clickhouse_connect``."""
         return self._execute_logged(sql, test_run=test_run)
 
+    def query_df(self, sql: str, *, test_run: bool = False) -> pd.DataFrame:
+        """Execute SQL and return the result as a pandas DataFrame (empty for mutations)."""
+        frame = self._execute_logged(sql, test_run=test_run, as_df=True)
+        return pd.DataFrame() if frame is None else frame
+
     def query_with_fresh_client(
         self, sql: str, *, test_run: bool = False
     ) -> Optional[Sequence[Sequence[Any]]]:
@@ -206,6 +355,43 @@ class Cluster:
         Use this in concurrent environments (like web APIs) to avoid
         'concurrent queries within the same session' errors.
         """
+        return self._execute_isolated(
+            sql,
+            lambda: closing(self.create_fresh_client()),
+            label="fresh client",
+            test_run=test_run,
+        )
+
+    def query_pooled(
+        self,
+        sql: str,
+        *,
+        parameters: Optional[dict[str, Any]] = None,
+        test_run: bool = False,
+    ) -> Optional[Sequence[Sequence[Any]]]:
+        """
+        Execute SQL on a client borrowed from the per-cluster pool.
+        Safe for concurrent callers like :meth:`query_with_fresh_client`, but reuses
+        connections and runs at most ``pool_size`` statements against the cluster at once.
+        ``parameters`` are bound server-side to ``{name:Type}`` placeholders in ``sql``.
+        """
+        return self._execute_isolated(
+            sql,
+            self.borrow_client,
+            label="pooled client",
+            parameters=parameters,
+            test_run=test_run,
+        )
+
+    def _execute_isolated(
+        self,
+        sql: str,
+        acquire: Callable[[], AbstractContextManager[Client]],
+        *,
+        label: str,
+        parameters: Optional[dict[str, Any]] = None,
+        test_run: bool = False,
+    ) -> Optional[Sequence[Sequence[Any]]]:
         trimmed = (sql or "").strip()
         mutating = is_mutating(trimmed)
 
@@ -213,53 +399,48 @@ class Cluster:
             raise RuntimeError(f"Attempted mutation in read-only cluster '{self.name}': {sql[:50]}")
 
         if self.log_sql_text:
-            display = (
-                trimmed
-                if len(trimmed) <= self.log_sql_truncate
-                else trimmed[: self.log_sql_truncate] + " … [truncated]"
-            )
             _logger.info(
-                "EXECUTE (fresh client) | cluster=%s | sql=%s | test_run=%s",
+                "EXECUTE (%s) | cluster=%s | sql=%s | test_run=%s",
+                label,
                 self.name,
-                display,
+                _TruncatedSQL(trimmed, self.log_sql_truncate),
                 test_run,
             )
 
         if test_run:
             return None
 
-        # Create a fresh client for this query to avoid concurrency issues
-        client = self.create_fresh_client()
-        start = time()
-        try:
-            if mutating:
-                client.command(trimmed)
+        with acquire() as client:
+            start = time()
+            try:
+                if mutating:
+                    client.command(trimmed, parameters=parameters)
+                    _logger.info(
+                        "MUTATION OK (%s) | cluster=%s | elapsed=%.3fs",
+                        label,
+                        self.name,
+                        time() - start,
+                    )
+                    return None
+                result = client.query(trimmed, parameters=parameters)
                 _logger.info(
-                    "MUTATION OK (fresh client) | cluster=%s | elapsed=%.3fs",
+                    "QUERY OK (%s) | cluster=%s | rows=%d | elapsed=%.3fs",
+                    label,
                     self.name,
+                    len(result.result_rows),
                     time() - start,
                 )
-                return None
-            result = client.query(trimmed)
-            _logger.info(
-                "QUERY OK (fresh client) | cluster=%s | rows=%d | elapsed=%.3fs",
-                self.name,
-                len(result.result_rows),
-                time() - start,
-            )
-            return result.result_rows
-        except Exception as exc:  # pragma: no cover - logging side effect
-            _logger.exception(
-                "%s FAILED (fresh client) | cluster=%s | elapsed=%.3fs | error=%s",
-                "MUTATION" if mutating else "QUERY",
-                self.name,
-                time() - start,
-                exc,
-            )
-            raise
-        finally:
-            # Close the client connection
-            client.close()
+                return result.result_rows
+            except Exception as exc:  # pragma: no cover - logging side effect
+                _logger.exception(
+                    "%s FAILED (%s) | cluster=%s | elapsed=%.3fs | error=%s",
+                    "MUTATION" if mutating else "QUERY",
+                    label,
+                    self.name,
+                    time() - start,
+                    exc,
+                )
+                raise
 
     def query_bulk(self, queries: Iterable[str], *, test_run: bool = False) -> None:
         """Run a reusable bulk executor with progress messages to stdout."""
@@ -275,12 +456,13 @@ class Cluster:
         for idx, query in enumerate(queries, 1):
             timestamp = strftime("%Y-%m-%d %H:%M:%S")
             trimmed = (query or "").strip()
+            mutating = is_mutating(trimmed)
             print(
                 f"📌 [{idx}/{total}] {timestamp} len={len(trimmed)} "
-                f"{'MUTATION' if is_mutating(trimmed) else 'QUERY'} (test_run={test_run})"
+                f"{'MUTATION' if mutating else 'QUERY'} (test_run={test_run})"
             )
             try:
-                self._execute_logged(trimmed, test_run=test_run)
+                self._execute_logged(trimmed, test_run=test_run, mutating=mutating)
                 print(f"✅ [{idx}/{total}] Success\n")
             except Exception as exc:  # pragma: no cover - interactive feedback
                 print(f"❌ [{idx}/{total}] Failed: {exc}\n🛑 Stopping execution.")
@@ -302,10 +484,7 @@ class Cluster:
         FROM system.disks
         ORDER BY used_percentage DESC
         """
-        result = self.query_raw(sql)
-        if result is None:
-            return pd.DataFrame()
-        return pd.DataFrame(result.result_rows, columns=result.column_names)
+        return self.query_df(sql)
 
     def get_table_disk_distribution(self, database: str = "default") -> pd.DataFrame:
         sql = f"""
@@ -327,10 +506,7 @@ class Cluster:
         GROUP BY p.table
         ORDER BY sum(p.bytes_on_disk) DESC
         """
-        result = self.query_raw(sql)
-        if result is None:
-            return pd.DataFrame()
-        return pd.DataFrame(result.result_rows, columns=result.column_names)
+        return self.query_df(sql)
 
     def get_column_disk_usage(
         self,
@@ -356,10 +532,7 @@ class Cluster:
         GROUP BY column
         ORDER BY sum(column_data_compressed_bytes) DESC
         """
-        result = self.query_raw(sql)
-        if result is None:
-            return pd.DataFrame()
-        return pd.DataFrame(result.result_rows, columns=result.column_names)
+        return self.query_df(sql)
 
     def get_dependency_graph(self) -> "DependencyGraph":
         """
@@ -6,6 +6,8 @@ boots, executes a query, and exits while still keeping data on disk.
 
 from __future__ import annotations
 
+import errno
+import io
 import json
 import os
 import platform
@@ -13,24 +15,68 @@ import re
 import shutil
 import subprocess
 import tempfile
+import threading
 import urllib.request
+from collections import OrderedDict
 from dataclasses import asdict, dataclass
-from typing import Any, Dict, Optional, Sequence, Union
+from typing import BinaryIO, Callable, Dict, Hashable, Optional, Sequence, Union
 
 import pandas as pd
 from pandas.api.types import is_bool_dtype, is_datetime64_any_dtype
 
 from .dataframe import resolve_column_types
 
+try:  # Colab's pandas ships with pyarrow; without it inserts fall back to CSV.
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
 _FORMAT_RE = re.compile(r"\bFORMAT\b", re.IGNORECASE)
 _JSON_EACH_ROW_RE = re.compile(r"\bJSONEachRow\b", re.IGNORECASE)
+_ARROW_STREAM_RE = re.compile(r"\bArrowStream\b", re.IGNORECASE)
+_LEADING_TOKEN_RE = re.compile(r"[\s(]*(\w+)")
+_RESULT_SET_TOKENS = frozenset({"SELECT", "WITH", "SHOW", "DESCRIBE", "EXPLAIN"})
+# Rows per Arrow record batch / CSV write when streaming inserts into clickhouse local.
+_INSERT_CHUNK_ROWS = 65536
+# DataFrame results of recent SELECTs kept by ``run_sql(use_cache=True)``.
+_RESULT_CACHE_SIZE = 32
+# Queries up to this size go inline as ``--query``; Linux caps one argv string at 128 KiB.
+_INLINE_QUERY_MAX_CHARS = 32_000
 
 
 def _first_token(sql: str) -> str:
-    stripped = (sql or "").strip().lstrip("(").strip()
-    if not stripped:
-        return ""
-    return stripped.split(None, 1)[0].upper()
+    match = _LEADING_TOKEN_RE.match(sql or "")
+    return match.group(1).upper() if match else ""
+
+
+class _ResultCache:
+    """Thread-safe LRU of query results shared by every ``LazyCluster`` in the process."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._data: "OrderedDict[Hashable, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: pd.DataFrame) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_RESULT_CACHE = _ResultCache(maxsize=_RESULT_CACHE_SIZE)
 
 
 def _quote_ident(name: str) -> str:
@@ -44,17 +90,37 @@ def _quote_table(name: str) -> str:
     return _quote_ident(name)
 
 
+def _read_arrow_stream(payload: bytes) -> pd.DataFrame:
+    # Default conversion copies into consolidated blocks, so callers get writable columns.
+    reader = pa.ipc.open_stream(pa.BufferReader(payload))
+    return reader.read_pandas()
+
+
+def _join_statements(statements: Sequence[str]) -> str:
+    return ";\n".join(sql.strip().rstrip(";") for sql in statements)
+
+
 def _normalize_df_for_csv(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    for column in out.columns:
-        series = out[column]
+    # Rebuild only tz-aware datetime/bool columns; others are shared with ``df``, not copied.
+    # Naive datetimes are left to ``to_csv``'s native ISO formatting.
+    changed: Dict[str, pd.Series] = {}
+    for column, series in df.items():
         if is_datetime64_any_dtype(series.dtype):
             if getattr(series.dt, "tz", None) is not None:
-                series = series.dt.tz_convert("UTC").dt.tz_localize(None)
-            out[column] = series.dt.strftime("%Y-%m-%d %H:%M:%S.%f").str.slice(0, 23)
+                changed[column] = series.dt.tz_convert("UTC").dt.tz_localize(None)
         elif is_bool_dtype(series.dtype):
-            out[column] = series.astype("Int64", errors="ignore")
-    return out
+            changed[column] = series.astype("Int64", errors="ignore")
+    return df.assign(**changed) if changed else df
+
+
+def _df_to_arrow_table(df: pd.DataFrame) -> Optional["pa.Table"]:
+    """Convert ``df`` to an Arrow table, or return None if pyarrow can't encode it."""
+    if pa is None:
+        return None
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return None
 
 
 def _resolve_clickhouse_download_url() -> str:
@@ -127,10 +193,10 @@ def install_clickhouse(
                 stderr = proc.stderr.decode("utf-8", errors="replace").strip()
                 raise RuntimeError(f"ClickHouse download failed: {stderr or 'wget error'}")
         else:
+            # Stream to disk in 1 MiB chunks; the binary is too large to hold in memory.
             with urllib.request.urlopen(url, timeout=timeout_s) as response:
-                data = response.read()
-            with open(temp_path, "wb") as handle:
-                handle.write(data)
+                with open(temp_path, "wb") as handle:
+                    shutil.copyfileobj(response, handle, length=1 << 20)
 
         if not os.path.isfile(temp_path) or os.path.getsize(temp_path) == 0:
             raise RuntimeError("ClickHouse download failed: empty binary")
@@ -147,7 +213,9 @@ class LazyCluster:
     """
     Serializable single-node ClickHouse cluster handle for Colab.
 
-    Uses ``clickhouse local`` for each call to avoid background daemons.
+    Uses ``clickhouse local`` for each call to avoid background daemons, so every call pays
+    a process boot. For repeated queries against a running server prefer
+    :class:`cht.cluster.Cluster`, which keeps pooled HTTP clients alive between calls.
     """
 
     clickhouse_bin: str = "/content/clickhouse"
@@ -194,8 +262,18 @@ class LazyCluster:
         sql: str,
         *,
         stdin_bytes: Optional[bytes] = None,
+        stdin_writer: Optional[Callable[[BinaryIO], None]] = None,
         timeout_s: int = 300,
+        capture_stdout: bool = True,
     ) -> subprocess.CompletedProcess:
+        """
+        Run ``sql`` in a one-shot ``clickhouse local``.
+
+        Input data for ``INSERT ... FORMAT`` comes either from ``stdin_bytes`` or from
+        ``stdin_writer``, which is called with the process stdin and streams into it.
+        Statements with no useful output pass ``capture_stdout=False`` to discard it unread;
+        stderr is always captured for error messages.
+        """
         clickhouse_bin = self._ensure_ready()
 
         prefix = (
@@ -203,29 +281,36 @@ class LazyCluster:
             f"USE {_quote_ident(self.database)}; "
         )
         query_body = sql.strip().rstrip(";")
-        if stdin_bytes is None:
+        if stdin_bytes is None and stdin_writer is None:
             query_body = f"{query_body};"
         query = prefix + query_body + "\n"
 
         query_path = None
         try:
-            with tempfile.NamedTemporaryFile("w", delete=False) as handle:
-                handle.write(query)
-                query_path = handle.name
+            if len(query) <= _INLINE_QUERY_MAX_CHARS:
+                query_args = ["--multiquery", "--query", query]
+            else:
+                with tempfile.NamedTemporaryFile("w", delete=False) as handle:
+                    handle.write(query)
+                    query_path = handle.name
+                query_args = ["--queries-file", query_path]
 
             cmd = [
                 clickhouse_bin,
                 "local",
                 "--path",
                 self.data_path,
-                "--queries-file",
-                query_path,
+                *query_args,
+                "--output_format_arrow_string_as_string=1",
             ]
 
+            stdout = subprocess.PIPE if capture_stdout else subprocess.DEVNULL
+            if stdin_writer is not None:
+                return self._run_streaming(cmd, stdin_writer, stdout=stdout, timeout_s=timeout_s)
             return subprocess.run(
                 cmd,
                 input=stdin_bytes,
-                stdout=subprocess.PIPE,
+                stdout=stdout,
                 stderr=subprocess.PIPE,
                 timeout=timeout_s,
                 check=False,
@@ -234,12 +319,53 @@ class LazyCluster:
             if query_path and os.path.exists(query_path):
                 os.remove(query_path)
 
+    @staticmethod
+    def _run_streaming(
+        cmd: list[str],
+        stdin_writer: Callable[[BinaryIO], None],
+        *,
+        stdout: int = subprocess.PIPE,
+        timeout_s: int,
+    ) -> subprocess.CompletedProcess:
+        """Feed stdin from a thread while collecting output, like ``subprocess.run``."""
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=stdout, stderr=subprocess.PIPE)
+        # Detach stdin so communicate() only drains output and never closes it under the feeder.
+        stdin, proc.stdin = proc.stdin, None
+        errors: list[BaseException] = []
+
+        def feed() -> None:
+            try:
+                stdin_writer(stdin)
+            except BaseException as exc:  # pragma: no cover - surfaced below
+                # EPIPE means clickhouse exited early; its stderr explains why.
+                if not (isinstance(exc, OSError) and exc.errno == errno.EPIPE):
+                    errors.append(exc)
+            finally:
+                try:
+                    stdin.close()
+                except OSError:
+                    pass
+
+        feeder = threading.Thread(target=feed, name="clickhouse-local-stdin", daemon=True)
+        feeder.start()
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout_s)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+        finally:
+            feeder.join()
+        if errors:
+            raise errors[0]
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
     @staticmethod
     def _raise_for_proc(proc: subprocess.CompletedProcess, *, context: str) -> None:
         if proc.returncode == 0:
             return
         stderr = proc.stderr.decode("utf-8", errors="replace").strip()
-        stdout = proc.stdout.decode("utf-8", errors="replace").strip()
+        stdout = (proc.stdout or b"").decode("utf-8", errors="replace").strip()
         detail = stderr or stdout or "Unknown ClickHouse error"
         raise RuntimeError(f"{context} failed: {detail}")
 
@@ -249,41 +375,81 @@ class LazyCluster:
         *,
         as_df: Optional[bool] = None,
         timeout_s: int = 300,
+        use_cache: bool = False,
     ) -> Union[pd.DataFrame, str, None]:
         """
         Boot → execute → stop (process exits). SELECT-like queries return a DataFrame.
+
+        With ``use_cache=True`` DataFrame results are kept in a small in-process LRU keyed by
+        data path, database and query text, and any statement run through a ``LazyCluster``
+        clears it. Only enable it for deterministic queries over data that nothing outside
+        this process changes.
         """
-        token = _first_token(sql)
         if as_df is None:
-            as_df = token in {"SELECT", "WITH", "SHOW", "DESCRIBE", "EXPLAIN"}
+            as_df = _first_token(sql) in _RESULT_SET_TOKENS
 
         if as_df:
             query = sql.strip().rstrip(";")
-            has_format = bool(_FORMAT_RE.search(query))
-            if has_format and not _JSON_EACH_ROW_RE.search(query):
-                raise ValueError("as_df=True requires FORMAT JSONEachRow")
-            if not has_format:
-                query = f"{query} FORMAT JSONEachRow"
-
-            proc = self._run_local(query, timeout_s=timeout_s)
-            self._raise_for_proc(proc, context="Query")
-
-            text = proc.stdout.decode("utf-8", errors="replace").strip()
-            if not text:
-                return pd.DataFrame()
-
-            rows: list[Dict[str, Any]] = []
-            for line in text.splitlines():
-                line = line.strip()
-                if line:
-                    rows.append(json.loads(line))
-            return pd.DataFrame(rows)
-
+            if _FORMAT_RE.search(query):
+                use_arrow = bool(_ARROW_STREAM_RE.search(query))
+                if not use_arrow and not _JSON_EACH_ROW_RE.search(query):
+                    raise ValueError("as_df=True requires FORMAT JSONEachRow or ArrowStream")
+                if use_arrow and pa is None:
+                    raise ValueError("FORMAT ArrowStream requires pyarrow")
+            else:
+                # Typed ArrowStream keeps Int64/DateTime64 lossless; JSON is the fallback.
+                use_arrow = pa is not None
+                query = f"{query} FORMAT {'ArrowStream' if use_arrow else 'JSONEachRow'}"
+
+            key = (self.data_path, self.database, query)
+            if use_cache:
+                cached = _RESULT_CACHE.get(key)
+                if cached is not None:
+                    return cached.copy(deep=True)
+
+            df = self._fetch_df(query, use_arrow=use_arrow, timeout_s=timeout_s)
+            if use_cache:
+                _RESULT_CACHE.set(key, df.copy(deep=True))
+            return df
+
+        _RESULT_CACHE.clear()
         proc = self._run_local(sql, timeout_s=timeout_s)
         self._raise_for_proc(proc, context="Statement")
         output = proc.stdout.decode("utf-8", errors="replace").strip()
         return output or None
 
+    def _fetch_df(self, query: str, *, use_arrow: bool, timeout_s: int) -> pd.DataFrame:
+        proc = self._run_local(query, timeout_s=timeout_s)
+        self._raise_for_proc(proc, context="Query")
+
+        if not proc.stdout.strip():
+            return pd.DataFrame()
+        if use_arrow:
+            return _read_arrow_stream(proc.stdout)
+
+        # Parse the whole JSONEachRow payload in one call, without per-line Python loops.
+        return pd.read_json(
+            io.BytesIO(proc.stdout),
+            lines=True,
+            dtype=False,
+            convert_dates=False,
+            precise_float=True,
+        )
+
+    def run_batch(self, statements: Sequence[str], *, timeout_s: int = 300) -> Optional[str]:
+        """
+        Run several statements in a single ``clickhouse local`` boot and return its output.
+
+        Statements run in order and execution stops at the first failure.
+        """
+        if not statements:
+            return None
+        _RESULT_CACHE.clear()
+        proc = self._run_local(_join_statements(statements), timeout_s=timeout_s)
+        self._raise_for_proc(proc, context="Batch")
+        output = proc.stdout.decode("utf-8", errors="replace").strip()
+        return output or None
+
     def create_table_from_df(
         self,
         table: str,
@@ -298,7 +464,8 @@ class LazyCluster:
         timeout_s: int = 300,
     ) -> None:
         """
-        Create a table from a DataFrame and insert rows using CSVWithNames.
+        Create a table from a DataFrame and insert rows using ArrowStream (CSVWithNames
+        when pyarrow is unavailable or cannot encode the frame).
         """
         if df.empty:
             raise ValueError("DataFrame is empty; cannot create table.")
@@ -314,7 +481,8 @@ class LazyCluster:
             column_types=column_types,
             auto_nullable=auto_nullable,
         )
-        cols_sql = ", ".join(f"{_quote_ident(column)} {ch_type}" for column, ch_type in resolved)
+        quoted = {column: _quote_ident(column) for column, _ in resolved}
+        cols_sql = ", ".join(f"{quoted[column]} {ch_type}" for column, ch_type in resolved)
 
         engine_sql = engine
         if engine.lower() == "mergetree":
@@ -323,34 +491,51 @@ class LazyCluster:
             if isinstance(order_by, str):
                 order_expr = order_by
             else:
-                order_expr = ", ".join(_quote_ident(col) for col in order_by)
+                order_expr = ", ".join(quoted.get(col) or _quote_ident(col) for col in order_by)
             engine_sql = f"{engine} ORDER BY {order_expr}"
 
         table_sql = _quote_table(table)
 
         if if_exists == "replace":
-            self.run_sql(f"DROP TABLE IF EXISTS {table_sql}", as_df=False, timeout_s=timeout_s)
-            self.run_sql(
+            ddl = [
+                f"DROP TABLE IF EXISTS {table_sql}",
                 f"CREATE TABLE {table_sql} ({cols_sql}) ENGINE = {engine_sql}",
-                as_df=False,
-                timeout_s=timeout_s,
-            )
+            ]
         elif if_exists == "append":
-            self.run_sql(
-                f"CREATE TABLE IF NOT EXISTS {table_sql} ({cols_sql}) ENGINE = {engine_sql}",
-                as_df=False,
-                timeout_s=timeout_s,
-            )
+            ddl = [f"CREATE TABLE IF NOT EXISTS {table_sql} ({cols_sql}) ENGINE = {engine_sql}"]
         else:
-            self.run_sql(
-                f"CREATE TABLE {table_sql} ({cols_sql}) ENGINE = {engine_sql}",
-                as_df=False,
-                timeout_s=timeout_s,
-            )
+            ddl = [f"CREATE TABLE {table_sql} ({cols_sql}) ENGINE = {engine_sql}"]
+
+        # Typed columnar ArrowStream skips per-value text formatting; CSV is the fallback.
+        # Either way rows are streamed into clickhouse local in chunks, never buffered whole.
+        arrow_table = _df_to_arrow_table(df)
+        if arrow_table is not None:
+            insert_sql = f"INSERT INTO {table_sql} FORMAT ArrowStream"
 
-        df_to_insert = _normalize_df_for_csv(df)
-        csv_bytes = df_to_insert.to_csv(index=False, na_rep="\\N").encode("utf-8")
-        insert_sql = f"INSERT INTO {table_sql} FORMAT CSVWithNames"
+            def write_rows(stream: BinaryIO) -> None:
+                with pa.ipc.new_stream(stream, arrow_table.schema) as writer:
+                    for batch in arrow_table.to_batches(max_chunksize=_INSERT_CHUNK_ROWS):
+                        writer.write_batch(batch)
 
-        proc = self._run_local(insert_sql, stdin_bytes=csv_bytes, timeout_s=timeout_s)
-        self._raise_for_proc(proc, context="Insert")
+        else:
+            # pandas trims all-midnight/whole-second datetimes, so parse them leniently.
+            insert_sql = (
+                f"INSERT INTO {table_sql} SETTINGS date_time_input_format = 'best_effort' "
+                "FORMAT CSVWithNames"
+            )
+            df_to_insert = _normalize_df_for_csv(df)
+
+            def write_rows(stream: BinaryIO) -> None:
+                df_to_insert.to_csv(
+                    stream, index=False, na_rep="\\N", chunksize=_INSERT_CHUNK_ROWS
+                )
+
+        # DDL and the streamed INSERT share one clickhouse local boot.
+        _RESULT_CACHE.clear()
+        proc = self._run_local(
+            _join_statements([*ddl, insert_sql]),
+            stdin_writer=write_rows,
+            timeout_s=timeout_s,
+            capture_stdout=False,
+        )
+        self._raise_for_proc(proc, context="Create and insert")
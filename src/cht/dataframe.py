@@ -18,38 +18,74 @@ if TYPE_CHECKING:
     from .cluster import Cluster
 
 
+# Common dtypes resolved up front; anything else is inferred once and memoized by dtype name.
+_CLICKHOUSE_TYPE_BY_DTYPE: dict[str, str] = {
+    "bool": "UInt8",
+    "boolean": "UInt8",
+    "int8": "Int8",
+    "int16": "Int16",
+    "int32": "Int32",
+    "int64": "Int64",
+    "uint8": "UInt8",
+    "uint16": "UInt16",
+    "uint32": "UInt32",
+    "uint64": "UInt64",
+    "Int8": "Int8",
+    "Int16": "Int16",
+    "Int32": "Int32",
+    "Int64": "Int64",
+    "UInt8": "UInt8",
+    "UInt16": "UInt16",
+    "UInt32": "UInt32",
+    "UInt64": "UInt64",
+    "float16": "Float32",
+    "float32": "Float32",
+    "float64": "Float64",
+    "Float32": "Float32",
+    "Float64": "Float64",
+    "datetime64[ns]": "DateTime64(3)",
+    "datetime64[us]": "DateTime64(3)",
+    "datetime64[ms]": "DateTime64(3)",
+    "datetime64[s]": "DateTime64(3)",
+    "category": "String",
+    "object": "String",
+    "string": "String",
+    "str": "String",
+}
+
+
 def pandas_dtype_to_clickhouse(dtype: Any) -> str:
     """Map a pandas dtype to a reasonable ClickHouse column type."""
+    key = str(dtype)
+    mapped = _CLICKHOUSE_TYPE_BY_DTYPE.get(key)
+    if mapped is None:
+        mapped = _CLICKHOUSE_TYPE_BY_DTYPE[key] = _infer_clickhouse_type(dtype)
+    return mapped
+
+
+_INTEGER_TYPES = {
+    ("u", 1): "UInt8",
+    ("u", 2): "UInt16",
+    ("u", 4): "UInt32",
+    ("u", 8): "UInt64",
+    ("i", 1): "Int8",
+    ("i", 2): "Int16",
+    ("i", 4): "Int32",
+    ("i", 8): "Int64",
+}
+
+
+def _infer_clickhouse_type(dtype: Any) -> str:
+    # Classify by dtype kind and width rather than by substrings of the dtype name.
     if is_bool_dtype(dtype):
         return "UInt8"
     if is_integer_dtype(dtype):
-        name = str(dtype).lower()
-        # Check unsigned types first
-        if "uint8" in name:
-            return "UInt8"
-        if "uint16" in name:
-            return "UInt16"
-        if "uint32" in name:
-            return "UInt32"
-        if "uint64" in name:
-            return "UInt64"
-        # Then check signed types
-        if "int8" in name:
-            return "Int8"
-        if "int16" in name:
-            return "Int16"
-        if "int32" in name:
-            return "Int32"
-        return "Int64"
+        key = (getattr(dtype, "kind", "i"), getattr(dtype, "itemsize", 8))
+        return _INTEGER_TYPES.get(key, "Int64")
     if is_float_dtype(dtype):
-        name = str(dtype).lower()
-        if "float32" in name or "float16" in name:
-            return "Float32"
-        return "Float64"
+        return "Float32" if getattr(dtype, "itemsize", 8) <= 4 else "Float64"
     if is_datetime64_any_dtype(dtype):
         return "DateTime64(3)"
-    if str(dtype) == "category":
-        return "String"
     return "String"
 
 
@@ -75,14 +111,14 @@ def detect_nullable_columns(df: pd.DataFrame) -> dict[str, str]:
         >>> detect_nullable_columns(df)
         {'name': 'Nullable(String)', 'date': 'Nullable(DateTime64(3))'}
     """
-    nullable_overrides = {}
-
-    for column in df.columns:
-        if df[column].isna().any():
-            base_type = pandas_dtype_to_clickhouse(df[column].dtype)
-            nullable_overrides[column] = f"Nullable({base_type})"
-
-    return nullable_overrides
+    # isna() already runs block-by-block inside pandas; walk the result positionally so each
+    # column costs one zip step and a memoized dtype lookup, with no label indexing.
+    has_nulls = df.isna().any(axis=0).to_numpy()
+    return {
+        column: f"Nullable({pandas_dtype_to_clickhouse(dtype)})"
+        for column, dtype, nullable in zip(df.columns, df.dtypes, has_nulls)
+        if nullable
+    }
 
 
 def resolve_column_types(
@@ -112,8 +148,10 @@ def resolve_column_types(
             if col not in overrides:
                 overrides[col] = nullable_type
 
-    for column in df.columns:
-        resolved_type = overrides.get(column, pandas_dtype_to_clickhouse(df[column].dtype))
+    for column, dtype in df.dtypes.items():
+        resolved_type = overrides.get(column)
+        if resolved_type is None:
+            resolved_type = pandas_dtype_to_clickhouse(dtype)
         resolved.append((column, resolved_type))
 
     return resolved
@@ -163,8 +201,10 @@ def build_create_table_sql(
         """Format a single identifier with backticks."""
         return f"`{name}`"
 
+    # Quote each column once; key clauses reuse the same strings.
+    quoted = {column: _format_identifier(column) for column, _ in resolved_types}
     columns_sql = ",\n    ".join(
-        f"{_format_identifier(column)} {column_type}" for column, column_type in resolved_types
+        f"{quoted[column]} {column_type}" for column, column_type in resolved_types
     )
 
     db_prefix = f"{_format_identifier(database)}." if database else ""
@@ -176,7 +216,7 @@ def build_create_table_sql(
         if isinstance(value, str):
             expression = value
         else:
-            expression = ", ".join(_format_identifier(v) for v in value)
+            expression = ", ".join(quoted.get(v) or _format_identifier(v) for v in value)
         return f"\n{keyword} ({expression})"
 
     if "mergetree" in engine.lower() and not order_by:
@@ -274,14 +314,16 @@ def insert_dataframe(
     if df.empty:
         return
 
-    df_to_insert = df.copy()
-    resolved_types = resolve_column_types(df_to_insert, column_types, auto_nullable=auto_nullable)
+    resolved_types = resolve_column_types(df, column_types, auto_nullable=auto_nullable)
 
-    # Handle string columns - fill NaN with empty strings
-    for column, ch_type in resolved_types:
-        lower_type = ch_type.lower()
-        if lower_type.startswith("string") or lower_type.startswith("fixedstring"):
-            df_to_insert[column] = df_to_insert[column].fillna("").astype(str)
+    # Handle string columns - fill NaN with empty strings. Only those columns are rebuilt;
+    # assign() leaves the caller's frame untouched without copying every other column.
+    string_columns = {
+        column: df[column].fillna("").astype(str)
+        for column, ch_type in resolved_types
+        if ch_type == "String" or ch_type.startswith("FixedString")
+    }
+    df_to_insert = df.assign(**string_columns) if string_columns else df
 
     # Use the cluster's client to insert
     client = cluster.client
@@ -11,11 +11,31 @@ The graph can be exported to various formats for visualization and analysis.
 
 from __future__ import annotations
 
+import heapq
 import json
 import logging
 import warnings
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from itertools import groupby
+from operator import itemgetter
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+try:  # optional C-accelerated encoder for large graph exports
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
 from .cluster import Cluster
 from .sql_utils import parse_from_table, parse_to_table
@@ -24,7 +44,89 @@ from .table import Table
 _logger = logging.getLogger("cht.graph")
 
 
+_CATALOG_SQL_TEMPLATE = """
+SELECT
+    t.database,
+    t.name,
+    t.engine,
+    if(t.engine = 'MaterializedView', t.create_table_query, '') AS create_table_query,
+    d.depends_on_database,
+    d.depends_on_table
+FROM system.tables AS t
+LEFT JOIN
+(
+    SELECT database, table, depends_on_database, depends_on_table
+    FROM system.dependencies
+    WHERE depends_on_database != '' AND depends_on_table != ''{dependency_scope}
+) AS d ON t.database = d.database AND t.name = d.table
+WHERE t.database NOT IN ('system', 'information_schema', 'INFORMATION_SCHEMA'){table_scope}
+ORDER BY t.database, t.name
+"""
+_CATALOG_SQL = _CATALOG_SQL_TEMPLATE.replace("{dependency_scope}", "").replace("{table_scope}", "")
+# Same query restricted server-side to the ``databases`` parameter
+_SCOPED_CATALOG_SQL = _CATALOG_SQL_TEMPLATE.replace(
+    "{dependency_scope}", " AND database IN {databases:Array(String)}"
+).replace("{table_scope}", " AND t.database IN {databases:Array(String)}")
+
+
+@dataclass
+class _GraphCatalog:
+    """Tables and MV metadata fetched by :meth:`DependencyGraph._fetch_catalog`."""
+
+    tables: List[Tuple[str, str, str]] = field(default_factory=list)
+    mv_create_queries: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    mv_dependencies: Dict[Tuple[str, str], List[Tuple[str, str]]] = field(default_factory=dict)
+
+
 @dataclass
+class _Reachability:
+    """Transitive closure of the condensed graph, built by :meth:`DependencyGraph._reachability`."""
+
+    component_of: Dict[str, int]
+    components: List[List[str]]
+    # Bit ``j`` of ``reach[i]`` is set when component ``j`` is downstream of component ``i``
+    reach: List[int]
+    targets: Dict[str, GraphNode]
+
+
+# Above this many nodes the closure's quadratic bitsets cost more than a BFS per query
+_REACHABILITY_MAX_NODES = 20_000
+
+_DOT_ID_TABLE = str.maketrans(".-", "__")
+
+
+def _is_current(key: Optional[Tuple[Any, int]], container: Any) -> bool:
+    """Whether an index stamped with ``key`` was built from ``container`` at its current size."""
+    return key is not None and key[0] is container and key[1] == len(container)
+
+
+# XML declaration, root element and attribute keys shared by every GraphML export
+_GRAPHML_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>',
+    '<graphml xmlns="http://graphml.graphdrawing.org/xmlns"',
+    '         xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"',
+    '         xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns',
+    '         http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">',
+    '  <key id="database" for="node" attr.name="database" attr.type="string"/>',
+    '  <key id="table_name" for="node" attr.name="table_name" attr.type="string"/>',
+    '  <key id="node_type" for="node" attr.name="node_type" attr.type="string"/>',
+    '  <key id="edge_type" for="edge" attr.name="edge_type" attr.type="string"/>',
+    '  <key id="materialized_view" for="edge" attr.name="materialized_view" '
+    'attr.type="string"/>',
+    "",
+    '  <graph id="dependency_graph" edgedefault="directed">',
+)
+
+
+class _DotIds(dict):
+    """fqdn -> DOT/GraphML node id, translated once per table and reused for every edge."""
+
+    def __missing__(self, fqdn: str) -> str:
+        node_id = self[fqdn] = fqdn.translate(_DOT_ID_TABLE)
+        return node_id
+
+
+@dataclass(slots=True)
 class GraphNode:
     """
     Represents a table or materialized view as a node in the dependency graph.
@@ -33,6 +135,12 @@ class GraphNode:
     """
 
     table: Table
+    is_mv: bool = False  # Set from the engine reported by system.tables during build()
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Nodes live in dicts/sets keyed by fqdn, which never changes after construction
+        self._hash = hash(self.fqdn)
 
     @property
     def fqdn(self) -> str:
@@ -56,13 +164,13 @@ class GraphNode:
         return f"GraphNode({self.fqdn})"
 
     def __hash__(self) -> int:
-        return hash(self.fqdn)
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
         return isinstance(other, GraphNode) and self.fqdn == other.fqdn
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphEdge:
     """
     Represents a dependency relationship between tables via a materialized view.
@@ -118,11 +226,22 @@ class DependencyGraph:
             cluster: ClickHouse cluster to analyze
         """
         self.cluster = cluster
-        self.nodes: Dict[str, GraphNode] = {}  # fqdn -> GraphNode
-        self.edges: List[GraphEdge] = []
+        self.nodes = {}  # fqdn -> GraphNode
+        self.edges = []
         self._built = False
-
-    def build(self) -> None:
+        # Indexes over ``edges`` and ``nodes``, built by build() or on first use. Each remembers
+        # the container and length it was built from, so reassigning or growing ``edges`` /
+        # ``nodes`` is noticed; any other direct edit needs invalidate_indexes().
+        self._out_edges: Dict[str, List[GraphEdge]] = {}
+        self._in_edges: Dict[str, List[GraphEdge]] = {}
+        self._mv_fqdns: Set[str] = set()
+        self._edges_key: Optional[Tuple[List[GraphEdge], int]] = None
+        self._depths: Optional[Dict[str, int]] = None
+        self._reach: Optional[_Reachability] = None
+        self._by_database: Dict[str, List[GraphNode]] = {}
+        self._nodes_key: Optional[Tuple[Dict[str, GraphNode], int]] = None
+
+    def build(self, databases: Optional[Sequence[str]] = None) -> None:
         """
         Discover all tables and dependencies to build the complete graph.
 
@@ -131,79 +250,160 @@ class DependencyGraph:
         2. Creates nodes for each table
         3. Analyzes MV dependencies to create edges
         4. Handles missing tables gracefully with warnings
+
+        Args:
+            databases: Only discover tables in these databases; the filter is applied by
+                ClickHouse. Dependencies on tables outside them are reported as missing.
         """
         _logger.info("Building dependency graph for cluster %s", self.cluster.name)
 
-        # Step 1: Discover all tables and MVs
-        all_tables = self._get_all_tables()
-        materialized_views = self._get_materialized_views()
+        # Step 1: Discover all tables, MVs and MV dependencies in one round trip
+        catalog = self._fetch_catalog(databases)
 
         _logger.info(
-            "Found %d tables, %d materialized views", len(all_tables), len(materialized_views)
+            "Found %d tables, %d materialized views",
+            len(catalog.tables),
+            len(catalog.mv_create_queries),
         )
 
         # Step 2: Create nodes for all tables (including MVs)
-        for database, table_name, engine in all_tables:
+        for database, table_name, engine in catalog.tables:
             table_obj = Table(database, table_name, cluster=self.cluster)
-            node = GraphNode(table_obj)
+            node = GraphNode(table_obj, is_mv=engine == "MaterializedView")
             self.nodes[node.fqdn] = node
 
         # Step 3: Analyze MV dependencies and create edges
-        for mv_database, mv_name in materialized_views:
-            self._process_materialized_view(mv_database, mv_name)
+        for (mv_database, mv_name), create_query in catalog.mv_create_queries.items():
+            self._process_materialized_view(
+                mv_database,
+                mv_name,
+                catalog.mv_dependencies.get((mv_database, mv_name), []),
+                create_query,
+            )
 
         self._built = True
+        self.invalidate_indexes()
+        self._index_edges()
+        self._index_nodes()
         _logger.info("Graph built: %d nodes, %d edges", len(self.nodes), len(self.edges))
 
-    def _get_all_tables(self) -> List[Tuple[str, str, str]]:
+    def add_edge(self, edge: GraphEdge) -> None:
+        """Append an edge and keep the adjacency indexes in step with it."""
+        current = _is_current(self._edges_key, self.edges)
+        self.edges.append(edge)
+        if current:
+            self._out_edges.setdefault(edge.source.fqdn, []).append(edge)
+            self._in_edges.setdefault(edge.target.fqdn, []).append(edge)
+            self._mv_fqdns.add(edge.materialized_view.fqdn)
+            self._edges_key = (self.edges, len(self.edges))
+            self._depths = None
+            self._reach = None
+
+    def invalidate_indexes(self) -> None:
         """
-        Get all tables and materialized views from the cluster.
+        Drop the cached edge and node indexes.
 
-        Returns:
-            List of (database, table_name, engine) tuples
-        """
-        sql = """
-        SELECT database, name, engine
-        FROM system.tables 
-        WHERE database NOT IN ('system', 'information_schema', 'INFORMATION_SCHEMA')
-        ORDER BY database, name
+        Call this after replacing or removing entries of ``edges`` or ``nodes`` in place once
+        the graph has been queried; the indexes are rebuilt on the next lookup.
         """
+        self._edges_key = None
+        self._nodes_key = None
 
-        results = self.cluster.query(sql)
-        return [(row[0], row[1], row[2]) for row in results] if results else []
+    def _index_edges(self) -> None:
+        """Build the source/target adjacency indexes unless they are already current."""
+        if _is_current(self._edges_key, self.edges):
+            return
+        out_edges: Dict[str, List[GraphEdge]] = defaultdict(list)
+        in_edges: Dict[str, List[GraphEdge]] = defaultdict(list)
+        for edge in self.edges:
+            out_edges[edge.source.fqdn].append(edge)
+            in_edges[edge.target.fqdn].append(edge)
+        self._out_edges = dict(out_edges)
+        self._in_edges = dict(in_edges)
+        self._mv_fqdns = {edge.materialized_view.fqdn for edge in self.edges}
+        self._edges_key = (self.edges, len(self.edges))
+        self._depths = None
+        self._reach = None
+
+    def _index_nodes(self) -> None:
+        """Group nodes by database unless the grouping is already current."""
+        if _is_current(self._nodes_key, self.nodes):
+            return
+        by_database: Dict[str, List[GraphNode]] = defaultdict(list)
+        for node in self.nodes.values():
+            by_database[node.database].append(node)
+        self._by_database = dict(by_database)
+        self._nodes_key = (self.nodes, len(self.nodes))
 
-    def _get_materialized_views(self) -> List[Tuple[str, str]]:
-        """
-        Get only materialized views from the cluster.
+    def _outgoing(self, table_fqdn: str) -> List[GraphEdge]:
+        self._index_edges()
+        return self._out_edges.get(table_fqdn, [])
 
-        Returns:
-            List of (database, view_name) tuples
-        """
-        sql = """
-        SELECT database, name
-        FROM system.tables 
-        WHERE engine = 'MaterializedView'
-          AND database NOT IN ('system', 'information_schema', 'INFORMATION_SCHEMA')
-        ORDER BY database, name
+    def _incoming(self, table_fqdn: str) -> List[GraphEdge]:
+        self._index_edges()
+        return self._in_edges.get(table_fqdn, [])
+
+    def _fetch_catalog(self, databases: Optional[Sequence[str]] = None) -> _GraphCatalog:
         """
+        Fetch tables, materialized views and MV dependencies with a single query.
 
-        results = self.cluster.query(sql)
-        return [(row[0], row[1]) for row in results] if results else []
+        Args:
+            databases: Optional databases to restrict the query to
 
-    def _process_materialized_view(self, mv_database: str, mv_name: str) -> None:
+        Returns:
+            Catalog with (database, table_name, engine) tuples, the CREATE statement of
+            each MV and the (database, table) dependencies of each MV
+        """
+        # Streamed block by block: rows are folded into the catalog as they arrive
+        if databases is None:
+            results = self.cluster.query_stream(_CATALOG_SQL)
+        else:
+            results = self.cluster.query_stream(
+                _SCOPED_CATALOG_SQL, parameters={"databases": list(databases)}
+            )
+        catalog = _GraphCatalog()
+
+        # Rows arrive ordered by table, one per dependency (or one with empty deps)
+        for (database, name, engine), rows in groupby(results, key=itemgetter(0, 1, 2)):
+            catalog.tables.append((database, name, engine))
+            if engine != "MaterializedView":
+                continue
+            rows = list(rows)
+            catalog.mv_create_queries[(database, name)] = rows[0][3] or ""
+            catalog.mv_dependencies[(database, name)] = [
+                (dep_database, dep_table)
+                for *_, dep_database, dep_table in rows
+                if dep_database and dep_table
+            ]
+        return catalog
+
+    def _process_materialized_view(
+        self,
+        mv_database: str,
+        mv_name: str,
+        dependencies: List[Tuple[str, str]],
+        create_query: str,
+    ) -> None:
         """
         Process a single materialized view to extract dependencies.
 
         Args:
             mv_database: Database containing the MV
             mv_name: Name of the materialized view
+            dependencies: (database, table) pairs the MV depends on
+            create_query: The MV's CREATE statement
         """
-        dependencies = self._get_view_dependencies(mv_database, mv_name)
-
         if not dependencies:
             _logger.warning("No dependencies found for MV %s.%s", mv_database, mv_name)
             return
 
+        # Parse the TO clause once per MV, not once per dependency
+        try:
+            to_target = parse_to_table(create_query, default_db=mv_database)
+        except Exception as e:
+            _logger.warning("Error determining MV target for %s.%s: %s", mv_database, mv_name, e)
+            to_target = (None, None)
+
         # Parse dependencies to find source and target tables
         sources = []
         targets = []
@@ -219,12 +419,12 @@ class DependencyGraph:
                     continue
 
                 # Check if this dependency is a target (TO clause) or source (FROM clause)
-                if self._is_mv_target(mv_database, mv_name, dep_database, dep_table):
+                if self._is_mv_target(mv_database, to_target, dep_database, dep_table):
                     targets.append(node)
                 else:
                     sources.append(node)
             else:
-                if self._is_mv_target(mv_database, mv_name, dep_database, dep_table):
+                if self._is_mv_target(mv_database, to_target, dep_database, dep_table):
                     warnings.warn(
                         f"Target table {dep_fqdn} not found for MV {mv_database}.{mv_name}",
                         UserWarning,
@@ -254,81 +454,40 @@ class DependencyGraph:
                 self.edges.append(edge)
                 _logger.debug("Created edge: %s", edge)
 
-    def _get_view_dependencies(self, mv_database: str, mv_name: str) -> List[Tuple[str, str]]:
-        """
-        Get dependencies for a materialized view using system.dependencies.
-
-        Args:
-            mv_database: Database containing the MV
-            mv_name: Name of the materialized view
-
-        Returns:
-            List of (database, table) tuples that the MV depends on
-        """
-        sql = f"""
-        SELECT depends_on_database, depends_on_table
-        FROM system.dependencies  
-        WHERE database = '{mv_database}' 
-          AND table = '{mv_name}'
-          AND depends_on_database != ''
-          AND depends_on_table != ''
-        """
-
-        results = self.cluster.query(sql)
-        return [(row[0], row[1]) for row in results] if results else []
-
+    @staticmethod
     def _is_mv_target(
-        self, mv_database: str, mv_name: str, dep_database: str, dep_table: str
+        mv_database: str,
+        to_target: Tuple[Optional[str], Optional[str]],
+        dep_database: str,
+        dep_table: str,
     ) -> bool:
         """
         Determine if a dependency is a target table (TO clause) or source table.
 
-        This uses heuristics based on the MV's CREATE statement to identify
-        whether a dependent table is the target (populated by the MV) or
-        a source (read by the MV).
+        Compares the dependency with the (database, table) parsed from the MV's TO clause and
+        falls back to name heuristics when they differ.
 
         Args:
             mv_database: MV database
-            mv_name: MV name
+            to_target: (database, table) from the MV's TO clause, or (None, None)
             dep_database: Dependent table database
             dep_table: Dependent table name
 
         Returns:
             True if dependency is a target table, False if source
         """
-        try:
-            # Get the CREATE statement for the MV
-            sql = f"""
-            SELECT create_table_query
-            FROM system.tables
-            WHERE database = '{mv_database}' AND name = '{mv_name}'
-            """
-
-            results = self.cluster.query(sql)
-            if not results:
-                return False
-
-            create_query = results[0][0] if results[0] else ""
-
-            # Parse TO clause to identify target
-            to_database, to_table = parse_to_table(create_query, default_db=mv_database)
-
-            if to_database == dep_database and to_table == dep_table:
+        if to_target == (dep_database, dep_table):
+            return True
+
+        # If no TO clause found, use heuristics:
+        # - Tables in same database as MV are more likely to be targets
+        # - Tables with "agg", "summary", "mart" in name are likely targets
+        if dep_database == mv_database:
+            target_keywords = ["agg", "summary", "mart", "dim", "fact"]
+            if any(keyword in dep_table.lower() for keyword in target_keywords):
                 return True
 
-            # If no TO clause found, use heuristics:
-            # - Tables in same database as MV are more likely to be targets
-            # - Tables with "agg", "summary", "mart" in name are likely targets
-            if dep_database == mv_database:
-                target_keywords = ["agg", "summary", "mart", "dim", "fact"]
-                if any(keyword in dep_table.lower() for keyword in target_keywords):
-                    return True
-
-            return False
-
-        except Exception as e:
-            _logger.warning("Error determining MV target for %s.%s: %s", mv_database, mv_name, e)
-            return False
+        return False
 
     # ======================== Analysis Methods ========================
 
@@ -342,11 +501,7 @@ class DependencyGraph:
         Returns:
             List of source table nodes
         """
-        sources = []
-        for edge in self.edges:
-            if edge.target.fqdn == table_fqdn:
-                sources.append(edge.source)
-        return sources
+        return [edge.source for edge in self._incoming(table_fqdn)]
 
     def get_targets(self, table_fqdn: str) -> List[GraphNode]:
         """
@@ -358,11 +513,7 @@ class DependencyGraph:
         Returns:
             List of target table nodes
         """
-        targets = []
-        for edge in self.edges:
-            if edge.source.fqdn == table_fqdn:
-                targets.append(edge.target)
-        return targets
+        return [edge.target for edge in self._outgoing(table_fqdn)]
 
     def get_materialized_views(self, table_fqdn: str) -> List[GraphNode]:
         """
@@ -374,11 +525,12 @@ class DependencyGraph:
         Returns:
             List of materialized view nodes
         """
-        mvs = []
-        for edge in self.edges:
-            if edge.source.fqdn == table_fqdn or edge.target.fqdn == table_fqdn:
-                mvs.append(edge.materialized_view)
-        return list(set(mvs))  # Remove duplicates
+        # Keyed by fqdn: deduplicates without rehashing nodes and keeps edge order stable
+        mvs: Dict[str, GraphNode] = {}
+        for edges in (self._outgoing(table_fqdn), self._incoming(table_fqdn)):
+            for edge in edges:
+                mvs.setdefault(edge.materialized_view.fqdn, edge.materialized_view)
+        return list(mvs.values())
 
     def get_dependency_chain(self, source_fqdn: str, target_fqdn: str) -> List[GraphNode]:
         """
@@ -392,17 +544,18 @@ class DependencyGraph:
             List of nodes in the dependency chain, or empty if no path exists
         """
         # Simple implementation - could be enhanced with full path finding
-        for edge in self.edges:
-            if edge.source.fqdn == source_fqdn and edge.target.fqdn == target_fqdn:
+        for edge in self._outgoing(source_fqdn):
+            if edge.target.fqdn == target_fqdn:
                 return [edge.source, edge.target]
         return []
 
-    def analyze_impact(self, table_fqdn: str) -> List[GraphNode]:
+    def analyze_impact(self, table_fqdn: str, *, transitive: bool = False) -> List[GraphNode]:
         """
         Analyze impact of changes to a table - what would be affected.
 
         Args:
             table_fqdn: Table to analyze impact for
+            transitive: Follow the whole downstream pipeline instead of a single hop
 
         Returns:
             List of nodes that would be affected by changes to the table
@@ -413,9 +566,13 @@ class DependencyGraph:
         if table_fqdn in self.nodes:
             affected.add(self.nodes[table_fqdn])
 
-        # Add directly dependent MVs and their targets
-        for edge in self.edges:
-            if edge.source.fqdn == table_fqdn:
+        sources = [table_fqdn]
+        if transitive:
+            sources.extend(node.fqdn for node in self._downstream(table_fqdn))
+
+        # Add dependent MVs and their targets
+        for source in sources:
+            for edge in self._outgoing(source):
                 affected.add(edge.materialized_view)
                 affected.add(edge.target)
 
@@ -433,23 +590,86 @@ class DependencyGraph:
         Returns:
             Maximum dependency depth (0 for tables with no dependencies)
         """
+        return self._dependency_depths().get(table_fqdn, 0)
 
-        def calculate_depth(node_fqdn: str, visited: Set[str]) -> int:
-            if node_fqdn in visited:
-                return 0  # Avoid infinite recursion on cycles
-
-            visited.add(node_fqdn)
-            max_depth = 0
-
-            # Find all targets of this node
-            for edge in self.edges:
-                if edge.source.fqdn == node_fqdn:
-                    target_depth = calculate_depth(edge.target.fqdn, visited.copy())
-                    max_depth = max(max_depth, target_depth + 1)
+    def _dependency_depths(self) -> Dict[str, int]:
+        """
+        Longest downstream path length for every node, computed once per edge set.
 
-            return max_depth
+        Cycles are condensed first, so every member of a cycle shares its component's depth.
+        """
+        self._index_edges()
+        if self._depths is not None:
+            return self._depths
+
+        components = self._strongly_connected_components()
+        component_of = {fqdn: i for i, members in enumerate(components) for fqdn in members}
+        component_depth: List[int] = []
+        # Tarjan emits components in reverse topological order, so successors come first
+        for i, members in enumerate(components):
+            depth = 0
+            for fqdn in members:
+                for edge in self._out_edges.get(fqdn, ()):
+                    target = component_of[edge.target.fqdn]
+                    if target != i:
+                        depth = max(depth, component_depth[target] + 1)
+            component_depth.append(depth)
+
+        self._depths = {fqdn: component_depth[i] for fqdn, i in component_of.items()}
+        return self._depths
+
+    def _strongly_connected_components(self) -> List[List[str]]:
+        """
+        Tarjan's strongly connected components over the outgoing-edge index.
 
-        return calculate_depth(table_fqdn, set())
+        Uses an explicit work stack instead of recursion. Components are returned in reverse
+        topological order, each listing its members in discovery order.
+        """
+        self._index_edges()
+        adjacency = self._out_edges
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+
+        for root in dict.fromkeys([*self.nodes, *adjacency, *self._in_edges]):
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(adjacency.get(root, ())))]
+
+            while work:
+                node, edges = work[-1]
+                for edge in edges:
+                    successor = edge.target.fqdn
+                    if successor not in index:
+                        index[successor] = lowlink[successor] = len(index)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append((successor, iter(adjacency.get(successor, ()))))
+                        break
+                    if successor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component: List[str] = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        component.reverse()
+                        components.append(component)
+
+        return components
 
     def get_pipeline_health(self) -> Dict[str, Any]:
         """
@@ -459,35 +679,32 @@ class DependencyGraph:
             Dictionary with health metrics and recommendations
         """
         # Basic metrics
-        total_tables = len(
-            [n for n in self.nodes.values() if not self._is_materialized_view_node(n)]
-        )
-        total_mvs = len([n for n in self.nodes.values() if self._is_materialized_view_node(n)])
+        mv_flags = [self._is_materialized_view_node(n) for n in self.nodes.values()]
+        total_mvs = sum(mv_flags)
+        total_tables = len(mv_flags) - total_mvs
         total_edges = len(self.edges)
 
         # Find problematic patterns
         cycles = self.detect_cycles()
         orphans = self.get_orphaned_tables()
 
-        # Calculate complexity metrics
+        # Calculate complexity metrics from the memoized depths
+        depths = self._dependency_depths()
         max_depth = 0
-        depth_distribution = {}
+        depth_distribution: Dict[int, int] = {}
 
-        for node in self.nodes.values():
-            if not self._is_materialized_view_node(node):
-                depth = self.get_dependency_depth(node.fqdn)
+        for fqdn, is_mv in zip(self.nodes, mv_flags):
+            if not is_mv:
+                depth = depths.get(fqdn, 0)
                 max_depth = max(max_depth, depth)
                 depth_distribution[depth] = depth_distribution.get(depth, 0) + 1
 
-        # Find highly connected nodes (potential bottlenecks)
-        node_connections = {}
-        for node_fqdn in self.nodes:
-            incoming = len(self.get_sources(node_fqdn))
-            outgoing = len(self.get_targets(node_fqdn))
-            node_connections[node_fqdn] = incoming + outgoing
-
-        # Sort to find most connected
-        highly_connected = sorted(node_connections.items(), key=lambda x: x[1], reverse=True)[:5]
+        # Find highly connected nodes (potential bottlenecks) straight from the adjacency indexes
+        node_connections = {
+            fqdn: len(self._in_edges.get(fqdn, ())) + len(self._out_edges.get(fqdn, ()))
+            for fqdn in self.nodes
+        }
+        highly_connected = heapq.nlargest(5, node_connections.items(), key=itemgetter(1))
 
         # Generate recommendations
         recommendations = []
@@ -549,30 +766,31 @@ class DependencyGraph:
         Returns:
             List of nodes in the critical path, empty if no path exists
         """
-        from collections import deque
-
         if source_fqdn not in self.nodes or target_fqdn not in self.nodes:
             return []
 
-        # BFS to find shortest path
-        queue = deque([(source_fqdn, [self.nodes[source_fqdn]])])
-        visited = {source_fqdn}
+        # BFS to find shortest path, remembering each node's predecessor instead of a path copy
+        parent: Dict[str, Optional[str]] = {source_fqdn: None}
+        queue = deque([source_fqdn])
 
         while queue:
-            current_fqdn, path = queue.popleft()
+            current_fqdn = queue.popleft()
 
             if current_fqdn == target_fqdn:
+                path: List[GraphNode] = []
+                step: Optional[str] = current_fqdn
+                while step is not None:
+                    path.append(self.nodes[step])
+                    step = parent[step]
+                path.reverse()
                 return path
 
             # Explore neighbors
-            for edge in self.edges:
-                if edge.source.fqdn == current_fqdn:
-                    neighbor_fqdn = edge.target.fqdn
-
-                    if neighbor_fqdn not in visited:
-                        visited.add(neighbor_fqdn)
-                        new_path = path + [self.nodes[neighbor_fqdn]]
-                        queue.append((neighbor_fqdn, new_path))
+            for edge in self._outgoing(current_fqdn):
+                neighbor_fqdn = edge.target.fqdn
+                if neighbor_fqdn not in parent:
+                    parent[neighbor_fqdn] = current_fqdn
+                    queue.append(neighbor_fqdn)
 
         return []  # No path found
 
@@ -592,38 +810,81 @@ class DependencyGraph:
         result = {}
 
         if direction in ("upstream", "both"):
-            upstream = set()
+            result["upstream"] = self._trace(table_fqdn, upstream=True)
 
-            def trace_upstream(node_fqdn: str, visited: Set[str]) -> None:
-                if node_fqdn in visited:
-                    return
-                visited.add(node_fqdn)
+        if direction in ("downstream", "both"):
+            result["downstream"] = self._downstream(table_fqdn)
 
-                sources = self.get_sources(node_fqdn)
-                for source in sources:
-                    upstream.add(source)
-                    trace_upstream(source.fqdn, visited)
+        return result
 
-            trace_upstream(table_fqdn, set())
-            result["upstream"] = list(upstream)
+    def _downstream(self, table_fqdn: str) -> List[GraphNode]:
+        """Every node downstream of a table, read from the memoized transitive closure."""
+        closure = self._reachability()
+        if closure is None:
+            return self._trace(table_fqdn, upstream=False)
+        component = closure.component_of.get(table_fqdn)
+        if component is None:
+            return []
 
-        if direction in ("downstream", "both"):
-            downstream = set()
+        found: List[GraphNode] = []
+        bits = closure.reach[component]
+        while bits:
+            lowest = bits & -bits
+            for fqdn in closure.components[lowest.bit_length() - 1]:
+                found.append(closure.targets[fqdn])
+            bits ^= lowest
+        return found
 
-            def trace_downstream(node_fqdn: str, visited: Set[str]) -> None:
-                if node_fqdn in visited:
-                    return
-                visited.add(node_fqdn)
+    def _reachability(self) -> Optional[_Reachability]:
+        """
+        Downstream closure of every strongly connected component, computed once per edge set.
 
-                targets = self.get_targets(node_fqdn)
-                for target in targets:
-                    downstream.add(target)
-                    trace_downstream(target.fqdn, visited)
+        Returns None for graphs too large for the closure to pay off.
+        """
+        self._index_edges()
+        if self._reach is not None:
+            return self._reach
+        if len(self.nodes) > _REACHABILITY_MAX_NODES:
+            return None
+
+        components = self._strongly_connected_components()
+        component_of = {fqdn: i for i, members in enumerate(components) for fqdn in members}
+        reach: List[int] = []
+        # Tarjan emits components in reverse topological order, so successors come first
+        for i, members in enumerate(components):
+            bits = 0
+            for fqdn in members:
+                for edge in self._out_edges.get(fqdn, ()):
+                    target = component_of[edge.target.fqdn]
+                    # An edge inside the component means it is a cycle and reaches itself
+                    bits |= 1 << target
+                    if target != i:
+                        bits |= reach[target]
+            reach.append(bits)
+
+        targets = {edge.target.fqdn: edge.target for edge in self.edges}
+        self._reach = _Reachability(component_of, components, reach, targets)
+        return self._reach
+
+    def _trace(self, table_fqdn: str, *, upstream: bool) -> List[GraphNode]:
+        """Breadth-first walk of every node reachable upstream or downstream of a table."""
+        found: Set[GraphNode] = set()
+        visited = {table_fqdn}
+        queue = deque([table_fqdn])
 
-            trace_downstream(table_fqdn, set())
-            result["downstream"] = list(downstream)
+        while queue:
+            current = queue.popleft()
+            if upstream:
+                neighbors = [edge.source for edge in self._incoming(current)]
+            else:
+                neighbors = [edge.target for edge in self._outgoing(current)]
+            for node in neighbors:
+                found.add(node)
+                if node.fqdn not in visited:
+                    visited.add(node.fqdn)
+                    queue.append(node.fqdn)
 
-        return result
+        return list(found)
 
     def detect_cycles(self) -> List[List[GraphNode]]:
         """
@@ -632,42 +893,15 @@ class DependencyGraph:
         Returns:
             List of cycles, where each cycle is a list of nodes
         """
-        # Build adjacency list for cycle detection
-        adj_list: Dict[str, List[str]] = {}
-
-        for edge in self.edges:
-            source_fqdn = edge.source.fqdn
-            target_fqdn = edge.target.fqdn
-
-            if source_fqdn not in adj_list:
-                adj_list[source_fqdn] = []
-            adj_list[source_fqdn].append(target_fqdn)
-
-        # DFS-based cycle detection
-        visited = set()
-        rec_stack = set()
+        # Each strongly connected component with more than one node, or a self-loop, is
+        # reported once as a cycle.
         cycles = []
-
-        def dfs(node: str, path: List[str]) -> None:
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-
-            if node in adj_list:
-                for neighbor in adj_list[node]:
-                    if neighbor in rec_stack:
-                        # Found cycle
-                        cycle_start = path.index(neighbor)
-                        cycle_nodes = [self.nodes[fqdn] for fqdn in path[cycle_start:]]
-                        cycles.append(cycle_nodes)
-                    elif neighbor not in visited:
-                        dfs(neighbor, path.copy())
-
-            rec_stack.remove(node)
-
-        for node_fqdn in self.nodes:
-            if node_fqdn not in visited:
-                dfs(node_fqdn, [])
+        for component in self._strongly_connected_components():
+            if len(component) == 1:
+                fqdn = component[0]
+                if not any(edge.target.fqdn == fqdn for edge in self._outgoing(fqdn)):
+                    continue
+            cycles.append([self.nodes[fqdn] for fqdn in component])
 
         return cycles
 
@@ -702,7 +936,8 @@ class DependencyGraph:
         Returns:
             List of nodes in the specified database
         """
-        return [node for node in self.nodes.values() if node.database == database]
+        self._index_nodes()
+        return list(self._by_database.get(database, ()))
 
     # ======================== Export Methods ========================
 
@@ -713,27 +948,24 @@ class DependencyGraph:
         Returns:
             Dictionary with nodes, edges, and metadata
         """
-        nodes_data = []
-        for node in self.nodes.values():
-            nodes_data.append(
-                {
-                    "fqdn": node.fqdn,
-                    "database": node.database,
-                    "name": node.name,
-                    "type": "table",  # Could be extended to distinguish table types
-                }
-            )
-
-        edges_data = []
-        for edge in self.edges:
-            edges_data.append(
-                {
-                    "source": edge.source.fqdn,
-                    "target": edge.target.fqdn,
-                    "materialized_view": edge.materialized_view.fqdn,
-                    "type": edge.view_type,
-                }
-            )
+        nodes_data = [
+            {
+                "fqdn": node.fqdn,
+                "database": node.database,
+                "name": node.name,
+                "type": "table",  # Could be extended to distinguish table types
+            }
+            for node in self.nodes.values()
+        ]
+        edges_data = [
+            {
+                "source": edge.source.fqdn,
+                "target": edge.target.fqdn,
+                "materialized_view": edge.materialized_view.fqdn,
+                "type": edge.view_type,
+            }
+            for edge in self.edges
+        ]
 
         return {
             "nodes": nodes_data,
@@ -746,16 +978,23 @@ class DependencyGraph:
             },
         }
 
-    def to_json(self, indent: Optional[int] = 2) -> str:
+    def to_json(self, indent: Optional[int] = 2, fast: bool = False) -> str:
         """
         Export graph to JSON format.
 
         Args:
             indent: JSON indentation (None for compact format)
+            fast: Encode with orjson when it is installed (the ``graph`` extra). The data is
+                the same, but the text differs from the default: compact ``,``/``:``
+                separators and raw UTF-8 instead of ``\\uXXXX`` escapes.
 
         Returns:
             JSON string representation
         """
+        # orjson only supports 2-space indentation; other widths keep the stdlib encoder
+        if fast and orjson is not None and indent in (None, 2):
+            option = orjson.OPT_INDENT_2 if indent else 0
+            return orjson.dumps(self.to_dict(), option=option).decode("utf-8")
         return json.dumps(self.to_dict(), indent=indent)
 
     def to_networkx(self, include_mv_nodes: bool = True) -> Dict[str, Any]:
@@ -841,30 +1080,27 @@ class DependencyGraph:
         Returns:
             DOT format string
         """
-        lines = ["digraph dependency_graph {"]
-        lines.append("  rankdir=LR;")
-        lines.append("  node [shape=box, style=filled];")
-        lines.append("")
+        return "".join(self._iter_dot(include_mv_nodes))
+
+    def _iter_dot(self, include_mv_nodes: bool = True) -> Iterator[str]:
+        """Yield the DOT document line by line (see :meth:`to_dot`)."""
+        dot_ids = _DotIds()
+        yield "digraph dependency_graph {\n"
+        yield "  rankdir=LR;\n  node [shape=box, style=filled];\n\n"
 
         if include_mv_nodes:
             # Add all nodes with different styles
             for node in self.nodes.values():
-                node_id = node.fqdn.replace(".", "_").replace("-", "_")
-                if self._is_materialized_view_node(node):
-                    lines.append(f'  {node_id} [label="{node.fqdn}", fillcolor=lightblue];')
-                else:
-                    lines.append(f'  {node_id} [label="{node.fqdn}", fillcolor=lightgreen];')
+                color = "lightblue" if self._is_materialized_view_node(node) else "lightgreen"
+                yield f'  {dot_ids[node.fqdn]} [label="{node.fqdn}", fillcolor={color}];\n'
 
-            lines.append("")
+            yield "\n"
 
             # Add edges
             for edge in self.edges:
-                source_id = edge.source.fqdn.replace(".", "_").replace("-", "_")
-                mv_id = edge.materialized_view.fqdn.replace(".", "_").replace("-", "_")
-                target_id = edge.target.fqdn.replace(".", "_").replace("-", "_")
-
-                lines.append(f'  {source_id} -> {mv_id} [label="feeds"];')
-                lines.append(f'  {mv_id} -> {target_id} [label="populates"];')
+                mv_id = dot_ids[edge.materialized_view.fqdn]
+                yield f'  {dot_ids[edge.source.fqdn]} -> {mv_id} [label="feeds"];\n'
+                yield f'  {mv_id} -> {dot_ids[edge.target.fqdn]} [label="populates"];\n'
         else:
             # Direct table-to-table edges
             table_nodes = {
@@ -873,22 +1109,17 @@ class DependencyGraph:
                 if not self._is_materialized_view_node(node)
             }
 
-            for node in table_nodes.values():
-                node_id = node.fqdn.replace(".", "_").replace("-", "_")
-                lines.append(f'  {node_id} [label="{node.fqdn}", fillcolor=lightgreen];')
-
-            lines.append("")
-
+            for fqdn in table_nodes:
+                yield f'  {dot_ids[fqdn]} [label="{fqdn}", fillcolor=lightgreen];\n'
+            yield "\n"
             for edge in self.edges:
                 if edge.source.fqdn in table_nodes and edge.target.fqdn in table_nodes:
-                    source_id = edge.source.fqdn.replace(".", "_").replace("-", "_")
-                    target_id = edge.target.fqdn.replace(".", "_").replace("-", "_")
-                    mv_label = edge.materialized_view.name
-
-                    lines.append(f'  {source_id} -> {target_id} [label="{mv_label}"];')
+                    yield (
+                        f"  {dot_ids[edge.source.fqdn]} -> {dot_ids[edge.target.fqdn]} "
+                        f'[label="{edge.materialized_view.name}"];\n'
+                    )
 
-        lines.append("}")
-        return "\n".join(lines)
+        yield "}"
 
     def to_graphml(self) -> str:
         """
@@ -899,57 +1130,45 @@ class DependencyGraph:
         Returns:
             GraphML XML string
         """
-        lines = ['<?xml version="1.0" encoding="UTF-8"?>']
-        lines.append('<graphml xmlns="http://graphml.graphdrawing.org/xmlns"')
-        lines.append('         xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"')
-        lines.append('         xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns')
-        lines.append('         http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">')
-
-        # Define attributes
-        lines.append('  <key id="database" for="node" attr.name="database" attr.type="string"/>')
-        lines.append(
-            '  <key id="table_name" for="node" attr.name="table_name" attr.type="string"/>'
-        )
-        lines.append('  <key id="node_type" for="node" attr.name="node_type" attr.type="string"/>')
-        lines.append('  <key id="edge_type" for="edge" attr.name="edge_type" attr.type="string"/>')
-        lines.append(
-            '  <key id="materialized_view" for="edge" attr.name="materialized_view" attr.type="string"/>'
-        )
-        lines.append("")
+        return "".join(self._iter_graphml())
 
-        lines.append('  <graph id="dependency_graph" edgedefault="directed">')
+    def _iter_graphml(self) -> Iterator[str]:
+        """Yield the GraphML document line by line (see :meth:`to_graphml`)."""
+        dot_ids = _DotIds()
+        for line in _GRAPHML_HEADER:
+            yield line + "\n"
 
         # Add nodes
         for node in self.nodes.values():
-            node_id = node.fqdn.replace(".", "_").replace("-", "_")
             node_type = "MaterializedView" if self._is_materialized_view_node(node) else "Table"
-
-            lines.append(f'    <node id="{node_id}">')
-            lines.append(f'      <data key="database">{node.database}</data>')
-            lines.append(f'      <data key="table_name">{node.name}</data>')
-            lines.append(f'      <data key="node_type">{node_type}</data>')
-            lines.append("    </node>")
+            yield (
+                f'    <node id="{dot_ids[node.fqdn]}">\n'
+                f'      <data key="database">{node.database}</data>\n'
+                f'      <data key="table_name">{node.name}</data>\n'
+                f'      <data key="node_type">{node_type}</data>\n'
+                "    </node>\n"
+            )
 
         # Add edges
         for i, edge in enumerate(self.edges):
-            source_id = edge.source.fqdn.replace(".", "_").replace("-", "_")
-            target_id = edge.target.fqdn.replace(".", "_").replace("-", "_")
-            mv_fqdn = edge.materialized_view.fqdn
-
-            lines.append(f'    <edge id="e{i}" source="{source_id}" target="{target_id}">')
-            lines.append(f'      <data key="edge_type">{edge.view_type}</data>')
-            lines.append(f'      <data key="materialized_view">{mv_fqdn}</data>')
-            lines.append("    </edge>")
-
-        lines.append("  </graph>")
-        lines.append("</graphml>")
+            source_id = dot_ids[edge.source.fqdn]
+            target_id = dot_ids[edge.target.fqdn]
+            yield (
+                f'    <edge id="e{i}" source="{source_id}" target="{target_id}">\n'
+                f'      <data key="edge_type">{edge.view_type}</data>\n'
+                f'      <data key="materialized_view">{edge.materialized_view.fqdn}</data>\n'
+                "    </edge>\n"
+            )
 
-        return "\n".join(lines)
+        yield "  </graph>\n"
+        yield "</graphml>"
 
     def save_visualization(self, filepath: str, format_type: str = "json", **kwargs) -> None:
         """
         Save graph to file in specified format.
 
+        DOT and GraphML documents are streamed to the file rather than built in memory first.
+
         Args:
             filepath: Output file path
             format_type: Export format ('json', 'dot', 'graphml')
@@ -958,26 +1177,29 @@ class DependencyGraph:
         format_type = format_type.lower()
 
         if format_type == "json":
-            content = self.to_json(**kwargs)
+            chunks: Iterable[str] = (self.to_json(**kwargs),)
         elif format_type == "dot":
-            content = self.to_dot(**kwargs)
+            chunks = self._iter_dot(**kwargs)
         elif format_type == "graphml":
-            content = self.to_graphml()
+            chunks = self._iter_graphml()
         else:
             raise ValueError(
                 f"Unsupported format: {format_type}. " f"Supported formats: json, dot, graphml"
             )
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+        with open(filepath, "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.writelines(chunks)
 
         _logger.info("Graph saved to %s in %s format", filepath, format_type)
 
     def _is_materialized_view_node(self, node: GraphNode) -> bool:
         """Check if a node represents a materialized view."""
-        # This could be enhanced by checking the engine type from system.tables
-        # For now, we'll use a simple heuristic
-        return any(edge.materialized_view.fqdn == node.fqdn for edge in self.edges)
+        # Nodes from build() know their engine; hand-built nodes fall back to acting as an
+        # edge's MV, looked up in the set maintained alongside the edge indexes.
+        if node.is_mv:
+            return True
+        self._index_edges()
+        return node.fqdn in self._mv_fqdns
 
     # ======================== Statistics Methods ========================
 
@@ -988,53 +1210,28 @@ class DependencyGraph:
         Returns:
             Dictionary with cluster-wide statistics
         """
-        # Get database list
-        db_sql = """
-        SELECT DISTINCT database 
-        FROM system.tables 
-        WHERE database NOT IN ('system', 'information_schema', 'INFORMATION_SCHEMA')
-        ORDER BY database
-        """
-        db_results = self.cluster.query(db_sql)
-        databases = [row[0] for row in db_results] if db_results else []
-
-        # Get table counts by database
-        table_sql = """
-        SELECT database, COUNT(*) as table_count
-        FROM system.tables 
+        # One scan of system.tables, split per database with conditional aggregation
+        sql = """
+        SELECT
+            database,
+            countIf(engine != 'MaterializedView') AS table_count,
+            countIf(engine = 'MaterializedView') AS mv_count
+        FROM system.tables
         WHERE database NOT IN ('system', 'information_schema', 'INFORMATION_SCHEMA')
-          AND engine != 'MaterializedView'
         GROUP BY database
         ORDER BY database
         """
-        table_results = self.cluster.query(table_sql)
-        table_counts = {row[0]: row[1] for row in table_results} if table_results else {}
+        results = self.cluster.query(sql) or []
 
-        # Get MV counts by database
-        mv_sql = """
-        SELECT database, COUNT(*) as mv_count
-        FROM system.tables 
-        WHERE database NOT IN ('system', 'information_schema', 'INFORMATION_SCHEMA')
-          AND engine = 'MaterializedView'
-        GROUP BY database
-        ORDER BY database
-        """
-        mv_results = self.cluster.query(mv_sql)
-        mv_counts = {row[0]: row[1] for row in mv_results} if mv_results else {}
-
-        # Build statistics
-        total_tables = sum(table_counts.values())
-        total_mvs = sum(mv_counts.values())
-
-        db_stats = {}
-        for db in databases:
-            db_stats[db] = {
-                "tables": table_counts.get(db, 0),
-                "materialized_views": mv_counts.get(db, 0),
-            }
+        db_stats = {
+            db: {"tables": table_count, "materialized_views": mv_count}
+            for db, table_count, mv_count in results
+        }
+        total_tables = sum(stats["tables"] for stats in db_stats.values())
+        total_mvs = sum(stats["materialized_views"] for stats in db_stats.values())
 
         return {
-            "total_databases": len(databases),
+            "total_databases": len(db_stats),
             "total_tables": total_tables,
             "total_materialized_views": total_mvs,
             "databases": db_stats,
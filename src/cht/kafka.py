@@ -2,10 +2,14 @@ from __future__ import annotations
 
 import difflib
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Dict, List, Tuple
 
 from .cluster import Cluster
 
+_KAFKA_GROUP_RE = re.compile(r"(kafka_group_name\s*=\s*)'[^']+'")
+
 
 def get_kafka_tables(cluster: Cluster) -> List[Tuple[str, str]]:
     """Return ``(database, table)`` tuples for all Kafka engine tables."""
@@ -18,13 +22,13 @@ def get_kafka_tables(cluster: Cluster) -> List[Tuple[str, str]]:
 
 
 def show_kafka_create_statements(cluster: Cluster) -> Dict[Tuple[str, str], str]:
-    """Fetch ``SHOW CREATE TABLE`` statements for every Kafka table."""
-    statements: Dict[Tuple[str, str], str] = {}
-    for db, table in get_kafka_tables(cluster):
-        fqdn = f"{db}.{table}"
-        result = cluster.query(f"SHOW CREATE TABLE {fqdn}")
-        statements[(db, table)] = result[0][0]
-    return statements
+    """Fetch the CREATE statement of every Kafka table with a single ``system.tables`` query."""
+    sql = """
+    SELECT database, name, create_table_query
+    FROM system.tables
+    WHERE engine = 'Kafka'
+    """
+    return {(db, table): ddl for db, table, ddl in cluster.query(sql)}
 
 
 def generate_kafka_consumer_group_update(
@@ -37,11 +41,7 @@ def generate_kafka_consumer_group_update(
 
     Raises ``ValueError`` if the statement does not contain that setting.
     """
-    updated = re.sub(
-        r"(kafka_group_name\s*=\s*)'[^']+'",
-        rf"\1'{new_group}'",
-        create_statement,
-    )
+    updated = _KAFKA_GROUP_RE.sub(rf"\1'{new_group}'", create_statement)
     if updated == create_statement:
         raise ValueError("Statement does not contain kafka_group_name setting")
     return updated
@@ -74,9 +74,8 @@ def replace_kafka_consumer_groups(
     Returns a log of operations ``(database, table, action)`` performed.
     """
     operations: List[Tuple[str, str, str]] = []
-    for db, table in get_kafka_tables(cluster):
+    for (db, table), create_stmt in show_kafka_create_statements(cluster).items():
         fqdn = f"{db}.{table}"
-        create_stmt = cluster.query(f"SHOW CREATE TABLE {fqdn}")[0][0]
         try:
             new_stmt = generate_kafka_consumer_group_update(create_stmt, new_group=new_group_name)
         except ValueError:
@@ -96,22 +95,31 @@ def replace_kafka_consumer_groups(
 def diff_line_chars(line1: str, line2: str) -> List[str]:
     """
     Highlight character-level differences between two lines.
+
+    Returns one ``~ <tag>: a[i:j]=... -> b[k:l]=...`` hint per changed span.
     """
-    diff = difflib.ndiff([line1], [line2])
-    highlights: List[str] = []
-    for entry in diff:
-        if entry.startswith(("- ", "+ ", "? ")):
-            highlights.append(entry)
-    return highlights
+    matcher = difflib.SequenceMatcher(None, line1, line2, autojunk=False)
+    return [
+        f"~ {tag}: a[{i1}:{i2}]={line1[i1:i2]!r} -> b[{j1}:{j2}]={line2[j1:j2]!r}"
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def _show_create(cluster: Cluster, fqdn: str) -> str:
+    # Pooled clients: the shared session client rejects concurrent queries
+    return cluster.query_pooled(f"SHOW CREATE TABLE {fqdn}")[0][0]
 
 
 def compare_kafka_tables_inline(
-    cluster_a: Cluster, cluster_b: Cluster
+    cluster_a: Cluster, cluster_b: Cluster, *, max_workers: int = 8
 ) -> Dict[str, Dict[str, List[str]]]:
     """
     Compare Kafka tables between two clusters and return character-level diffs.
 
-    The result dictionary contains keys ``only_in_a``, ``only_in_b`` and ``diffs``.
+    ``SHOW CREATE TABLE`` for the tables present on both sides runs on up to
+    ``max_workers`` threads. The result dictionary contains keys ``only_in_a``,
+    ``only_in_b`` and ``diffs``.
     """
     result: Dict[str, Dict[str, List[str]]] = {
         "only_in_a": {},
@@ -128,11 +136,13 @@ def compare_kafka_tables_inline(
     for db, table in sorted(tables_b - tables_a):
         result["only_in_b"][f"{db}.{table}"] = []
 
-    for db, table in sorted(tables_a & tables_b):
-        fqdn = f"{db}.{table}"
-        stmt_a = cluster_a.query(f"SHOW CREATE TABLE {fqdn}")[0][0]
-        stmt_b = cluster_b.query(f"SHOW CREATE TABLE {fqdn}")[0][0]
+    fqdns = [f"{db}.{table}" for db, table in sorted(tables_a & tables_b)]
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cht-kafka") as pool:
+        statements_a = pool.map(partial(_show_create, cluster_a), fqdns)
+        statements_b = pool.map(partial(_show_create, cluster_b), fqdns)
+        fetched = list(zip(fqdns, statements_a, statements_b))
 
+    for fqdn, stmt_a, stmt_b in fetched:
         if stmt_a == stmt_b:
             continue
 
@@ -14,6 +14,16 @@ if True:  # pragma: no cover - typing imports
     if TYPE_CHECKING:  # pragma: no cover
         from .cluster import Cluster
 
+# Each name part is either `quoted` (any characters but a backtick) or a bare word.
+_FROM_JOIN_RE = re.compile(
+    r"(?:FROM|JOIN)\s+(?:`([^`]+)`|(\w+))(?:\.(?:`([^`]+)`|(\w+)))?",
+    re.IGNORECASE,
+)
+_TO_QUALIFIED_RE = re.compile(r"\bTO\s+`?([\w\d_]+)`?\.`?([\w\d_]+)`?", re.IGNORECASE)
+_TO_RE = re.compile(r"\bTO\s+`?([\w\d_]+)`?", re.IGNORECASE)
+_FROM_QUALIFIED_RE = re.compile(r"\bFROM\s+`?([\w\d_]+)`?\.`?([\w\d_]+)`?", re.IGNORECASE)
+_FROM_RE = re.compile(r"\bFROM\s+`?([\w\d_]+)`?", re.IGNORECASE)
+
 
 def format_identifier(database: str, table: str) -> str:
     """Return a quoted identifier `` `db`.`table` `` suitable for SQL strings."""
@@ -34,14 +44,10 @@ def extract_from_tables(sql_query: str) -> list[str]:
     The parser is intentionally regex-based to remain dependency-free and handle
     the common cases encountered when auditing ClickHouse pipelines.
     """
-    pattern = re.compile(
-        r"(?:FROM|JOIN)\s+`?([\w\d_]+)`?(?:\.`?([\w\d_]+)`?)?",
-        re.IGNORECASE,
-    )
-
     tables: set[str] = set()
-    for match in pattern.finditer(sql_query or ""):
-        first, second = match.group(1), match.group(2)
+    for quoted_first, first, quoted_second, second in _FROM_JOIN_RE.findall(sql_query or ""):
+        first = quoted_first or first
+        second = quoted_second or second
         tables.add(f"{first}.{second}" if second else first)
     return sorted(tables)
 
@@ -52,11 +58,11 @@ def parse_to_table(
     """
     Extract the ``TO`` table (database, table) tuple from a ``CREATE MATERIALIZED VIEW`` statement.
     """
-    match = re.search(r"\bTO\s+`?([\w\d_]+)`?\.`?([\w\d_]+)`?", create_query, re.IGNORECASE)
+    match = _TO_QUALIFIED_RE.search(create_query)
     if match:
         return match.group(1), match.group(2)
 
-    match = re.search(r"\bTO\s+`?([\w\d_]+)`?", create_query, re.IGNORECASE)
+    match = _TO_RE.search(create_query)
     if match:
         return default_db, match.group(1)
 
@@ -67,11 +73,11 @@ def parse_from_table(create_query: str) -> Optional[str]:
     """
     Extract the ``FROM`` table (possibly qualified) from a CREATE statement.
     """
-    match = re.search(r"\bFROM\s+`?([\w\d_]+)`?\.`?([\w\d_]+)`?", create_query, re.IGNORECASE)
+    match = _FROM_QUALIFIED_RE.search(create_query)
     if match:
         return f"{match.group(1)}.{match.group(2)}"
 
-    match = re.search(r"\bFROM\s+`?([\w\d_]+)`?", create_query, re.IGNORECASE)
+    match = _FROM_RE.search(create_query)
     if match:
         return match.group(1)
 
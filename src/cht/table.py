@@ -95,13 +95,6 @@ class Table:
 
         self.cluster = cluster
 
-        # Initialize logging if needed
-        if not _logger.handlers:
-            logging.basicConfig(
-                level=logging.INFO,
-                format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-            )
-
     def __str__(self) -> str:
         """Return the fully qualified table name (database.table)."""
         return self.fqdn
@@ -177,7 +170,7 @@ class Table:
         cluster = self._require_cluster()
         escaped = comment.replace("'", "''")
         table_ident = format_identifier(self.database, self.name)
-        cluster.query_with_fresh_client(f"ALTER TABLE {table_ident} MODIFY COMMENT '{escaped}'")
+        cluster.query_pooled(f"ALTER TABLE {table_ident} MODIFY COMMENT '{escaped}'")
 
     def set_column_comment(self, column: str, comment: str) -> None:
         """Set or update a column comment."""
@@ -185,7 +178,7 @@ class Table:
         escaped_comment = comment.replace("'", "''")
         table_ident = format_identifier(self.database, self.name)
         escaped_column = f"`{column.replace('`', '``')}`"
-        cluster.query_with_fresh_client(
+        cluster.query_pooled(
             f"ALTER TABLE {table_ident} COMMENT COLUMN {escaped_column} '{escaped_comment}'"
         )
 
@@ -68,6 +68,10 @@ class MockCluster:
         """Mock fresh client query."""
         return self.query(sql)
 
+    def query_pooled(self, sql: str, parameters=None):
+        """Mock pooled client query."""
+        return self.client.query(sql, parameters=parameters)
+
     def create_fresh_client(self):
         """Mock fresh client creation."""
         return self.client
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import copy
+import pickle
+import threading
+import time
 from unittest.mock import MagicMock
 
+import pandas as pd
 import pytest
+from clickhouse_connect.driver.exceptions import DatabaseError, OperationalError
 
 from cht.cluster import Cluster, is_mutating
 
@@ -14,6 +20,14 @@ def test_is_mutating_detects_writes():
     assert not is_mutating("   -- comment\nSELECT 1")
 
 
+def test_is_mutating_matches_whole_first_keyword():
+    assert is_mutating("drop(table)")
+    assert is_mutating("\n\tSYSTEM FLUSH LOGS")
+    assert not is_mutating("DROPPED_ROWS")
+    assert not is_mutating("ALTER_X")
+    assert not is_mutating("")
+
+
 def test_cluster_query_select_uses_client_query():
     fake_result = MagicMock(result_rows=[("value",)], column_names=["col"])
     client = MagicMock()
@@ -31,6 +45,29 @@ def test_cluster_query_select_uses_client_query():
     client.command.assert_not_called()
 
 
+def test_cluster_query_forwards_parameters():
+    client = MagicMock()
+    client.query.return_value = MagicMock(result_rows=[])
+    cluster = Cluster(name="test", host="localhost", client_factory=lambda **_: client)
+
+    cluster.query("SELECT {db:String}", parameters={"db": "raw"})
+    client.query.assert_called_once_with("SELECT {db:String}", parameters={"db": "raw"})
+
+
+def test_query_stream_yields_rows_from_blocks():
+    client = MagicMock()
+    stream = client.query_row_block_stream.return_value.__enter__.return_value
+    stream.__iter__.return_value = iter([[(1,), (2,)], [(3,)]])
+    cluster = Cluster(name="stream", host="localhost", client_factory=lambda **_: client)
+
+    assert list(cluster.query_stream("SELECT n", parameters={"x": 1})) == [(1,), (2,), (3,)]
+    client.query_row_block_stream.assert_called_once_with("SELECT n", parameters={"x": 1})
+    client.query.assert_not_called()
+
+    with pytest.raises(ValueError):
+        cluster.query_stream("DROP TABLE t")
+
+
 def test_cluster_query_mutation_honours_read_only():
     cluster = Cluster(
         name="ro",
@@ -54,3 +91,129 @@ def test_cluster_query_mutation_executes():
 
     cluster.query("INSERT INTO foo VALUES (1)")
     client.command.assert_called_once_with("INSERT INTO foo VALUES (1)")
+
+
+def test_query_pooled_reuses_client_between_calls():
+    created = []
+
+    def factory(**_):
+        client = MagicMock()
+        client.query.return_value = MagicMock(result_rows=[(1,)])
+        created.append(client)
+        return client
+
+    cluster = Cluster(name="pool", host="localhost", client_factory=factory)
+
+    assert cluster.query_pooled("SELECT 1") == [(1,)]
+    assert cluster.query_pooled("SELECT 1") == [(1,)]
+    assert len(created) == 1
+    assert created[0].query.call_count == 2
+    created[0].close.assert_not_called()
+
+
+def test_borrow_client_discards_client_after_error():
+    created = []
+
+    def factory(**_):
+        client = MagicMock()
+        created.append(client)
+        return client
+
+    cluster = Cluster(name="pool", host="localhost", pool_size=1, client_factory=factory)
+
+    with pytest.raises(RuntimeError):
+        with cluster.borrow_client():
+            raise RuntimeError("boom")
+    created[0].close.assert_called_once()
+
+    with cluster.borrow_client() as client:
+        assert client is created[1]
+
+    cluster.close_pool()
+    created[1].close.assert_called_once()
+
+
+def test_borrow_client_keeps_client_after_server_error():
+    created = []
+
+    def factory(**_):
+        client = MagicMock()
+        created.append(client)
+        return client
+
+    cluster = Cluster(name="pool", host="localhost", pool_size=1, client_factory=factory)
+
+    with pytest.raises(DatabaseError):
+        with cluster.borrow_client():
+            raise DatabaseError("Table default.missing does not exist")
+    created[0].close.assert_not_called()
+
+    with pytest.raises(OperationalError):
+        with cluster.borrow_client() as client:
+            assert client is created[0]
+            raise OperationalError("connection reset")
+    created[0].close.assert_called_once()
+
+    with cluster.borrow_client() as client:
+        assert client is created[1]
+
+
+def test_cluster_can_be_pickled_and_copied():
+    cluster = Cluster(name="x", host="h", pool_size=2)
+    # Live connections hold sockets and locks; stand in with something equally unpicklable.
+    cluster._client = threading.Lock()
+    cluster._pool.put(threading.Lock())
+
+    for clone in (pickle.loads(pickle.dumps(cluster)), copy.deepcopy(cluster)):
+        assert (clone.name, clone.host, clone.pool_size) == ("x", "h", 2)
+        assert clone._client is None
+        assert clone._pool.empty()
+        assert clone._client_lock is not cluster._client_lock
+
+
+def test_client_is_created_once_under_concurrent_access():
+    created = []
+
+    def factory(**_):
+        time.sleep(0.01)  # widen the race window
+        client = MagicMock()
+        created.append(client)
+        return client
+
+    cluster = Cluster(name="shared", host="localhost", client_factory=factory)
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(cluster.client)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(client is created[0] for client in seen)
+
+
+def test_logged_sql_is_truncated_lazily(caplog):
+    client = MagicMock()
+    client.query.return_value = MagicMock(result_rows=[])
+    cluster = Cluster(
+        name="log", host="localhost", log_sql_truncate=10, client_factory=lambda **_: client
+    )
+    sql = "SELECT " + "x" * 50
+
+    with caplog.at_level("INFO", logger="cht.cluster"):
+        cluster.query(sql)
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("sql=SELECT xxx … [truncated]" in message for message in messages)
+    assert not any(sql in message for message in messages)
+
+
+def test_disk_usage_uses_columnar_dataframe_fetch():
+    client = MagicMock()
+    frame = pd.DataFrame({"disk_name": ["default"], "used_percentage": [42.0]})
+    client.query_df.return_value = frame
+    cluster = Cluster(name="df", host="localhost", client_factory=lambda **_: client)
+
+    assert cluster.get_disk_usage() is frame
+    client.query.assert_not_called()
+    assert cluster.query_df("SELECT 1", test_run=True).empty
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import pytest
 from fastapi.testclient import TestClient
 
 from cht.api.app import create_app
@@ -111,3 +112,57 @@ def test_select_cluster_marks_active():
     clusters = client.get("/clusters").json()
     active_names = [c["name"] for c in clusters if c["active"]]
     assert "secondary" in active_names
+
+
+def test_get_cluster_info_returns_single_cluster():
+    store = ClusterStore()
+    settings = ClusterSettings(host="h", port=1, user="u", password="p")
+    store.add_cluster_instance("one", settings, cluster=object(), make_active=True)
+    store.add_cluster_instance("two", settings, cluster=object())
+
+    info = store.get_cluster_info("two")
+    assert info["name"] == "two"
+    assert info["active"] is False
+    assert "password" not in info
+
+    with pytest.raises(KeyError):
+        store.get_cluster_info("missing")
+
+
+def test_update_cluster_returns_updated_info():
+    client = _build_app()
+    resp = client.put(
+        "/clusters/primary",
+        json={"name": "primary", "host": "new-host", "port": 8124, "make_active": True},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["host"] == "new-host"
+    assert data["port"] == 8124
+    assert data["active"] is True
+
+
+def test_update_cluster_with_identical_settings_keeps_instance():
+    store = ClusterStore()
+    settings = ClusterSettings(host="h", port=1, user="u", password="p")
+    existing = object()
+    store.add_cluster_instance("one", settings, cluster=existing, make_active=True)
+    store.add_cluster_instance("two", settings, cluster=object())
+
+    same = ClusterSettings(host="h", port=1, user="u", password="p")
+    assert store.update_cluster("one", same) is False
+    assert store.get_cluster("one") is existing
+
+    assert store.update_cluster("two", same, make_active=True) is False
+    assert store.get_cluster_info("two")["active"] is True
+
+    changed = ClusterSettings(host="other", port=1, user="u", password="p")
+    assert store.update_cluster("one", changed) is True
+    assert store.get_cluster("one") is not existing
+
+
+def test_cluster_settings_are_immutable():
+    settings = ClusterSettings(host="h", port=1, user="u", password="p")
+    assert not hasattr(settings, "__dict__")
+    with pytest.raises(AttributeError):
+        settings.host = "other"  # type: ignore[misc]
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from cht import colab
+from cht.colab import LazyCluster
+
+requires_pyarrow = pytest.mark.skipif(colab.pa is None, reason="pyarrow not installed")
+
+# Stand-in for ``clickhouse local``: logs each call, echoes INSERT input back on stdout.
+FAKE_CLICKHOUSE = """#!{python}
+import json, os, shutil, sys
+
+args = sys.argv[1:]
+if "--query" in args:
+    query = args[args.index("--query") + 1]
+else:
+    with open(args[args.index("--queries-file") + 1]) as handle:
+        query = handle.read()
+with open(os.environ["FAKE_CH_LOG"], "a") as log:
+    log.write(json.dumps({{"args": args, "query": query}}) + "\\n")
+
+if "EXIT_EARLY" in query:
+    sys.stderr.write("boom")
+    sys.exit(1)
+if "INSERT" in query:
+    shutil.copyfileobj(sys.stdin.buffer, sys.stdout.buffer)
+elif os.environ.get("FAKE_CH_STDOUT"):
+    with open(os.environ["FAKE_CH_STDOUT"], "rb") as handle:
+        sys.stdout.buffer.write(handle.read())
+else:
+    sys.stdout.write("ok\\n")
+"""
+
+
+@pytest.fixture
+def fake_cluster(tmp_path, monkeypatch):
+    binary = tmp_path / "clickhouse"
+    binary.write_text(FAKE_CLICKHOUSE.format(python=sys.executable))
+    binary.chmod(0o755)
+    monkeypatch.setenv("FAKE_CH_LOG", str(tmp_path / "calls.jsonl"))
+    colab._RESULT_CACHE.clear()
+    yield LazyCluster(clickhouse_bin=str(binary), data_path=str(tmp_path / "data"))
+    colab._RESULT_CACHE.clear()
+
+
+def fake_stdout(tmp_path: Path, monkeypatch, payload: bytes) -> None:
+    path = tmp_path / "stdout.bin"
+    path.write_bytes(payload)
+    monkeypatch.setenv("FAKE_CH_STDOUT", str(path))
+
+
+def calls(tmp_path: Path) -> list[dict]:
+    log = tmp_path / "calls.jsonl"
+    if not log.exists():
+        return []
+    return [json.loads(line) for line in log.read_text().splitlines()]
+
+
+def arrow_payload(df: pd.DataFrame) -> bytes:
+    table = colab.pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    with colab.pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+@requires_pyarrow
+def test_arrow_results_are_writable():
+    payload = arrow_payload(pd.DataFrame({"n": [1, 2, 3], "x": [1.0, 2.0, 3.0]}))
+
+    df = colab._read_arrow_stream(payload)
+    df.loc[df["n"] > 1, "x"] = 0.0
+    df.loc[0, "n"] = 10
+
+    assert df["x"].tolist() == [1.0, 0.0, 0.0]
+    assert df["n"].tolist() == [10, 2, 3]
+
+
+@requires_pyarrow
+def test_arrow_results_keep_each_column_contiguous():
+    payload = arrow_payload(pd.DataFrame({"a": [1, 2, 3], "b": [4, 5, 6], "x": [1.0, 2.0, 3.0]}))
+
+    df = colab._read_arrow_stream(payload)
+
+    # Consolidated blocks are (ncols, nrows) C-order, so every column is one contiguous run.
+    for column in df:
+        values = df[column].to_numpy()
+        assert values.flags["C_CONTIGUOUS"] and values.strides == (values.itemsize,)
+
+
+def test_run_sql_caches_only_when_asked(fake_cluster, tmp_path, monkeypatch):
+    fake_stdout(tmp_path, monkeypatch, b'{"n": 1}\n{"n": 2}\n')
+    sql = "SELECT n FROM t FORMAT JSONEachRow"
+
+    fake_cluster.run_sql(sql)
+    fake_cluster.run_sql(sql)
+    assert len(calls(tmp_path)) == 2
+
+    first = fake_cluster.run_sql(sql, use_cache=True)
+    second = fake_cluster.run_sql(sql, use_cache=True)
+    assert len(calls(tmp_path)) == 3
+    assert first["n"].tolist() == second["n"].tolist() == [1, 2]
+
+
+def test_cached_results_are_isolated_from_callers(fake_cluster, tmp_path, monkeypatch):
+    fake_stdout(tmp_path, monkeypatch, b'{"n": 1}\n{"n": 2}\n')
+    sql = "SELECT n FROM t FORMAT JSONEachRow"
+
+    first = fake_cluster.run_sql(sql, use_cache=True)
+    first.loc[0, "n"] = 100
+    second = fake_cluster.run_sql(sql, use_cache=True)
+    second.loc[1, "n"] = 200
+
+    assert fake_cluster.run_sql(sql, use_cache=True)["n"].tolist() == [1, 2]
+    assert len(calls(tmp_path)) == 1
+
+
+def test_statements_invalidate_cached_results(fake_cluster, tmp_path, monkeypatch):
+    fake_stdout(tmp_path, monkeypatch, b'{"n": 1}\n')
+    sql = "SELECT n FROM t FORMAT JSONEachRow"
+
+    fake_cluster.run_sql(sql, use_cache=True)
+    fake_cluster.run_sql("TRUNCATE TABLE t")
+    fake_cluster.run_sql(sql, use_cache=True)
+    fake_cluster.run_batch(["TRUNCATE TABLE t"])
+    fake_cluster.run_sql(sql, use_cache=True)
+
+    assert [call["query"].count("SELECT n") for call in calls(tmp_path)] == [1, 0, 1, 0, 1]
+
+
+def test_stdin_writer_streams_into_clickhouse(fake_cluster):
+    chunk = b"0123456789abcdef" * 4096
+
+    def write_rows(stream):
+        for _ in range(64):
+            stream.write(chunk)
+
+    proc = fake_cluster._run_local("INSERT INTO t FORMAT CSV", stdin_writer=write_rows)
+
+    assert proc.returncode == 0
+    assert proc.stdout == chunk * 64
+
+
+def test_stdin_writer_tolerates_early_clickhouse_exit(fake_cluster):
+    def write_rows(stream):
+        for _ in range(256):
+            stream.write(b"x" * 65536)
+
+    proc = fake_cluster._run_local("INSERT INTO EXIT_EARLY FORMAT CSV", stdin_writer=write_rows)
+
+    assert proc.returncode == 1
+    with pytest.raises(RuntimeError, match="Insert failed: boom"):
+        fake_cluster._raise_for_proc(proc, context="Insert")
+
+
+def test_stdin_writer_errors_propagate(fake_cluster):
+    def write_rows(stream):
+        stream.write(b"1\n")
+        raise ValueError("bad row")
+
+    with pytest.raises(ValueError, match="bad row"):
+        fake_cluster._run_local("INSERT INTO t FORMAT CSV", stdin_writer=write_rows)
+
+
+def test_run_batch_runs_all_statements_in_one_boot(fake_cluster, tmp_path):
+    assert fake_cluster.run_batch([]) is None
+    assert calls(tmp_path) == []
+
+    output = fake_cluster.run_batch(["CREATE TABLE a (x UInt8) ENGINE = Memory;", "SELECT 1"])
+
+    assert output == "ok"
+    [call] = calls(tmp_path)
+    assert call["query"].endswith("CREATE TABLE a (x UInt8) ENGINE = Memory;\nSELECT 1;\n")
+
+    with pytest.raises(RuntimeError, match="Batch failed: boom"):
+        fake_cluster.run_batch(["SELECT 1", "SELECT EXIT_EARLY"])
+
+
+def test_short_queries_go_inline_and_long_ones_through_a_file(fake_cluster, tmp_path):
+    fake_cluster.run_sql("SELECT 1", as_df=False)
+    long_sql = "SELECT '" + "x" * colab._INLINE_QUERY_MAX_CHARS + "'"
+    fake_cluster.run_sql(long_sql, as_df=False)
+
+    inline, from_file = calls(tmp_path)
+    assert inline["args"][inline["args"].index("--query") - 1] == "--multiquery"
+    assert "--queries-file" not in inline["args"]
+    assert "--query" not in from_file["args"]
+    assert long_sql in from_file["query"]
+    assert not Path(from_file["args"][from_file["args"].index("--queries-file") + 1]).exists()
+
+
+def test_statements_without_output_discard_stdout(fake_cluster, tmp_path):
+    proc = fake_cluster._run_local(
+        "INSERT INTO t FORMAT CSV", stdin_bytes=b"1\n2\n", capture_stdout=False
+    )
+    assert proc.returncode == 0
+    assert proc.stdout is None
+
+    fake_cluster.create_table_from_df("t", pd.DataFrame({"n": [1, 2]}))
+
+    [_, create_and_insert] = calls(tmp_path)
+    assert "CREATE TABLE `t`" in create_and_insert["query"]
+    assert "INSERT INTO `t`" in create_and_insert["query"]
+
+    with pytest.raises(RuntimeError, match="Create and insert failed: boom"):
+        fake_cluster.create_table_from_df("EXIT_EARLY", pd.DataFrame({"n": [1]}))
@@ -8,6 +8,7 @@ import pytest
 from cht.dataframe import (
     build_create_table_sql,
     create_table_from_dataframe,
+    detect_nullable_columns,
     generate_temp_table_name,
     insert_dataframe,
     pandas_dtype_to_clickhouse,
@@ -46,6 +47,14 @@ def test_pandas_dtype_to_clickhouse_integers():
     assert pandas_dtype_to_clickhouse(df["uint64_col"].dtype) == "UInt64"
 
 
+def test_pandas_dtype_to_clickhouse_nullable_extension_integers():
+    """Test that extension integer dtypes map by width and signedness."""
+    assert pandas_dtype_to_clickhouse(pd.UInt8Dtype()) == "UInt8"
+    assert pandas_dtype_to_clickhouse(pd.UInt16Dtype()) == "UInt16"
+    assert pandas_dtype_to_clickhouse(pd.Int8Dtype()) == "Int8"
+    assert pandas_dtype_to_clickhouse(pd.Float32Dtype()) == "Float32"
+
+
 def test_pandas_dtype_to_clickhouse_floats():
     """Test float dtype mappings."""
     df = pd.DataFrame(
@@ -77,6 +86,23 @@ def test_pandas_dtype_to_clickhouse_object():
     assert pandas_dtype_to_clickhouse(df["text"].dtype) == "String"
 
 
+def test_detect_nullable_columns_only_flags_columns_with_nulls():
+    """Test that only columns containing missing values become Nullable."""
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "name": ["A", None, "C"],
+            "score": [1.5, float("nan"), 2.0],
+            "date": pd.to_datetime(["2023-01-01", None, "2023-01-03"]),
+        }
+    )
+    assert detect_nullable_columns(df) == {
+        "name": "Nullable(String)",
+        "score": "Nullable(Float64)",
+        "date": "Nullable(DateTime64(3))",
+    }
+
+
 def test_resolve_column_types_default():
     """Test column type resolution without overrides."""
     df = pd.DataFrame(
@@ -236,6 +262,25 @@ def test_insert_dataframe():
 
     # Verify NaN values in string columns were replaced with empty strings
     assert inserted_df["description"].iloc[1] == ""
+    # The caller's frame is left as it was
+    assert pd.isna(df["description"].iloc[1])
+
+
+def test_insert_dataframe_fills_fixed_string_overrides():
+    """Test that FixedString overrides get the same NaN handling as String columns."""
+    df = pd.DataFrame({"code": ["ab", None], "note": [None, "x"]})
+    mock_cluster = MagicMock()
+
+    insert_dataframe(
+        cluster=mock_cluster,
+        df=df,
+        table_name="codes",
+        column_types={"code": "FixedString(2)", "note": "Nullable(String)"},
+    )
+
+    inserted_df = mock_cluster.client.insert_df.call_args[1]["df"]
+    assert inserted_df["code"].tolist() == ["ab", ""]
+    assert pd.isna(inserted_df["note"].iloc[0])
 
 
 def test_insert_dataframe_empty():
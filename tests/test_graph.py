@@ -15,8 +15,46 @@ import pytest
 
 from cht.cluster import Cluster
 from cht.graph import DependencyGraph, GraphEdge, GraphNode
+from cht.sql_utils import parse_to_table
 from cht.table import Table
 
+EVENTS_AGG_MV = (
+    "CREATE MATERIALIZED VIEW analytics.mv_events_agg TO analytics.events_agg "
+    "AS SELECT * FROM raw.events"
+)
+USER_STATS_MV = (
+    "CREATE MATERIALIZED VIEW analytics.mv_user_stats TO analytics.user_stats "
+    "AS SELECT * FROM raw.users"
+)
+# Rows of the catalog query for two MVs, each reading raw.* and writing into analytics.*
+DISCOVERY_ROWS = [
+    ("analytics", "events_agg", "MergeTree", "", "", ""),
+    ("analytics", "mv_events_agg", "MaterializedView", EVENTS_AGG_MV, "raw", "events"),
+    ("analytics", "mv_events_agg", "MaterializedView", EVENTS_AGG_MV, "analytics", "events_agg"),
+    ("analytics", "mv_user_stats", "MaterializedView", USER_STATS_MV, "raw", "users"),
+    ("analytics", "mv_user_stats", "MaterializedView", USER_STATS_MV, "analytics", "user_stats"),
+    ("analytics", "user_stats", "MergeTree", "", "", ""),
+    ("raw", "events", "MergeTree", "", "", ""),
+    ("raw", "users", "MergeTree", "", "", ""),
+]
+
+
+def make_graph(edges: str, *, mv: str = "m", mark_mvs: bool = False) -> DependencyGraph:
+    """Build a ``db`` graph from edge tokens such as ``"ab bc/m2"`` (source, target[/mv])."""
+    cluster = MagicMock(spec=Cluster)
+    graph = DependencyGraph(cluster)
+
+    def node(name: str, is_mv: bool = False) -> GraphNode:
+        fqdn = f"db.{name}"
+        if fqdn not in graph.nodes:
+            graph.nodes[fqdn] = GraphNode(Table("db", name, cluster), is_mv=is_mv)
+        return graph.nodes[fqdn]
+
+    for token in edges.split():
+        pair, _, via = token.partition("/")
+        graph.edges.append(GraphEdge(node(pair[0]), node(pair[1]), node(via or mv, mark_mvs)))
+    return graph
+
 
 class TestDependencyGraphBasics:
     """Test basic dependency graph construction and operations."""
@@ -51,6 +89,16 @@ class TestDependencyGraphBasics:
         assert str(node) == "analytics.users"
         assert repr(node) == "GraphNode(analytics.users)"
 
+    def test_graph_nodes_are_slotted_and_hash_by_fqdn(self):
+        """Test that nodes carry no per-instance dict and compare by fqdn."""
+        cluster = self.make_cluster_with_responses([])
+        node = GraphNode(Table("analytics", "users", cluster))
+        same = GraphNode(Table("analytics", "users", cluster), is_mv=True)
+
+        assert not hasattr(node, "__dict__")
+        assert node == same and hash(node) == hash(same) == hash("analytics.users")
+        assert len({node, same}) == 1
+
     def test_graph_edge_creation(self):
         """Test GraphEdge creation for materialized view dependencies."""
         cluster = self.make_cluster_with_responses([])
@@ -77,44 +125,8 @@ class TestGraphDiscovery:
 
     def make_cluster_for_discovery(self) -> MagicMock:
         """Create mock cluster with realistic discovery responses."""
-        # Mock responses for various discovery queries
-        responses = [
-            # get_all_tables() - system.tables query
-            [
-                ("raw", "events", "MergeTree"),
-                ("raw", "users", "MergeTree"),
-                ("analytics", "events_agg", "MergeTree"),
-                ("analytics", "mv_events_agg", "MaterializedView"),
-                ("analytics", "user_stats", "MergeTree"),
-                ("analytics", "mv_user_stats", "MaterializedView"),
-            ],
-            # get_materialized_views() - filtered system.tables
-            [
-                ("analytics", "mv_events_agg"),
-                ("analytics", "mv_user_stats"),
-            ],
-            # get_view_dependencies() for mv_events_agg
-            [
-                ("raw", "events"),  # source table
-                ("analytics", "events_agg"),  # target table
-            ],
-            # get_view_dependencies() for mv_user_stats
-            [
-                ("raw", "users"),  # source table
-                ("analytics", "user_stats"),  # target table
-            ],
-            # Additional queries for CREATE statements in _is_mv_target
-            [
-                (
-                    "CREATE MATERIALIZED VIEW analytics.mv_events_agg TO analytics.events_agg AS SELECT * FROM raw.events",
-                )
-            ],
-            [
-                (
-                    "CREATE MATERIALIZED VIEW analytics.mv_user_stats TO analytics.user_stats AS SELECT * FROM raw.users",
-                )
-            ],
-        ]
+        # Single catalog query: one row per (table, dependency), MVs carry their CREATE
+        responses = [DISCOVERY_ROWS]
         mock = self.make_cluster_with_responses(responses)
         mock.name = "test_cluster"  # Explicitly set name
         return mock
@@ -122,7 +134,7 @@ class TestGraphDiscovery:
     def make_cluster_with_responses(self, responses: List[List[Tuple]]) -> MagicMock:
         """Create a mock cluster that returns specific responses to queries."""
         mock = MagicMock(spec=Cluster)
-        mock.query.side_effect = responses
+        mock.query_stream.side_effect = responses
         mock.read_only = False
         mock.host = "localhost"
         mock.user = "default"
@@ -135,94 +147,68 @@ class TestGraphDiscovery:
         cluster = self.make_cluster_for_discovery()
         graph = DependencyGraph(cluster)
 
-        tables = graph._get_all_tables()
+        catalog = graph._fetch_catalog()
 
         expected_tables = [
-            ("raw", "events", "MergeTree"),
-            ("raw", "users", "MergeTree"),
             ("analytics", "events_agg", "MergeTree"),
             ("analytics", "mv_events_agg", "MaterializedView"),
-            ("analytics", "user_stats", "MergeTree"),
             ("analytics", "mv_user_stats", "MaterializedView"),
+            ("analytics", "user_stats", "MergeTree"),
+            ("raw", "events", "MergeTree"),
+            ("raw", "users", "MergeTree"),
         ]
 
-        assert tables == expected_tables
-        cluster.query.assert_called()
+        assert catalog.tables == expected_tables
+        cluster.query_stream.assert_called_once()
 
     def test_discover_materialized_views(self):
-        """Test discovery of materialized views only."""
-        # Create a simplified mock just for this test
-        cluster = MagicMock(spec=Cluster)
-        cluster.name = "test_cluster"
-        cluster.query.return_value = [
+        """Test discovery of materialized views and their dependencies."""
+        cluster = self.make_cluster_for_discovery()
+        graph = DependencyGraph(cluster)
+
+        catalog = graph._fetch_catalog()
+
+        assert list(catalog.mv_create_queries) == [
             ("analytics", "mv_events_agg"),
             ("analytics", "mv_user_stats"),
         ]
+        assert catalog.mv_create_queries[("analytics", "mv_events_agg")] == EVENTS_AGG_MV
+        assert catalog.mv_dependencies[("analytics", "mv_user_stats")] == [
+            ("raw", "users"),
+            ("analytics", "user_stats"),
+        ]
 
+    def test_build_pushes_database_filter_to_clickhouse(self):
+        """Test that a database filter is bound as a query parameter."""
+        cluster = self.make_cluster_for_discovery()
         graph = DependencyGraph(cluster)
-        mvs = graph._get_materialized_views()
 
-        expected_mvs = [
-            ("analytics", "mv_events_agg"),
-            ("analytics", "mv_user_stats"),
-        ]
+        graph.build(databases=["analytics"])
+
+        sql = cluster.query_stream.call_args.args[0]
+        assert "t.database IN {databases:Array(String)}" in sql
+        assert cluster.query_stream.call_args.kwargs == {"parameters": {"databases": ["analytics"]}}
 
-        assert mvs == expected_mvs
+    def test_build_parses_each_mv_create_statement_once(self):
+        """Test that the TO clause is parsed once per MV, not once per dependency."""
+        cluster = self.make_cluster_for_discovery()
+        graph = DependencyGraph(cluster)
+
+        with patch("cht.graph.parse_to_table", wraps=parse_to_table) as parse:
+            graph.build()
+
+        assert parse.call_count == 2
+        assert {(e.source.fqdn, e.target.fqdn) for e in graph.edges} == {
+            ("raw.events", "analytics.events_agg"),
+            ("raw.users", "analytics.user_stats"),
+        }
 
     def test_build_graph_with_dependencies(self):
         """Test complete graph building with dependencies."""
         cluster = MagicMock(spec=Cluster)
         cluster.name = "test_cluster"
 
-        # Create a simpler mock with proper responses
-        cluster.query.side_effect = [
-            # get_all_tables() - all tables including MVs
-            [
-                ("raw", "events", "MergeTree"),
-                ("raw", "users", "MergeTree"),
-                ("analytics", "events_agg", "MergeTree"),
-                ("analytics", "mv_events_agg", "MaterializedView"),
-                ("analytics", "user_stats", "MergeTree"),
-                ("analytics", "mv_user_stats", "MaterializedView"),
-            ],
-            # get_materialized_views() - MVs only
-            [
-                ("analytics", "mv_events_agg"),
-                ("analytics", "mv_user_stats"),
-            ],
-            # Dependencies for mv_events_agg
-            [
-                ("raw", "events"),
-                ("analytics", "events_agg"),
-            ],
-            # CREATE statement query for mv_events_agg _is_mv_target checks
-            [
-                (
-                    "CREATE MATERIALIZED VIEW analytics.mv_events_agg TO analytics.events_agg AS SELECT * FROM raw.events",
-                )
-            ],
-            [
-                (
-                    "CREATE MATERIALIZED VIEW analytics.mv_events_agg TO analytics.events_agg AS SELECT * FROM raw.events",
-                )
-            ],
-            # Dependencies for mv_user_stats
-            [
-                ("raw", "users"),
-                ("analytics", "user_stats"),
-            ],
-            # CREATE statement query for mv_user_stats _is_mv_target checks
-            [
-                (
-                    "CREATE MATERIALIZED VIEW analytics.mv_user_stats TO analytics.user_stats AS SELECT * FROM raw.users",
-                )
-            ],
-            [
-                (
-                    "CREATE MATERIALIZED VIEW analytics.mv_user_stats TO analytics.user_stats AS SELECT * FROM raw.users",
-                )
-            ],
-        ]
+        cluster.query_stream.side_effect = [DISCOVERY_ROWS]
 
         graph = DependencyGraph(cluster)
 
@@ -244,6 +230,11 @@ class TestGraphDiscovery:
 
         # Verify some edges were created (exact count depends on parsing logic)
         assert len(graph.edges) >= 0  # May be 0 due to TO clause parsing complexity
+        cluster.query_stream.assert_called_once()
+
+        # MV nodes are flagged from the engine column
+        mv_fqdns = {node.fqdn for node in graph.nodes.values() if node.is_mv}
+        assert mv_fqdns == {"analytics.mv_events_agg", "analytics.mv_user_stats"}
 
 
 class TestGraphAnalysis:
@@ -297,6 +288,54 @@ class TestGraphAnalysis:
         targets = graph.get_targets("analytics.events_agg")
         assert len(targets) == 0
 
+    def test_add_edge_updates_adjacency_index(self):
+        """Test that lookups see edges added with add_edge after an earlier lookup."""
+        graph = self.create_sample_graph()
+        assert graph.get_targets("analytics.events_agg") == []
+        assert graph.get_dependency_depth("analytics.events_agg") == 0
+
+        extra_mv = GraphNode(Table("analytics", "mv_rollup", graph.cluster))
+        extra_target = GraphNode(Table("analytics", "rollup", graph.cluster))
+        graph.add_edge(GraphEdge(graph.nodes["analytics.events_agg"], extra_target, extra_mv))
+
+        assert [t.fqdn for t in graph.get_targets("analytics.events_agg")] == [
+            "analytics.rollup"
+        ]
+        assert [s.fqdn for s in graph.get_sources("analytics.rollup")] == [
+            "analytics.events_agg"
+        ]
+        assert graph.get_dependency_depth("analytics.events_agg") == 1
+        assert graph._is_materialized_view_node(extra_mv)
+
+    def test_invalidate_indexes_picks_up_direct_edits(self):
+        """Test that direct edits to ``edges`` are seen after invalidate_indexes."""
+        graph = self.create_sample_graph()
+        source = graph.nodes["raw.events"]
+        mv = graph.nodes["analytics.mv_events_agg"]
+        assert graph.get_dependency_depth("raw.events") == 1
+
+        rollup = GraphNode(Table("analytics", "rollup", graph.cluster))
+        graph.edges[0] = GraphEdge(source, rollup, mv)
+        graph.invalidate_indexes()
+        assert [t.fqdn for t in graph.get_targets("raw.events")] == ["analytics.rollup"]
+        assert graph.get_sources("analytics.events_agg") == []
+
+        graph.edges.pop(0)
+        graph.edges.append(GraphEdge(rollup, source, mv))
+        graph.invalidate_indexes()
+        assert [s.fqdn for s in graph.get_sources("raw.events")] == ["analytics.rollup"]
+        assert graph.get_targets("raw.events") == []
+        assert graph.get_dependency_depth("raw.events") == 0
+
+        edges = [GraphEdge(source, rollup, mv)]
+        graph.edges = edges
+        graph.invalidate_indexes()
+        assert [t.fqdn for t in graph.get_targets("raw.events")] == ["analytics.rollup"]
+
+        # The graph keeps the assigned list itself, not a copy of it
+        edges.append(GraphEdge(source, graph.nodes["analytics.events_agg"], mv))
+        assert len(graph.edges) == 2
+
     def test_get_materialized_views_for_table(self):
         """Test finding materialized views associated with a table."""
         graph = self.create_sample_graph()
@@ -306,6 +345,12 @@ class TestGraphAnalysis:
         assert len(mvs) == 1
         assert mvs[0].fqdn == "analytics.mv_events_agg"
 
+    def test_get_materialized_views_deduplicates_in_edge_order(self):
+        """Test that MVs touching a table are listed once, in the order their edges appear."""
+        graph = make_graph("bc/m2 ba/m1 ab/m2")
+
+        assert [mv.fqdn for mv in graph.get_materialized_views("db.b")] == ["db.m2", "db.m1"]
+
     def test_find_dependency_chain(self):
         """Test finding complete dependency chains from source to target."""
         graph = self.create_sample_graph()
@@ -326,6 +371,60 @@ class TestGraphAnalysis:
         expected = {"raw.events", "analytics.mv_events_agg", "analytics.events_agg"}
         assert affected_fqdns == expected
 
+    def test_dependency_depth_and_lineage(self):
+        """Test longest-path depth and transitive lineage on a diamond feeding a cycle."""
+        graph = make_graph("ab bc ac cd de ed")
+
+        depths = {name: graph.get_dependency_depth(f"db.{name}") for name in "abcde"}
+        assert depths == {"a": 3, "b": 2, "c": 1, "d": 0, "e": 0}
+
+        lineage = graph.get_table_lineage("db.c")
+        assert {node.fqdn for node in lineage["upstream"]} == {"db.a", "db.b"}
+        assert {node.fqdn for node in lineage["downstream"]} == {"db.d", "db.e"}
+
+    def test_transitive_impact_matches_breadth_first_trace(self):
+        """Test that the memoized closure agrees with a plain BFS, including on cycles."""
+        graph = make_graph("ab bc cb cd ee fa")
+
+        for name in "abcdef":
+            expected = {node.fqdn for node in graph._trace(f"db.{name}", upstream=False)}
+            assert {node.fqdn for node in graph._downstream(f"db.{name}")} == expected
+        assert {node.fqdn for node in graph.analyze_impact("db.a", transitive=True)} == {
+            "db.a",
+            "db.b",
+            "db.c",
+            "db.d",
+            "db.m",
+        }
+
+        nodes = graph.nodes
+        graph.edges.append(GraphEdge(nodes["db.d"], nodes["db.e"], nodes["db.m"]))
+        assert "db.e" in {node.fqdn for node in graph._downstream("db.a")}
+
+    def test_find_critical_path_returns_shortest_chain(self):
+        """Test that the critical path follows the fewest hops between two tables."""
+        graph = make_graph("ab bc cd ad")
+
+        assert [n.fqdn for n in graph.find_critical_path("db.a", "db.d")] == ["db.a", "db.d"]
+        assert [n.fqdn for n in graph.find_critical_path("db.b", "db.d")] == [
+            "db.b",
+            "db.c",
+            "db.d",
+        ]
+        assert graph.find_critical_path("db.d", "db.a") == []
+
+    def test_pipeline_health_counts_connections_and_depths(self):
+        """Test pipeline health metrics derived from the adjacency indexes."""
+        graph = make_graph("ab bc ac", mark_mvs=True)
+
+        health = graph.get_pipeline_health()
+
+        assert health["metrics"]["total_tables"] == 3
+        assert health["metrics"]["total_materialized_views"] == 1
+        assert health["metrics"]["max_dependency_depth"] == 2
+        assert health["depth_distribution"] == {2: 1, 1: 1, 0: 1}
+        assert health["highly_connected_tables"][:3] == [("db.a", 2), ("db.b", 2), ("db.c", 2)]
+
     def test_detect_cycles(self):
         """Test cycle detection in dependency graph."""
         graph = self.create_sample_graph()
@@ -420,6 +519,17 @@ class TestGraphSerialization:
         graph_dict = graph.to_dict()
         assert parsed == graph_dict
 
+    def test_to_json_output_is_stdlib_json_unless_fast(self):
+        """Test that only ``fast=True`` may switch encoders, and never changes the data."""
+        graph = self.create_sample_graph()
+        node = GraphNode(Table("raw", "événements", graph.cluster))
+        graph.nodes[node.fqdn] = node
+
+        for indent in (2, None):
+            expected = json.dumps(graph.to_dict(), indent=indent)
+            assert graph.to_json(indent=indent) == expected
+            assert json.loads(graph.to_json(indent=indent, fast=True)) == json.loads(expected)
+
     @pytest.mark.parametrize("include_mv_nodes", [True, False])
     def test_to_networkx_format(self, include_mv_nodes):
         """Test serialization to NetworkX format."""
@@ -456,6 +566,16 @@ class TestGraphSerialization:
         assert "analytics_mv_events_agg" in dot_str
         assert "->" in dot_str  # Directed edges
 
+    def test_save_visualization_streams_same_document(self, tmp_path):
+        """Test that streamed DOT/GraphML files match the in-memory exports."""
+        graph = self.create_sample_graph()
+
+        graph.save_visualization(str(tmp_path / "g.graphml"), "graphml")
+        graph.save_visualization(str(tmp_path / "g.dot"), "dot", include_mv_nodes=False)
+
+        assert (tmp_path / "g.graphml").read_text(encoding="utf-8") == graph.to_graphml()
+        assert (tmp_path / "g.dot").read_text(encoding="utf-8") == graph.to_dot(False)
+
 
 class TestGraphVisualization:
     """Test graph visualization and export features."""
@@ -464,16 +584,13 @@ class TestGraphVisualization:
         """Test cluster-wide statistics gathering."""
         cluster = MagicMock(spec=Cluster)
         cluster.query.side_effect = [
-            # Database list
-            [("raw",), ("analytics",), ("temp",)],
-            # Table counts by database
-            [("raw", 5), ("analytics", 12), ("temp", 3)],
-            # MV counts by database
-            [("analytics", 4), ("temp", 1)],
+            # (database, table count, MV count) in a single query
+            [("raw", 5, 0), ("analytics", 12, 4), ("temp", 3, 1)],
         ]
 
         graph = DependencyGraph(cluster)
         stats = graph.get_cluster_statistics()
+        cluster.query.assert_called_once()
 
         expected_stats = {
             "total_databases": 3,
@@ -511,6 +628,36 @@ class TestGraphVisualization:
         assert len(analytics_nodes) == 1
         assert analytics_nodes[0].fqdn == "analytics.events_agg"
 
+        # Nodes added after a lookup are picked up once the indexes are invalidated
+        raw_users = GraphNode(Table("raw", "users", cluster))
+        graph.nodes[raw_users.fqdn] = raw_users
+        graph.invalidate_indexes()
+        assert {node.fqdn for node in graph.filter_by_database("raw")} == {
+            "raw.events",
+            "raw.users",
+        }
+
+        # Swapping one node for another keeps the count but must regroup
+        del graph.nodes[temp_table.fqdn]
+        staging = GraphNode(Table("staging", "events", cluster))
+        graph.nodes[staging.fqdn] = staging
+        graph.invalidate_indexes()
+        assert graph.filter_by_database("temp") == []
+        assert [node.fqdn for node in graph.filter_by_database("staging")] == ["staging.events"]
+
+        nodes = {raw_events.fqdn: raw_events}
+        graph.nodes = nodes
+        graph.invalidate_indexes()
+        assert graph.filter_by_database("analytics") == []
+        assert graph.nodes is nodes
+
+    def test_detect_cycles_reports_each_cycle_once(self):
+        """Test that every cycle, including a self-loop, is reported exactly once."""
+        graph = make_graph("ab bc ca ss")
+
+        cycles = sorted(sorted(node.fqdn for node in cycle) for cycle in graph.detect_cycles())
+        assert cycles == [["db.a", "db.b", "db.c"], ["db.s"]]
+
     def test_get_orphaned_tables(self):
         """Test finding tables with no dependencies."""
         graph = self.create_sample_graph()
@@ -552,9 +699,8 @@ class TestEdgeCases:
         """Test behavior with empty cluster (no tables)."""
         cluster = MagicMock(spec=Cluster)
         cluster.name = "empty_cluster"  # Set name explicitly
-        cluster.query.side_effect = [
+        cluster.query_stream.side_effect = [
             [],  # No tables
-            [],  # No MVs
         ]
 
         graph = DependencyGraph(cluster)
@@ -571,13 +717,13 @@ class TestEdgeCases:
         """Test MV that references non-existent target table."""
         cluster = MagicMock(spec=Cluster)
         cluster.name = "test_cluster"  # Set name explicitly
-        cluster.query.side_effect = [
-            # Tables (includes MV but not its target)
-            [("raw", "events", "MergeTree"), ("analytics", "mv_orphan", "MaterializedView")],
-            # MVs
-            [("analytics", "mv_orphan")],
-            # Dependencies for mv_orphan (target doesn't exist)
-            [("raw", "events"), ("analytics", "missing_target")],
+        cluster.query_stream.side_effect = [
+            # Tables (includes MV but not its target); mv_orphan's target doesn't exist
+            [
+                ("analytics", "mv_orphan", "MaterializedView", "", "raw", "events"),
+                ("analytics", "mv_orphan", "MaterializedView", "", "analytics", "missing_target"),
+                ("raw", "events", "MergeTree", "", "", ""),
+            ],
         ]
 
         graph = DependencyGraph(cluster)
@@ -597,16 +743,13 @@ class TestEdgeCases:
         """Test MV that references non-existent source table."""
         cluster = MagicMock(spec=Cluster)
         cluster.name = "test_cluster"  # Set name explicitly
-        cluster.query.side_effect = [
-            # Tables (includes MV and target but not source)
+        cluster.query_stream.side_effect = [
+            # Tables (includes MV and target but not source); mv_events' source doesn't exist
             [
-                ("analytics", "events_agg", "MergeTree"),
-                ("analytics", "mv_events", "MaterializedView"),
+                ("analytics", "events_agg", "MergeTree", "", "", ""),
+                ("analytics", "mv_events", "MaterializedView", "", "missing", "source"),
+                ("analytics", "mv_events", "MaterializedView", "", "analytics", "events_agg"),
             ],
-            # MVs
-            [("analytics", "mv_events")],
-            # Dependencies for mv_events (source doesn't exist)
-            [("missing", "source"), ("analytics", "events_agg")],
         ]
 
         graph = DependencyGraph(cluster)
@@ -626,34 +769,19 @@ class TestEdgeCases:
         cluster = MagicMock(spec=Cluster)
         cluster.name = "test_cluster"  # Set name explicitly
 
-        # Use side_effect with a list of responses (simpler approach)
-        cluster.query.side_effect = [
-            # get_all_tables() response
-            [
-                ("raw", "events", "MergeTree"),
-                ("raw", "users", "MergeTree"),
-                ("analytics", "user_events", "MergeTree"),
-                ("analytics", "mv_user_events", "MaterializedView"),
-            ],
-            # get_materialized_views() response
-            [("analytics", "mv_user_events")],
-            # get_view_dependencies() response for mv_user_events
-            [("raw", "events"), ("raw", "users"), ("analytics", "user_events")],
-            # CREATE statement query for _is_mv_target (called multiple times)
-            [
-                (
-                    "CREATE MATERIALIZED VIEW analytics.mv_user_events TO analytics.user_events AS SELECT * FROM raw.events JOIN raw.users",
-                )
-            ],
-            [
-                (
-                    "CREATE MATERIALIZED VIEW analytics.mv_user_events TO analytics.user_events AS SELECT * FROM raw.events JOIN raw.users",
-                )
-            ],
+        create_query = (
+            "CREATE MATERIALIZED VIEW analytics.mv_user_events TO analytics.user_events "
+            "AS SELECT * FROM raw.events JOIN raw.users"
+        )
+        mv_row = ("analytics", "mv_user_events", "MaterializedView", create_query)
+        cluster.query_stream.side_effect = [
             [
-                (
-                    "CREATE MATERIALIZED VIEW analytics.mv_user_events TO analytics.user_events AS SELECT * FROM raw.events JOIN raw.users",
-                )
+                ("analytics", "user_events", "MergeTree", "", "", ""),
+                (*mv_row, "raw", "events"),
+                (*mv_row, "raw", "users"),
+                (*mv_row, "analytics", "user_events"),
+                ("raw", "events", "MergeTree", "", "", ""),
+                ("raw", "users", "MergeTree", "", "", ""),
             ],
         ]
 
@@ -6,7 +6,9 @@ import pytest
 
 from cht.kafka import (
     compare_kafka_tables_inline,
+    diff_line_chars,
     generate_kafka_consumer_group_update,
+    replace_kafka_consumer_groups,
 )
 
 
@@ -20,6 +22,26 @@ def test_generate_kafka_consumer_group_update_replaces_value():
         generate_kafka_consumer_group_update("CREATE TABLE t ENGINE = Kafka", new_group="new")
 
 
+def test_diff_line_chars_reports_changed_spans():
+    assert diff_line_chars("group = 'a'", "group = 'b'") == [
+        "~ replace: a[9:10]='a' -> b[9:10]='b'"
+    ]
+    assert diff_line_chars("same", "same") == []
+
+
+def test_replace_kafka_consumer_groups_fetches_ddl_in_one_query():
+    cluster = MagicMock()
+    cluster.query.return_value = [
+        ("default", "events", "CREATE TABLE default.events SETTINGS kafka_group_name = 'old'"),
+        ("default", "plain", "CREATE TABLE default.plain ENGINE = Kafka"),
+    ]
+
+    operations = replace_kafka_consumer_groups(cluster, new_group_name="new")
+
+    assert operations == [("default", "events", "test"), ("default", "plain", "skipped:no-group")]
+    cluster.query.assert_called_once()
+
+
 def test_compare_kafka_tables_inline_detects_differences():
     def make_cluster(tables, create_map):
         mock = MagicMock()
@@ -34,6 +56,7 @@ def test_compare_kafka_tables_inline_detects_differences():
             raise AssertionError(f"Unexpected SQL: {sql}")
 
         mock.query.side_effect = side_effect
+        mock.query_pooled.side_effect = side_effect
         return mock
 
     cluster_a = make_cluster(
@@ -47,5 +70,6 @@ def test_compare_kafka_tables_inline_detects_differences():
 
     diffs = compare_kafka_tables_inline(cluster_a, cluster_b)
     assert "default.kafka_events" in diffs["diffs"]
+    cluster_a.query_pooled.assert_called_once_with("SHOW CREATE TABLE default.kafka_events")
     entries = diffs["diffs"]["default.kafka_events"]
     assert any("kafka_group_name" in line for line in entries)
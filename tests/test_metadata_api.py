@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -46,6 +48,12 @@ class FakeMetadataService(MetadataService):
     ) -> None:
         self.updated_column_comment = (database, table, column, comment, cluster)
 
+    def export_table_descriptions_to_excel(
+        self, databases: list[str], *, cluster: str | None = None
+    ) -> bytes:
+        self.export_request = (databases, cluster, threading.current_thread().name)
+        return b"PK-fake-workbook"
+
 
 @pytest.fixture
 def fake_service() -> FakeMetadataService:
@@ -132,3 +140,76 @@ def test_cluster_query_param_is_forwarded(
     response = client.get("/databases/analytics/tables?cluster=secondary")
     assert response.status_code == 200
     assert fake_service.last_tables_request == ("analytics", "secondary")
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/databases",
+        "/databases/analytics/tables",
+        "/databases/analytics/tables/events/columns",
+    ],
+)
+def test_list_endpoints_return_json_content_type(client: TestClient, path: str) -> None:
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_export_runs_on_dedicated_executor(
+    client: TestClient, fake_service: FakeMetadataService
+) -> None:
+    response = client.post(
+        "/databases/export/excel", json={"databases": ["analytics"], "cluster": "secondary"}
+    )
+    assert response.status_code == 200
+    assert response.content == b"PK-fake-workbook"
+    databases, cluster, thread_name = fake_service.export_request
+    assert (databases, cluster) == (["analytics"], "secondary")
+    assert thread_name.startswith("cht-export")
+
+
+def test_export_executor_shuts_down_with_app(fake_service: FakeMetadataService) -> None:
+    app = create_app(fake_service)
+    with TestClient(app):
+        pass
+    with pytest.raises(RuntimeError):
+        app.state.export_executor.submit(lambda: None)
+
+
+def test_export_streams_with_content_length(client: TestClient) -> None:
+    response = client.post("/databases/export/excel", json={"databases": ["analytics"]})
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(b"PK-fake-workbook"))
+    assert "table_descriptions_" in response.headers["content-disposition"]
+
+
+def test_ui_is_served_compressed_with_etag(client: TestClient) -> None:
+    response = client.get("/ui", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "CHT Web Interface" in response.text
+
+    cached = client.get("/ui", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    plain = client.get("/ui", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.text == response.text
+
+
+@pytest.mark.parametrize("path", ["/databases", "/databases/analytics/tables"])
+def test_listings_honour_if_none_match(client: TestClient, path: str) -> None:
+    response = client.get(path)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert "max-age=30" in response.headers["cache-control"]
+
+    cached = client.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    stale = client.get(path, headers={"If-None-Match": '"something-else"'})
+    assert stale.status_code == 200
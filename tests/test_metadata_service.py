@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import io
+import tempfile
+
+import openpyxl
+import pytest
+import xlsxwriter
+
+from cht.api.cluster_store import ClusterSettings, ClusterStore
+from cht.api.services import ClickHouseMetadataService
+
+
+class FakeCluster:
+    """Answers the system.tables / system.columns queries issued by the metadata service."""
+
+    def __init__(self, tables: dict[str, list[tuple]], columns: dict[tuple, list[tuple]]):
+        self.name = "fake"
+        self.tables = tables
+        self.columns = columns
+        self.queries: list[str] = []
+
+    def query_pooled(self, sql: str, parameters: dict | None = None):
+        self.queries.append(sql)
+        params = parameters or {}
+        # The export joins tables to columns in one query ordered by database and table.
+        if "JOIN" in sql:
+            return [
+                (database, name, comment, *column)
+                for database, rows in sorted(self.tables.items())
+                if database in params["databases"]
+                for name, comment, engine in sorted(rows)
+                for column in self.columns.get((database, name), [])
+            ]
+        if "system.columns" in sql:
+            return self.columns.get((params["database"], params["table"]), [])
+        if "system.tables" in sql:
+            return self.tables.get(params["database"], [])
+        return []
+
+
+@pytest.fixture
+def fake_cluster() -> FakeCluster:
+    return FakeCluster(
+        tables={"analytics": [("events", "event log", "MergeTree"), ("users", "", "MergeTree")]},
+        columns={
+            ("analytics", "events"): [("ts", "DateTime", "event time"), ("id", "UInt64", "")],
+            ("analytics", "users"): [("user_id", "UInt64", "primary key")],
+        },
+    )
+
+
+@pytest.fixture
+def service(fake_cluster: FakeCluster) -> ClickHouseMetadataService:
+    store = ClusterStore()
+    settings = ClusterSettings(host="h", port=1, user="u", password="")
+    store.add_cluster_instance("fake", settings, cluster=fake_cluster, make_active=True)
+    return ClickHouseMetadataService(store)
+
+
+def test_export_file_is_closed_when_export_fails(
+    service: ClickHouseMetadataService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    created = []
+    spooled_file = tempfile.SpooledTemporaryFile
+
+    def track(*args, **kwargs):
+        created.append(spooled_file(*args, **kwargs))
+        return created[-1]
+
+    def fail(self):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(tempfile, "SpooledTemporaryFile", track)
+    monkeypatch.setattr(xlsxwriter.Workbook, "close", fail)
+
+    with pytest.raises(OSError, match="disk full"):
+        service.export_table_descriptions_to_excel_file(["analytics"])
+
+    [excel_file] = created
+    assert excel_file.closed
+
+
+def test_export_file_is_rewound_workbook(service: ClickHouseMetadataService) -> None:
+    with service.export_table_descriptions_to_excel_file(["analytics"]) as fp:
+        assert fp.tell() == 0
+        workbook = openpyxl.load_workbook(fp)
+
+    assert [ws.title for ws in workbook.worksheets] == ["analytics.events", "analytics.users"]
+    events = workbook["analytics.events"]
+    assert events["A1"].value == "Table: analytics.events"
+    assert events["B2"].value == "event log"
+    assert [c.value for c in events[4]] == ["Column Name", "Column Type", "Comment"]
+    assert [c.value for c in events[5]] == ["ts", "DateTime", "event time"]
+    assert [c.value for c in events[6]] == ["id", "UInt64", "[Add column comment here]"]
+    assert workbook["analytics.users"]["B2"].value == "[Add table description here]"
+
+
+def test_export_bytes_matches_file_contents(service: ClickHouseMetadataService) -> None:
+    data = service.export_table_descriptions_to_excel(["analytics"])
+    assert data[:2] == b"PK"
+    workbook = openpyxl.load_workbook(io.BytesIO(data))
+    assert len(workbook.worksheets) == 2
+
+
+def test_export_without_tables_creates_summary_sheet(service: ClickHouseMetadataService) -> None:
+    data = service.export_table_descriptions_to_excel(["missing"])
+    workbook = openpyxl.load_workbook(io.BytesIO(data))
+    assert [ws.title for ws in workbook.worksheets] == ["Export Summary"]
+
+
+def test_export_keeps_formatting_and_merges(service: ClickHouseMetadataService) -> None:
+    data = service.export_table_descriptions_to_excel(["analytics"])
+    events = openpyxl.load_workbook(io.BytesIO(data))["analytics.events"]
+
+    assert {str(r) for r in events.merged_cells.ranges} == {"A1:C1", "B2:C2"}
+    assert events["A1"].font.bold and events["A1"].font.sz == 14
+    assert events["A4"].fill.fgColor.rgb.endswith("366092")
+    assert events["C6"].font.color.rgb.endswith("AAAAAA")
+    assert events.row_dimensions[3].height == 8
+
+
+def test_export_suffixes_clashing_truncated_sheet_names(
+    service: ClickHouseMetadataService, fake_cluster: FakeCluster
+) -> None:
+    prefix = "x" * 30
+    fake_cluster.tables["analytics"] = [
+        (f"{prefix}_a", "", "MergeTree"),
+        (f"{prefix}_b", "", "MergeTree"),
+    ]
+    for name, _, _ in fake_cluster.tables["analytics"]:
+        fake_cluster.columns[("analytics", name)] = [("id", "UInt64", "")]
+
+    data = service.export_table_descriptions_to_excel(["analytics"])
+
+    titles = [ws.title for ws in openpyxl.load_workbook(io.BytesIO(data)).worksheets]
+    assert len(titles) == 2 and len(set(titles)) == 2
+    assert all(len(title) <= 31 for title in titles)
+
+
+def test_export_fetches_metadata_in_one_query(
+    service: ClickHouseMetadataService, fake_cluster: FakeCluster
+) -> None:
+    fake_cluster.tables["other"] = [("logs", "", "MergeTree")]
+    fake_cluster.columns[("other", "logs")] = [("line", "String", "")]
+
+    data = service.export_table_descriptions_to_excel(["analytics", "other"])
+
+    assert len(fake_cluster.queries) == 1
+    workbook = openpyxl.load_workbook(io.BytesIO(data))
+    assert [ws.title for ws in workbook.worksheets] == [
+        "analytics.events",
+        "analytics.users",
+        "other.logs",
+    ]
+
+
+def test_list_tables_and_columns(service: ClickHouseMetadataService) -> None:
+    assert service.list_tables("analytics") == [
+        {"name": "events", "comment": "event log"},
+        {"name": "users", "comment": None},
+    ]
+    assert service.list_columns("analytics", "users") == [
+        {"name": "user_id", "type": "UInt64", "comment": "primary key"}
+    ]
+
+
+def test_listings_are_cached_until_comment_update(
+    service: ClickHouseMetadataService, fake_cluster: FakeCluster
+) -> None:
+    service.list_tables("analytics")
+    service.list_tables("analytics")
+    service.list_columns("analytics", "events")
+    service.list_columns("analytics", "events")
+    assert len(fake_cluster.queries) == 2
+
+    fake_cluster.tables["analytics"][1] = ("users", "people", "MergeTree")
+    service.update_table_comment("analytics", "users", "people")
+    assert service.list_tables("analytics")[1] == {"name": "users", "comment": "people"}
+    assert service.list_tables("analytics", use_cache=False)[1]["comment"] == "people"
+
+
+def test_cache_can_be_disabled(fake_cluster: FakeCluster) -> None:
+    store = ClusterStore()
+    settings = ClusterSettings(host="h", port=1, user="u", password="")
+    store.add_cluster_instance("fake", settings, cluster=fake_cluster, make_active=True)
+    service = ClickHouseMetadataService(store, cache_ttl=0)
+
+    service.export_table_descriptions_to_excel(["analytics"])
+    service.export_table_descriptions_to_excel(["analytics"])
+    assert len(fake_cluster.queries) == 2
+
+
+def test_export_sizes_columns_from_contents(service: ClickHouseMetadataService) -> None:
+    data = service.export_table_descriptions_to_excel(["analytics"])
+    events = openpyxl.load_workbook(io.BytesIO(data))["analytics.events"]
+
+    # xlsxwriter stores widths with a fractional padding, so compare whole characters.
+    widths = {letter: int(events.column_dimensions[letter].width) for letter in "ABC"}
+    # "Table: analytics.events", "Column Type" and the placeholder comment, plus 2.
+    assert widths == {"A": 25, "B": 13, "C": 27}
+
+
+def test_listing_queries_bind_parameters(
+    service: ClickHouseMetadataService, fake_cluster: FakeCluster
+) -> None:
+    fake_cluster.tables["it's"] = [("quoted", "", "MergeTree")]
+
+    assert service.list_tables("it's") == [{"name": "quoted", "comment": None}]
+    service.list_tables("analytics")
+
+    # Same statement text for every database; values travel as server-side parameters.
+    assert fake_cluster.queries[0] == fake_cluster.queries[1]
+    assert "it's" not in fake_cluster.queries[0]
+
+
+def test_export_clips_comments_to_excel_cell_limit(
+    service: ClickHouseMetadataService, fake_cluster: FakeCluster
+) -> None:
+    fake_cluster.columns[("analytics", "users")] = [("user_id", "UInt64", "x" * 40000)]
+
+    data = service.export_table_descriptions_to_excel(["analytics"])
+
+    users = openpyxl.load_workbook(io.BytesIO(data))["analytics.users"]
+    assert len(users["C5"].value) == 32767
@@ -19,6 +19,16 @@ def test_extract_from_tables_handles_db_and_table():
     assert extract_from_tables(sql) == ["db.table_a", "table_b"]
 
 
+def test_extract_from_tables_handles_backticks_and_case():
+    sql = "select * from `raw`.`events` e left join `users` u using id FROM raw.events"
+    assert extract_from_tables(sql) == ["raw.events", "users"]
+
+
+def test_extract_from_tables_keeps_non_ascii_names():
+    sql = "SELECT * FROM `аналитика`.`события` JOIN raw.événements USING id"
+    assert extract_from_tables(sql) == ["raw.événements", "аналитика.события"]
+
+
 def test_parse_to_table_variants():
     query = "CREATE MATERIALIZED VIEW mv TO `analytics`.`fact` AS SELECT 1"
     assert parse_to_table(query) == ("analytics", "fact")
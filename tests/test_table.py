@@ -29,6 +29,20 @@ def test_table_exists_true():
     cluster.query.assert_called_with("EXISTS TABLE default.events")
 
 
+def test_set_comments_use_pooled_client():
+    cluster = make_cluster([])
+    table = Table("default", "events", cluster=cluster)
+
+    table.set_comment("it's events")
+    table.set_column_comment("ts", "event time")
+
+    assert [c.args[0] for c in cluster.query_pooled.call_args_list] == [
+        "ALTER TABLE `default`.`events` MODIFY COMMENT 'it''s events'",
+        "ALTER TABLE `default`.`events` COMMENT COLUMN `ts` 'event time'",
+    ]
+    cluster.query_with_fresh_client.assert_not_called()
+
+
 def test_backup_to_suffix_recreates_when_exists():
     cluster = make_cluster(
         [